@@ -0,0 +1,24 @@
+-- Composite indexes for temperature history queries
+-- Every history and statistics query filters on a device (and usually a probe)
+-- or a grill plus a time range, and history is read newest first. With the
+-- filter columns leading and time last, such queries read one contiguous
+-- index range per chunk, already in time order, instead of intersecting a
+-- single-column index with the time index.
+
+-- transaction_per_chunk builds the index chunk by chunk, so large hypertables
+-- are not locked for the whole build (run outside an explicit transaction)
+CREATE INDEX IF NOT EXISTS idx_temperature_device_probe_time
+    ON temperature_readings (device_id, probe_id, time DESC)
+    WITH (timescaledb.transaction_per_chunk);
+
+CREATE INDEX IF NOT EXISTS idx_temperature_grill_time
+    ON temperature_readings (grill_id, time DESC)
+    WITH (timescaledb.transaction_per_chunk);
+
+-- The single-column device and grill indexes are prefixes of the composite
+-- ones and only add write cost. idx_temperature_probe_id stays, for queries
+-- filtering on a probe without a device.
+DROP INDEX IF EXISTS idx_temperature_device_id;
+DROP INDEX IF EXISTS idx_temperature_grill_id;
+
+ANALYZE temperature_readings;
@@ -21,10 +21,11 @@ CREATE TABLE IF NOT EXISTS temperature_readings (
 -- Create hypertable for time-series optimization
 SELECT create_hypertable('temperature_readings', 'time', if_not_exists => TRUE);
 
--- Create indexes for query optimization
-CREATE INDEX IF NOT EXISTS idx_temperature_device_id ON temperature_readings(device_id);
+-- Create indexes for query optimization: filter columns first, then time for
+-- range scans in history order (see add_temperature_composite_indexes.sql)
+CREATE INDEX IF NOT EXISTS idx_temperature_device_probe_time ON temperature_readings(device_id, probe_id, time DESC);
+CREATE INDEX IF NOT EXISTS idx_temperature_grill_time ON temperature_readings(grill_id, time DESC);
 CREATE INDEX IF NOT EXISTS idx_temperature_probe_id ON temperature_readings(probe_id);
-CREATE INDEX IF NOT EXISTS idx_temperature_grill_id ON temperature_readings(grill_id);
 
 -- Set up retention policy to automatically delete data older than 90 days
 SELECT add_retention_policy('temperature_readings', INTERVAL '90 days', if_not_exists => TRUE);
@@ -70,20 +71,86 @@ ALTER TABLE temperature_readings SET (
 
 SELECT add_compression_policy('temperature_readings', INTERVAL '7 days', if_not_exists => TRUE);
 
+-- Continuous aggregates (rollup tiers) for temperature history queries.
+-- The historical data service answers aggregated history queries from the
+-- coarsest tier whose bucket divides the requested interval and reads the
+-- un-materialized tail from temperature_readings itself, so the tiers are
+-- materialized_only (no real-time union) and keep the partial aggregates
+-- (counts next to averages) needed to combine buckets.
+
+-- Replace hourly/daily aggregates created before the tiers carried unit,
+-- battery and signal columns. They are rebuilt from temperature_readings,
+-- so buckets older than its retention period are not restored.
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'temperature_hourly' AND column_name = 'avg_temp')
+       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_name = 'temperature_hourly' AND column_name = 'battery_count') THEN
+        DROP MATERIALIZED VIEW temperature_hourly;
+    END IF;
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'temperature_daily' AND column_name = 'avg_temp')
+       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_name = 'temperature_daily' AND column_name = 'battery_count') THEN
+        DROP MATERIALIZED VIEW temperature_daily;
+    END IF;
+END $$;
+
+-- Create continuous aggregate view for per-minute temperature summaries
+CREATE MATERIALIZED VIEW IF NOT EXISTS temperature_1m
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
+SELECT
+    time_bucket('1 minute', time) AS bucket,
+    device_id,
+    probe_id,
+    grill_id,
+    unit,
+    AVG(temperature) AS avg_temp,
+    MIN(temperature) AS min_temp,
+    MAX(temperature) AS max_temp,
+    COUNT(*) AS reading_count,
+    AVG(battery_level) AS avg_battery,
+    MIN(battery_level) AS min_battery,
+    MAX(battery_level) AS max_battery,
+    COUNT(battery_level) AS battery_count,
+    AVG(signal_strength) AS avg_signal,
+    MIN(signal_strength) AS min_signal,
+    MAX(signal_strength) AS max_signal,
+    COUNT(signal_strength) AS signal_count
+FROM temperature_readings
+GROUP BY bucket, device_id, probe_id, grill_id, unit;
+
+-- Add refresh policy to update the per-minute aggregate automatically
+SELECT add_continuous_aggregate_policy('temperature_1m',
+    start_offset => INTERVAL '2 hours',
+    end_offset => INTERVAL '1 minute',
+    schedule_interval => INTERVAL '1 minute',
+    if_not_exists => TRUE);
+
 -- Create continuous aggregate view for hourly temperature summaries
 CREATE MATERIALIZED VIEW IF NOT EXISTS temperature_hourly
-WITH (timescaledb.continuous) AS
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
 SELECT
     time_bucket('1 hour', time) AS bucket,
     device_id,
     probe_id,
     grill_id,
+    unit,
     AVG(temperature) AS avg_temp,
     MIN(temperature) AS min_temp,
     MAX(temperature) AS max_temp,
-    COUNT(*) AS reading_count
+    COUNT(*) AS reading_count,
+    AVG(battery_level) AS avg_battery,
+    MIN(battery_level) AS min_battery,
+    MAX(battery_level) AS max_battery,
+    COUNT(battery_level) AS battery_count,
+    AVG(signal_strength) AS avg_signal,
+    MIN(signal_strength) AS min_signal,
+    MAX(signal_strength) AS max_signal,
+    COUNT(signal_strength) AS signal_count
 FROM temperature_readings
-GROUP BY bucket, device_id, probe_id, grill_id;
+GROUP BY bucket, device_id, probe_id, grill_id, unit;
 
 -- Add refresh policy to update the continuous aggregate automatically
 SELECT add_continuous_aggregate_policy('temperature_hourly',
@@ -94,18 +161,27 @@ SELECT add_continuous_aggregate_policy('temperature_hourly',
 
 -- Create continuous aggregate view for daily temperature summaries
 CREATE MATERIALIZED VIEW IF NOT EXISTS temperature_daily
-WITH (timescaledb.continuous) AS
+WITH (timescaledb.continuous, timescaledb.materialized_only = true) AS
 SELECT
     time_bucket('1 day', time) AS bucket,
     device_id,
     probe_id,
     grill_id,
+    unit,
     AVG(temperature) AS avg_temp,
     MIN(temperature) AS min_temp,
     MAX(temperature) AS max_temp,
-    COUNT(*) AS reading_count
+    COUNT(*) AS reading_count,
+    AVG(battery_level) AS avg_battery,
+    MIN(battery_level) AS min_battery,
+    MAX(battery_level) AS max_battery,
+    COUNT(battery_level) AS battery_count,
+    AVG(signal_strength) AS avg_signal,
+    MIN(signal_strength) AS min_signal,
+    MAX(signal_strength) AS max_signal,
+    COUNT(signal_strength) AS signal_count
 FROM temperature_readings
-GROUP BY bucket, device_id, probe_id, grill_id;
+GROUP BY bucket, device_id, probe_id, grill_id, unit;
 
 -- Add refresh policy to update the daily aggregate automatically
 SELECT add_continuous_aggregate_policy('temperature_daily',
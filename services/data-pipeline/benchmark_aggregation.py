@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Aggregation benchmark for the temperature aggregation service.
+
+Streams simulated 1 Hz readings for many devices into the ring-buffer time
+series from ``src/processors/time_series.py`` and runs an aggregation cycle
+every window, reporting ingest cost per reading and aggregation cycle time.
+The previous approach (deque of dicts rescanned every cycle) is measured on a
+sample of devices and extrapolated to the full fleet, since holding the full
+history as dicts would not fit in memory.
+"""
+
+import argparse
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.processors.time_series import DeviceTimeSeries
+
+
+def legacy_aggregate(readings, window_start):
+    """Reference copy of the previous per-device aggregation scan."""
+    recent_readings = [r for r in readings if r["timestamp"] >= window_start]
+    if not recent_readings:
+        return None
+    temperatures = [r["temperature"] for r in recent_readings]
+    first_half = temperatures[: len(temperatures) // 2]
+    second_half = temperatures[len(temperatures) // 2 :]
+    return {
+        "reading_count": len(recent_readings),
+        "min_temperature": min(temperatures),
+        "max_temperature": max(temperatures),
+        "avg_temperature": sum(temperatures) / len(temperatures),
+        "trend_diff": (sum(second_half) / max(len(second_half), 1)) - (sum(first_half) / max(len(first_half), 1)),
+    }
+
+
+def main():
+    """Run the aggregation benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--rate", type=float, default=1.0, help="Readings per second per device")
+    parser.add_argument("--window-minutes", type=int, default=5)
+    parser.add_argument("--legacy-devices", type=int, default=10, help="Devices sampled for the legacy baseline")
+    args = parser.parse_args()
+
+    interval = 1.0 / args.rate
+    window = timedelta(minutes=args.window_minutes)
+    readings_per_window = int(window.total_seconds() * args.rate)
+    windows = int(args.hours * 3600 / window.total_seconds())
+    capacity = readings_per_window * windows
+    legacy_devices = min(args.legacy_devices, args.devices)
+
+    print(
+        f"📊 {args.devices} devices × {args.hours:g}h at {args.rate:g} Hz "
+        f"({args.devices * capacity:,} readings, {windows} aggregation cycles)\n"
+    )
+
+    rng = np.random.default_rng(42)
+    series = [DeviceTimeSeries(capacity) for _ in range(args.devices)]
+    legacy = [deque(maxlen=capacity) for _ in range(legacy_devices)]
+    start = datetime(2024, 1, 1)
+
+    ingest_seconds = 0.0
+    ingested = 0
+    cycle_times = []
+    legacy_cycle_times = []
+
+    for cycle in range(windows):
+        cycle_start = start + cycle * window
+        timestamps = [cycle_start + timedelta(seconds=i * interval) for i in range(readings_per_window)]
+        base = 225.0 + 10 * np.sin(cycle / 12)
+
+        for device_index, device_series in enumerate(series):
+            temperatures = (base + rng.normal(0, 1.5, readings_per_window)).tolist()
+            t0 = time.perf_counter()
+            for timestamp, temperature in zip(timestamps, temperatures):
+                device_series.append(timestamp, temperature, 80.0, -55.0, "backyard", "online")
+            ingest_seconds += time.perf_counter() - t0
+            ingested += readings_per_window
+
+            if device_index < legacy_devices:
+                legacy[device_index].extend(
+                    {
+                        "timestamp": timestamp,
+                        "temperature": temperature,
+                        "battery_level": 80.0,
+                        "signal_strength": -55.0,
+                        "location": "backyard",
+                        "status": "online",
+                    }
+                    for timestamp, temperature in zip(timestamps, temperatures)
+                )
+
+        now = cycle_start + window
+        window_start = now - window
+
+        t0 = time.perf_counter()
+        for device_series in series:
+            device_series.window_aggregate(window_start.timestamp())
+        cycle_times.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for readings in legacy:
+            legacy_aggregate(readings, window_start)
+        legacy_cycle_times.append((time.perf_counter() - t0) * args.devices / max(legacy_devices, 1))
+
+        if (cycle + 1) % max(1, windows // 8) == 0:
+            print(
+                f"  cycle {cycle + 1:>4}/{windows}: ring {cycle_times[-1] * 1000:8.2f} ms, "
+                f"legacy (extrapolated) {legacy_cycle_times[-1] * 1000:10.2f} ms"
+            )
+
+    print(f"\nIngest:       {ingest_seconds / ingested * 1e6:.2f} µs/reading ({ingested / ingest_seconds:,.0f} readings/sec)")
+    print(f"Ring buffer:  mean cycle {np.mean(cycle_times) * 1000:.2f} ms, max {np.max(cycle_times) * 1000:.2f} ms")
+    print(
+        f"Legacy scan:  mean cycle {np.mean(legacy_cycle_times) * 1000:.2f} ms, "
+        f"max {np.max(legacy_cycle_times) * 1000:.2f} ms (extrapolated from {legacy_devices} devices)"
+    )
+    memory = sum(
+        s._timestamps.nbytes
+        + s._temperatures.nbytes
+        + s._battery_levels.nbytes
+        + s._signal_strengths.nbytes
+        + s._locations.nbytes
+        + s._statuses.nbytes
+        for s in series
+    )
+    print(f"Ring buffer memory: {memory / 1024 / 1024:,.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Feature extraction microbenchmark for the anomaly detector.
+
+Compares the previous list-of-dicts window extraction with the ring-buffer
+implementation in ``src/processors/feature_window.py`` and reports the
+per-event cost against a 10k events/sec budget (100 µs per event).
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from src.processors.feature_window import DeviceFeatureBuffer
+
+TARGET_EVENTS_PER_SECOND = 10_000
+
+
+def legacy_extract(history, temperature, battery, signal, window_size=20):
+    """Reference copy of the previous per-event extraction."""
+    features = {
+        "temperature": temperature,
+        "battery_level": battery,
+        "signal_strength": signal,
+        "hour_of_day": 12,
+        "day_of_week": 3,
+        "minute_of_hour": 30,
+        "processing_time": 1.0,
+    }
+
+    if history:
+        recent_features = list(history)[-window_size:]
+        if len(recent_features) > 1:
+            recent_temps = [f["temperature"] for f in recent_features]
+            features["temp_mean"] = np.mean(recent_temps)
+            features["temp_std"] = np.std(recent_temps)
+            features["temp_min"] = np.min(recent_temps)
+            features["temp_max"] = np.max(recent_temps)
+            features["temp_range"] = features["temp_max"] - features["temp_min"]
+            features["temp_derivative"] = recent_temps[-1] - recent_temps[-2]
+            if len(recent_temps) >= 3:
+                features["temp_second_derivative"] = (recent_temps[-1] - recent_temps[-2]) - (
+                    recent_temps[-2] - recent_temps[-3]
+                )
+            recent_battery = [f["battery_level"] for f in recent_features if f["battery_level"] > 0]
+            if len(recent_battery) >= 2:
+                features["battery_trend"] = recent_battery[-1] - recent_battery[0]
+            recent_signal = [f["signal_strength"] for f in recent_features if f["signal_strength"] != 0]
+            if len(recent_signal) >= 2:
+                features["signal_mean"] = np.mean(recent_signal)
+                features["signal_std"] = np.std(recent_signal)
+
+    history.append(features)
+    return features
+
+
+def generate_events(count, devices):
+    """Generate (device_id, temperature, battery, signal) tuples."""
+    rng = random.Random(42)
+    return [
+        (
+            f"device_{rng.randrange(devices)}",
+            rng.uniform(150, 300),
+            rng.uniform(20, 100),
+            rng.uniform(-90, -30),
+        )
+        for _ in range(count)
+    ]
+
+
+def run(label, extract, events):
+    """Time one extraction strategy and print throughput and latency percentiles."""
+    latencies = np.empty(len(events))
+    started = time.perf_counter()
+    for i, event in enumerate(events):
+        t0 = time.perf_counter()
+        extract(*event)
+        latencies[i] = time.perf_counter() - t0
+    elapsed = time.perf_counter() - started
+
+    rate = len(events) / elapsed
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    budget = "ok" if rate >= TARGET_EVENTS_PER_SECOND else "below target"
+    print(f"{label:<12} {rate:>12,.0f} events/sec  p50 {p50:>7.1f} µs  p99 {p99:>7.1f} µs  ({budget})")
+    return rate
+
+
+def main():
+    """Run the feature extraction benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--history", type=int, default=10_000)
+    args = parser.parse_args()
+
+    events = generate_events(args.events, args.devices)
+    print(f"📊 {args.events} events across {args.devices} devices (target {TARGET_EVENTS_PER_SECOND:,} events/sec)\n")
+
+    histories = {}
+
+    def legacy(device_id, temperature, battery, signal):
+        history = histories.setdefault(device_id, deque(maxlen=args.history))
+        return legacy_extract(history, temperature, battery, signal)
+
+    buffers = {}
+
+    def ring(device_id, temperature, battery, signal):
+        buffer = buffers.get(device_id)
+        if buffer is None:
+            buffer = buffers[device_id] = DeviceFeatureBuffer(args.history)
+        return buffer.append_reading(temperature, battery, signal, 12, 3, 30, 1.0)
+
+    legacy_rate = run("list/dict", legacy, events)
+    ring_rate = run("ring buffer", ring, events)
+    print(f"\n⚡ Speedup: {ring_rate / legacy_rate:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
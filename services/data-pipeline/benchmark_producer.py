@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Producer throughput benchmark for ``ProducerManager``.
+
+Compares the previous send path (one queued message per ``_send_loop``
+iteration, each produced with its own delivery callback) with the grouped
+send loop and ``send_batch``, for each batching profile in
+``PRODUCER_PROFILES``. Reports events/sec from the first send until every
+delivery report has arrived.
+
+Runs against librdkafka's built-in mock cluster by default, so no broker is
+needed; pass ``--bootstrap-servers`` to benchmark a real cluster.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from dataclasses import replace
+
+import structlog
+
+from src.kafka.producer_manager import MESSAGES_SENT, PRODUCER_PROFILES, ProducerManager
+from src.schemas.events import TemperatureReading, TemperatureReadingEvent
+from src.utils.config import KafkaConfig
+
+TOPIC = "benchmark.temperature.readings"
+
+
+def generate_events(count, devices):
+    """Generate temperature reading events spread across devices."""
+    return [
+        TemperatureReadingEvent(
+            event_id=f"benchmark_{i}",
+            source="benchmark",
+            data=TemperatureReading(
+                device_id=f"device_{i % devices}",
+                device_name=f"Device {i % devices}",
+                temperature=150.0 + (i % 150),
+                battery_level=80.0,
+                signal_strength=-50.0,
+                location="backyard",
+                status="online",
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+class LegacyProducerManager(ProducerManager):
+    """Reference copy of the previous per-message send loop and delivery callback."""
+
+    async def _send_loop(self):
+        while self.is_running:
+            try:
+                try:
+                    message = await asyncio.wait_for(self.send_queue.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+
+                topic, key, value, headers = message
+                kafka_headers = [(k, v.encode("utf-8")) for k, v in headers.items()] if headers else None
+                self.producer.produce(
+                    topic=topic,
+                    key=key.encode("utf-8") if key else None,
+                    value=value.encode("utf-8"),
+                    headers=kafka_headers,
+                    callback=self._delivery_callback,
+                )
+                self.producer.poll(0)
+                self.send_queue.task_done()
+
+            except Exception:
+                await asyncio.sleep(1)
+
+    def _delivery_callback(self, err, msg):
+        status = "error" if err else "success"
+        MESSAGES_SENT.labels(topic=msg.topic(), status=status).inc()
+
+
+def delivered_count():
+    """Messages reported delivered to the benchmark topic so far."""
+    return MESSAGES_SENT.labels(topic=TOPIC, status="success")._value.get()
+
+
+async def run(label, manager_class, kafka_config, extra_config, events, mode):
+    """Send events through a producer manager and print throughput."""
+    manager = manager_class(kafka_config, extra_config)
+    if "test.mock.num.brokers" not in extra_config:
+        await manager.create_topics([TOPIC])
+
+    before = delivered_count()
+    started = time.perf_counter()
+
+    if mode == "batch":
+        for offset in range(0, len(events), 1000):
+            await manager.send_batch(TOPIC, events[offset : offset + 1000])
+    else:
+        for event in events:
+            await manager.send_event(TOPIC, event)
+
+    await manager.flush()
+    elapsed = time.perf_counter() - started
+    delivered = delivered_count() - before
+    await manager.close()
+
+    print(f"{label:<36} {len(events) / elapsed:>12,.0f} events/sec  ({delivered:,.0f}/{len(events):,} delivered)")
+    return len(events) / elapsed
+
+
+async def main():
+    """Run the producer benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bootstrap-servers", help="Kafka cluster to benchmark instead of the mock cluster")
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--devices", type=int, default=100)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    extra_config = {} if args.bootstrap_servers else {"test.mock.num.brokers": 3, "log_level": 3}
+    kafka_config = KafkaConfig(bootstrap_servers=args.bootstrap_servers or "localhost:9092")
+
+    events = generate_events(args.events, args.devices)
+    target = args.bootstrap_servers or "librdkafka mock cluster"
+    print(f"📊 {args.events} events across {args.devices} devices ({target})\n")
+
+    legacy = await run("before: per-message send loop", LegacyProducerManager, kafka_config, extra_config, events, "event")
+    results = {}
+    for profile in PRODUCER_PROFILES:
+        profile_config = replace(kafka_config, producer_profile=profile)
+        await run(f"after [{profile}]: send_event", ProducerManager, profile_config, extra_config, events, "event")
+        results[profile] = await run(
+            f"after [{profile}]: send_batch", ProducerManager, profile_config, extra_config, events, "batch"
+        )
+
+    best = max(results, key=results.get)
+    print(f"\n⚡ Best send_batch profile: {best} ({results[best] / legacy:.1f}x the per-message path)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
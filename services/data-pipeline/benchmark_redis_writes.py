@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Redis write benchmark for the temperature aggregation service.
+
+Compares the previous per-reading writes (five awaited round-trips, trimming
+on every write) with the pipelined writes used by
+``TemperatureAggregationService._write_readings_to_redis``, once per reading
+and once per consumed batch. Reports readings/sec and Redis commands/sec.
+
+Requires a running Redis server; keys are written under a ``benchmark:``
+prefix and removed afterwards.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import redis.asyncio as redis
+
+from src.processors.series_codec import encode_reading
+
+KEY_PREFIX = "benchmark:temperature"
+
+
+def generate_readings(count, devices):
+    """Generate reading dicts spread across devices at 1 Hz."""
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(seconds=count)
+    return [
+        {
+            "device_id": f"device_{i % devices}",
+            "timestamp": start + timedelta(seconds=i),
+            "temperature": round(rng.uniform(150, 300), 2),
+            "battery_level": round(rng.uniform(20, 100), 1),
+            "signal_strength": round(rng.uniform(-90, -30), 1),
+            "location": "backyard",
+            "status": "online",
+        }
+        for i in range(count)
+    ]
+
+
+def reading_data(reading):
+    """Redis payload of a reading, as stored by the aggregator."""
+    return {
+        "timestamp": reading["timestamp"].isoformat(),
+        "temperature": reading["temperature"],
+        "battery_level": reading["battery_level"],
+        "signal_strength": reading["signal_strength"],
+        "location": reading["location"],
+        "status": reading["status"],
+    }
+
+
+async def write_legacy(client, readings):
+    """Previous behaviour: five awaited commands per reading."""
+    commands = 0
+    for reading in readings:
+        key = f"{KEY_PREFIX}:{reading['device_id']}"
+        data = reading_data(reading)
+        await client.hset(f"{key}:latest", mapping=data)
+        await client.zadd(f"{key}:series", {json.dumps(data): reading["timestamp"].timestamp()})
+        cutoff_time = (datetime.utcnow() - timedelta(hours=24)).timestamp()
+        await client.zremrangebyscore(f"{key}:series", 0, cutoff_time)
+        await client.expire(f"{key}:latest", 3600)
+        await client.expire(f"{key}:series", 86400)
+        commands += 5
+    return commands
+
+
+async def write_pipelined(client, readings):
+    """Current behaviour: one pipeline for a group of readings."""
+    series = defaultdict(dict)
+    latest = {}
+    for reading in readings:
+        member = encode_reading(
+            reading["timestamp"],
+            reading["temperature"],
+            reading["battery_level"],
+            reading["signal_strength"],
+            reading["location"],
+            reading["status"],
+        )
+        series[reading["device_id"]][member] = reading["timestamp"].timestamp()
+        latest[reading["device_id"]] = reading_data(reading)
+
+    pipe = client.pipeline(transaction=False)
+    for device_id, members in series.items():
+        key = f"{KEY_PREFIX}:{device_id}"
+        pipe.hset(f"{key}:latest", mapping=latest[device_id])
+        pipe.zadd(f"{key}:series", members)
+        pipe.expire(f"{key}:latest", 3600)
+        pipe.expire(f"{key}:series", 86400)
+    await pipe.execute()
+    return len(series) * 4
+
+
+async def run(label, client, readings, group_size, writer):
+    """Write readings in groups and print throughput."""
+    await cleanup(client)
+    commands = 0
+    started = time.perf_counter()
+    for offset in range(0, len(readings), group_size):
+        commands += await writer(client, readings[offset : offset + group_size])
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{label:<22} {len(readings) / elapsed:>12,.0f} readings/sec  "
+        f"{commands / elapsed:>12,.0f} commands/sec  ({commands:,} commands)"
+    )
+    return len(readings) / elapsed
+
+
+async def cleanup(client):
+    """Remove benchmark keys."""
+    keys = [key async for key in client.scan_iter(f"{KEY_PREFIX}:*")]
+    for offset in range(0, len(keys), 1000):
+        await client.delete(*keys[offset : offset + 1000])
+
+
+async def main():
+    """Run the Redis write benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--readings", type=int, default=20000)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=500, help="Readings per consumed batch")
+    args = parser.parse_args()
+
+    client = redis.Redis.from_url(args.redis_url)
+    await client.ping()
+
+    readings = generate_readings(args.readings, args.devices)
+    print(f"📊 {args.readings} readings across {args.devices} devices ({args.redis_url})\n")
+
+    try:
+        legacy = await run("before: 5 round-trips", client, readings, 1, write_legacy)
+        await run("after: per reading", client, readings, 1, write_pipelined)
+        batched = await run(f"after: per {args.batch_size} batch", client, readings, args.batch_size, write_pipelined)
+        print(f"\n⚡ Batched speedup: {batched / legacy:.1f}x")
+    finally:
+        await cleanup(client)
+        await client.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
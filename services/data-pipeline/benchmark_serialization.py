@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Event serialization microbenchmark for the Kafka wire formats.
+
+Measures encode and decode cost (µs per event) and payload size for
+temperature reading and validated events in three modes:
+
+- JSON with full pydantic validation (the previous decode path)
+- JSON with the fast-path validator in ``src/schemas/events.py``
+- the binary wire format in ``src/schemas/wire_format.py``
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+
+from src.schemas.events import (
+    EVENT_SCHEMAS,
+    EventType,
+    TemperatureReading,
+    TemperatureReadingEvent,
+    TemperatureValidatedEvent,
+    serialize_event,
+)
+from src.schemas.wire_format import decode_event, encode_event
+
+
+def generate_events(count, validated):
+    """Generate temperature events spread across devices."""
+    start = datetime.utcnow() - timedelta(seconds=count)
+    events = []
+    for i in range(count):
+        reading = TemperatureReading(
+            device_id=f"device_{i % 100}",
+            device_name=f"Smoker probe {i % 100}",
+            temperature=150.0 + (i % 1500) / 10,
+            battery_level=80.0 - (i % 50) / 10,
+            signal_strength=-50.0 - (i % 30),
+            location="backyard",
+            status="online",
+        )
+        fields = {"event_id": f"event_{i}", "source": "benchmark", "timestamp": start + timedelta(seconds=i)}
+        if validated:
+            events.append(
+                TemperatureValidatedEvent(data=reading, validation_status="valid", processing_time_ms=0.42, **fields)
+            )
+        else:
+            events.append(TemperatureReadingEvent(data=reading, **fields))
+    return events
+
+
+def encode_json(event):
+    return json.dumps(serialize_event(event), default=str).encode("utf-8")
+
+
+def decode_json_full(payload):
+    """Previous decode path: JSON parse and full model validation."""
+    data = json.loads(payload)
+    return EVENT_SCHEMAS[EventType(data["event_type"])](**data)
+
+
+def measure(function, items, repeat):
+    """Best-of-``repeat`` cost of ``function`` in µs per item."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e6
+
+
+def main():
+    """Run the serialization benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for label, validated in (("TemperatureReadingEvent", False), ("TemperatureValidatedEvent", True)):
+        events = generate_events(args.events, validated)
+        json_payloads = [encode_json(event) for event in events]
+        binary_payloads = [encode_event(event) for event in events]
+
+        # Round trip sanity check
+        assert all(decode_event(payload).dict() == event.dict() for payload, event in zip(binary_payloads, events))
+
+        json_size = sum(map(len, json_payloads)) / len(events)
+        binary_size = sum(map(len, binary_payloads)) / len(events)
+
+        rows = [
+            (
+                "JSON, full validation",
+                measure(encode_json, events, args.repeat),
+                measure(decode_json_full, json_payloads, args.repeat),
+                json_size,
+            ),
+            ("JSON, fast-path validator", None, measure(decode_event, json_payloads, args.repeat), json_size),
+            (
+                "binary wire format",
+                measure(encode_event, events, args.repeat),
+                measure(decode_event, binary_payloads, args.repeat),
+                binary_size,
+            ),
+        ]
+
+        print(f"\n📊 {label} ({args.events} events)")
+        print(f"{'format':<28} {'encode µs':>10} {'decode µs':>10} {'bytes':>8}")
+        for name, encode_us, decode_us, size in rows:
+            encode_text = f"{encode_us:.2f}" if encode_us is not None else "-"
+            print(f"{name:<28} {encode_text:>10} {decode_us:>10.2f} {size:>8.0f}")
+
+        baseline, binary = rows[0], rows[2]
+        print(
+            f"⚡ binary vs JSON: encode {baseline[1] / binary[1]:.1f}x, decode {baseline[2] / binary[2]:.1f}x, "
+            f"{1 - binary[3] / baseline[3]:.0%} smaller"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Memory comparison for the ``temperature:{device}:series`` sorted sets.
+
+Compares JSON document members with the packed binary members from
+``src/processors/series_codec.py`` for 24h of 1 Hz readings per device,
+extrapolated to the whole fleet (default 1k devices).
+
+Without ``--redis-url`` only member payload sizes are compared. With a Redis
+server, sample devices are loaded in both encodings and measured with
+``MEMORY USAGE``, which includes the sorted set's per-entry overhead.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from src.processors.series_codec import decode_reading, encode_reading
+
+KEY_PREFIX = "benchmark:series"
+
+
+def generate_readings(points):
+    """Generate one device's readings at 1 Hz."""
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(seconds=points)
+    for i in range(points):
+        yield (
+            start + timedelta(seconds=i),
+            round(rng.uniform(150, 300), 2),
+            round(rng.uniform(20, 100), 1),
+            round(rng.uniform(-90, -30), 1),
+            "backyard",
+            "online",
+        )
+
+
+def json_member(timestamp, temperature, battery_level, signal_strength, location, status):
+    """Member as previously written by the aggregator."""
+    return json.dumps(
+        {
+            "timestamp": timestamp.isoformat(),
+            "temperature": temperature,
+            "battery_level": battery_level,
+            "signal_strength": signal_strength,
+            "location": location,
+            "status": status,
+        }
+    ).encode("utf-8")
+
+
+def human(size):
+    """Format a byte count."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:,.1f} {unit}"
+        size /= 1024
+
+
+def measure_redis(url, points, sample_devices):
+    """Load sample devices in both encodings and return bytes per device for each."""
+    import redis
+
+    client = redis.Redis.from_url(url)
+    client.ping()
+    usage = {}
+    try:
+        for label, encoder in (("json", json_member), ("binary", encode_reading)):
+            total = 0
+            for device in range(sample_devices):
+                key = f"{KEY_PREFIX}:{label}:{device}"
+                client.delete(key)
+                batch = {}
+                for reading in generate_readings(points):
+                    batch[encoder(*reading)] = reading[0].timestamp()
+                    if len(batch) >= 5000:
+                        client.zadd(key, batch)
+                        batch = {}
+                if batch:
+                    client.zadd(key, batch)
+                total += client.memory_usage(key, samples=0)
+                client.delete(key)
+            usage[label] = total / sample_devices
+    finally:
+        client.close()
+    return usage
+
+
+def main():
+    """Run the series memory comparison."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--redis-url", default=None, help="Measure real MEMORY USAGE on this Redis server")
+    parser.add_argument("--sample-devices", type=int, default=2)
+    args = parser.parse_args()
+
+    points = int(args.hours * 3600)
+    print(f"📊 {args.devices} devices × {args.hours:g}h at 1 Hz ({args.devices * points:,} readings)\n")
+
+    json_bytes = binary_bytes = 0
+    started = time.perf_counter()
+    for reading in generate_readings(points):
+        json_bytes += len(json_member(*reading))
+        member = encode_reading(*reading)
+        binary_bytes += len(member)
+    encode_seconds = time.perf_counter() - started
+
+    member = encode_reading(*next(generate_readings(1)))
+    started = time.perf_counter()
+    for _ in range(100000):
+        decode_reading(member)
+    decode_us = (time.perf_counter() - started) / 100000 * 1e6
+
+    json_member_sample = json_member(*next(generate_readings(1)))
+    started = time.perf_counter()
+    for _ in range(100000):
+        json.loads(json_member_sample)
+    json_decode_us = (time.perf_counter() - started) / 100000 * 1e6
+
+    print("Member payload only:")
+    print(f"  JSON    {json_bytes / points:6.1f} B/point  {human(json_bytes * args.devices):>12} for the fleet")
+    print(f"  binary  {binary_bytes / points:6.1f} B/point  {human(binary_bytes * args.devices):>12} for the fleet")
+    print(f"  decode: JSON {json_decode_us:.2f} µs/point, binary {decode_us:.2f} µs/point")
+    print(f"  (encoded {points:,} points per encoding in {encode_seconds:.1f}s)")
+
+    if args.redis_url:
+        usage = measure_redis(args.redis_url, points, args.sample_devices)
+        print(f"\nRedis MEMORY USAGE (averaged over {args.sample_devices} devices):")
+        for label in ("json", "binary"):
+            print(
+                f"  {label:<7} {human(usage[label]):>12} per device  "
+                f"{human(usage[label] * args.devices):>12} for the fleet"
+            )
+        print(f"\n⚡ Reduction: {(1 - usage['binary'] / usage['json']) * 100:.1f}%")
+    else:
+        print(f"\n⚡ Payload reduction: {(1 - binary_bytes / json_bytes) * 100:.1f}% (pass --redis-url for full key size)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
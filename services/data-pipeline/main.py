@@ -15,6 +15,7 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from src.kafka.consumer_manager import ConsumerManager
+from src.kafka.lag_sampler import ConsumerLagSampler
 from src.kafka.producer_manager import ProducerManager
 from src.processors.anomaly_detector import AnomalyDetector
 from src.processors.temperature_aggregator import TemperatureAggregationService
@@ -48,6 +49,7 @@ metrics = MetricsCollector()
 health_checker = HealthChecker()
 producer_manager = None
 consumer_manager = None
+lag_sampler = None
 temperature_aggregator = None
 anomaly_detector = None
 
@@ -70,22 +72,24 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     """Initialize all components on startup."""
-    global producer_manager, consumer_manager, temperature_aggregator, anomaly_detector
+    global producer_manager, consumer_manager, lag_sampler, temperature_aggregator, anomaly_detector
 
     try:
         logger.info("Starting data pipeline service...")
 
         # Initialize Kafka managers
         producer_manager = ProducerManager(config.kafka_config)
-        consumer_manager = ConsumerManager(config.kafka_config)
+        consumer_manager = ConsumerManager(config.kafka_config, producer_manager)
+        lag_sampler = ConsumerLagSampler(consumer_manager, metrics, config.kafka_config)
 
         # Initialize processors
         temperature_aggregator = TemperatureAggregationService(producer_manager, config.redis_config)
-        anomaly_detector = AnomalyDetector(producer_manager, config.redis_config)
+        anomaly_detector = AnomalyDetector(producer_manager, config.redis_config, config.processing_config)
 
         # Start background tasks
         asyncio.create_task(start_consumers())
         asyncio.create_task(health_check_loop())
+        lag_sampler.start()
 
         logger.info("Data pipeline service started successfully")
 
@@ -100,6 +104,8 @@ async def shutdown_event():
     try:
         logger.info("Shutting down data pipeline service...")
 
+        if lag_sampler:
+            await lag_sampler.stop()
         if consumer_manager:
             await consumer_manager.stop_all()
         if producer_manager:
@@ -122,14 +128,16 @@ async def start_consumers():
         await consumer_manager.start_consumer(
             "temperature-readings-consumer",
             ["temperature.readings.raw"],
-            temperature_aggregator.process_temperature_reading,
+            temperature_aggregator.process_temperature_readings,
+            batch=True,
         )
 
         # Validated readings consumer for anomaly detection
         await consumer_manager.start_consumer(
             "anomaly-detector-consumer",
             ["temperature.readings.validated"],
-            anomaly_detector.process_validated_reading,
+            anomaly_detector.process_validated_readings,
+            batch=True,
         )
 
         logger.info("All consumers started successfully")
@@ -195,6 +203,14 @@ async def get_status():
         raise HTTPException(status_code=500, detail="Status check failed")
 
 
+@app.get("/scaling")
+async def get_scaling_recommendation():
+    """Recommended number of pipeline instances from consumer lag and throughput."""
+    if not lag_sampler:
+        raise HTTPException(status_code=503, detail="Lag sampler not initialized")
+    return lag_sampler.get_recommendation()
+
+
 @app.post("/sync/trigger")
 async def trigger_sync():
     """Manually trigger a temperature sync."""
@@ -214,7 +230,7 @@ async def retrain_anomaly_detector():
     """Retrain the anomaly detection model."""
     try:
         if anomaly_detector:
-            await anomaly_detector.retrain_model()
+            await anomaly_detector.retrain_model(wait=False)
             return {"status": "retraining_started"}
         else:
             raise HTTPException(status_code=503, detail="Anomaly detector not initialized")
@@ -223,6 +239,14 @@ async def retrain_anomaly_detector():
         raise HTTPException(status_code=500, detail="Retrain failed")
 
 
+@app.get("/anomaly/training")
+async def get_anomaly_training_status():
+    """Get queued, running and finished anomaly model trainings."""
+    if not anomaly_detector:
+        raise HTTPException(status_code=503, detail="Anomaly detector not initialized")
+    return anomaly_detector.get_training_status()
+
+
 def signal_handler(signum, frame):
     """Handle shutdown signals."""
     logger.info("Received shutdown signal", signal=signum)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Replay dead-lettered messages into the topic they were consumed from.
+
+Reads a dead-letter topic (``<topic>.dlq``) written by ``ConsumerManager``
+and re-produces each message to its ``original_topic`` header with the
+retry and failure headers removed, so it is processed as a new message with
+a fresh set of retry tiers. Offsets of the replay consumer group are
+committed once the replayed messages have been delivered, so running the
+command again continues where it stopped.
+
+Example::
+
+    python replay_dlq.py --topic temperature.readings.raw.dlq --reason KeyError --limit 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+from confluent_kafka import Consumer, Producer, TopicPartition
+
+from src.kafka.consumer_manager import (
+    HEADER_FAILURE_ERROR,
+    HEADER_FAILURE_REASON,
+    HEADER_ORIGINAL_TOPIC,
+    HEADER_RETRY_ATTEMPT,
+    HEADER_RETRY_DUE_MS,
+)
+
+ROUTING_HEADERS = {
+    HEADER_ORIGINAL_TOPIC,
+    HEADER_RETRY_ATTEMPT,
+    HEADER_RETRY_DUE_MS,
+    HEADER_FAILURE_REASON,
+    HEADER_FAILURE_ERROR,
+}
+
+
+def header_text(headers, name):
+    """Value of a message header as text."""
+    value = headers.get(name)
+    return value.decode("utf-8", "replace") if value else ""
+
+
+def main():
+    """Run the dead-letter replay."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topic", required=True, help="Dead-letter topic to replay")
+    parser.add_argument("--bootstrap-servers", default=os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092"))
+    parser.add_argument("--group", default="dlq-replay", help="Consumer group of the replay")
+    parser.add_argument("--limit", type=int, help="Replay at most this many messages")
+    parser.add_argument(
+        "--reason",
+        help="Only replay messages with this failure reason; others are skipped and committed (use a --group per reason)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Count messages without replaying or committing")
+    parser.add_argument("--idle-timeout", type=float, default=30.0, help="Stop after this many seconds without messages")
+    args = parser.parse_args()
+
+    consumer = Consumer(
+        {
+            "bootstrap.servers": args.bootstrap_servers,
+            "group.id": args.group,
+            "auto.offset.reset": "earliest",
+            "enable.auto.commit": False,
+        }
+    )
+    producer = Producer({"bootstrap.servers": args.bootstrap_servers, "enable.idempotence": True})
+    consumer.subscribe([args.topic])
+
+    replayed = Counter()
+    skipped = Counter()
+    delivery_errors = []
+    last_message = time.time()
+
+    try:
+        while args.limit is None or sum(replayed.values()) < args.limit:
+            messages = consumer.consume(num_messages=500, timeout=1.0)
+            if not messages:
+                if time.time() - last_message > args.idle_timeout:
+                    break
+                continue
+            last_message = time.time()
+
+            next_offsets = {}
+            for msg in messages:
+                if msg.error():
+                    print(f"❌ Consumer error: {msg.error()}", file=sys.stderr)
+                    continue
+                if args.limit is not None and sum(replayed.values()) >= args.limit:
+                    break
+                next_offsets[(msg.topic(), msg.partition())] = msg.offset() + 1
+
+                headers = dict(msg.headers() or [])
+                reason = header_text(headers, HEADER_FAILURE_REASON) or "unknown"
+                original_topic = header_text(headers, HEADER_ORIGINAL_TOPIC)
+                if not original_topic or (args.reason and reason != args.reason):
+                    skipped[reason] += 1
+                    continue
+
+                replayed[reason] += 1
+                if args.dry_run:
+                    continue
+
+                replay_headers = [(k, v) for k, v in headers.items() if k not in ROUTING_HEADERS]
+                replay_headers.append(("replayed_from", args.topic.encode("utf-8")))
+                producer.produce(
+                    original_topic,
+                    key=msg.key(),
+                    value=msg.value(),
+                    headers=replay_headers,
+                    on_delivery=lambda err, _: err and delivery_errors.append(err),
+                )
+                producer.poll(0)
+
+            if args.dry_run:
+                continue
+
+            # Commit only once the batch has been delivered to the original topics
+            producer.flush()
+            if delivery_errors:
+                print(f"❌ {len(delivery_errors)} messages not delivered: {delivery_errors[0]}", file=sys.stderr)
+                return 1
+            if next_offsets:
+                offsets = [TopicPartition(topic, partition, offset) for (topic, partition), offset in next_offsets.items()]
+                consumer.commit(offsets=offsets, asynchronous=False)
+
+    finally:
+        consumer.close()
+
+    action = "Would replay" if args.dry_run else "Replayed"
+    print(f"✅ {action} {sum(replayed.values())} messages from {args.topic}")
+    for reason, count in replayed.most_common():
+        print(f"   {reason:<30} {count:>8}")
+    if skipped:
+        print(f"⏭️  Skipped {sum(skipped.values())} messages")
+        for reason, count in skipped.most_common():
+            print(f"   {reason:<30} {count:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,32 @@
 """
 Kafka consumer manager for processing events from topics.
+
+Messages whose handler fails are re-published to retry topics with
+increasing delays (``<topic>.retry.<delay>s``) and, once every delay tier is
+exhausted, to a dead-letter topic (``<topic>.dlq``), so a poison message
+never blocks the partition it was consumed from. Messages that cannot be
+decoded go straight to the dead-letter topic. ``replay_dlq.py`` re-injects
+dead-lettered messages into their original topic.
 """
 
 import asyncio
+import concurrent.futures
 import json
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import structlog
-from confluent_kafka import Consumer, KafkaError, KafkaException
+from confluent_kafka import Consumer, KafkaError, KafkaException, TopicPartition
 from prometheus_client import Counter, Gauge, Histogram
 
-from ..schemas.events import BaseEvent, deserialize_event
+from ..schemas.events import BaseEvent
+from ..schemas.wire_format import decode_event
 from ..utils.config import KafkaConfig
+from .keyed_worker_pool import KeyedWorkerPool
+from .producer_manager import ProducerManager
 
 logger = structlog.get_logger()
 
@@ -25,23 +39,102 @@ MESSAGES_RECEIVED = Counter(
 PROCESSING_DURATION = Histogram("kafka_processing_duration_seconds", "Time spent processing messages", ["topic"])
 CONSUMER_LAG = Gauge("kafka_consumer_lag", "Consumer lag", ["topic", "partition"])
 ACTIVE_CONSUMERS = Gauge("kafka_active_consumers", "Number of active consumers")
+CONSUMER_BATCH_SIZE = Histogram(
+    "kafka_consumer_batch_size",
+    "Messages per consumed batch",
+    ["consumer_id"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+BATCH_PROCESSING_DURATION = Histogram(
+    "kafka_batch_processing_duration_seconds",
+    "Time spent processing a consumed batch",
+    ["consumer_id"],
+)
+CONSUMER_QUEUE_DEPTH = Gauge(
+    "kafka_consumer_queue_depth",
+    "Consumed batches waiting to be processed",
+    ["consumer_id"],
+)
+HANDOFF_LATENCY = Histogram(
+    "kafka_consumer_handoff_latency_seconds",
+    "Time a consumed batch waits between the poll thread and the event loop",
+    ["consumer_id"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+FAILED_MESSAGES = Counter(
+    "kafka_failed_messages_total",
+    "Messages that failed processing, by failure reason and where they were routed",
+    ["topic", "reason", "destination"],
+)
+
+# Headers carried by retried and dead-lettered messages
+HEADER_ORIGINAL_TOPIC = "original_topic"
+HEADER_RETRY_ATTEMPT = "retry_attempt"
+HEADER_RETRY_DUE_MS = "retry_due_ms"
+HEADER_FAILURE_REASON = "failure_reason"
+HEADER_FAILURE_ERROR = "failure_error"
+
+# Decode failures will fail again on retry
+NON_RETRYABLE_REASONS = {"json_error", "deserialize_error"}
+
+# A failed message with its failure reason and error text
+Failure = Tuple[Any, str, str]
+
+
+def retry_topic(topic: str, delay_seconds: int) -> str:
+    """Name of the retry topic of a delay tier."""
+    return f"{topic}.retry.{delay_seconds}s"
+
+
+def dead_letter_topic(topic: str) -> str:
+    """Name of the dead-letter topic of a topic."""
+    return f"{topic}.dlq"
+
+
+def message_headers(msg) -> Dict[str, bytes]:
+    """Headers of a consumed message as a dict."""
+    return dict(msg.headers() or [])
 
 
 class ConsumerManager:
     """Manages Kafka consumers and message processing."""
 
-    def __init__(self, kafka_config: KafkaConfig):
+    def __init__(self, kafka_config: KafkaConfig, producer_manager: Optional[ProducerManager] = None):
         self.kafka_config = kafka_config
+        self.producer_manager = producer_manager
         self.consumers: Dict[str, Consumer] = {}
         self.consumer_tasks: Dict[str, asyncio.Task] = {}
         self.is_running = False
         self.processing_handlers: Dict[str, Callable] = {}
+        self.batch_consumers: Set[str] = set()
+        self.batch_stats: Dict[str, Dict[str, Any]] = {}
+        self.poll_threads: Dict[str, threading.Thread] = {}
+        self.poll_stop_events: Dict[str, threading.Event] = {}
+        self.handoff_queues: Dict[str, asyncio.Queue] = {}
+        self.handoff_stats: Dict[str, Dict[str, Any]] = {}
+        self.worker_pools: Dict[str, KeyedWorkerPool] = {}
+        self.event_loops: Dict[str, asyncio.AbstractEventLoop] = {}
+        self.commit_queues: Dict[str, asyncio.Queue] = {}
+        self.commit_tasks: Dict[str, asyncio.Task] = {}
+        self.retry_consumers: Dict[str, List[str]] = {}
+        self.consumer_topics: Dict[str, List[str]] = {}
+        self.group_ids: Dict[str, str] = {}
+        self.retry_delays: Dict[str, int] = {}
+        # Partitions whose failed messages could not be routed; their offsets
+        # are not committed again until the partition is revoked
+        self.blocked_partitions: Dict[str, Set[Tuple[str, int]]] = {}
 
         # Start the manager
         self.is_running = True
         logger.info("Consumer manager initialized")
 
-    def _create_consumer(self, group_id: str, topics: List[str]) -> Consumer:
+    def _create_consumer(
+        self,
+        group_id: str,
+        topics: List[str],
+        enable_auto_commit: Optional[bool] = None,
+        on_revoke: Optional[Callable] = None,
+    ) -> Consumer:
         """Create a new Kafka consumer."""
         try:
             consumer_config = {
@@ -49,12 +142,15 @@ class ConsumerManager:
                 "security.protocol": self.kafka_config.security_protocol,
                 "group.id": group_id,
                 "auto.offset.reset": self.kafka_config.auto_offset_reset,
-                "enable.auto.commit": self.kafka_config.enable_auto_commit,
+                "enable.auto.commit": (
+                    self.kafka_config.enable_auto_commit if enable_auto_commit is None else enable_auto_commit
+                ),
                 "auto.commit.interval.ms": self.kafka_config.auto_commit_interval_ms,
                 "session.timeout.ms": self.kafka_config.session_timeout_ms,
-                "max.poll.records": self.kafka_config.max_poll_records,
                 "fetch.min.bytes": self.kafka_config.fetch_min_bytes,
-                "fetch.max.wait.ms": self.kafka_config.fetch_max_wait_ms,
+                "fetch.wait.max.ms": self.kafka_config.fetch_max_wait_ms,
+                # Offsets are stored once messages are processed, not when the poll thread consumes them
+                "enable.auto.offset.store": False,
                 "enable.partition.eof": False,
                 "api.version.request": True,
                 "broker.version.fallback": "0.10.0.0",
@@ -71,7 +167,10 @@ class ConsumerManager:
                 )
 
             consumer = Consumer(consumer_config)
-            consumer.subscribe(topics)
+            if on_revoke:
+                consumer.subscribe(topics, on_revoke=on_revoke)
+            else:
+                consumer.subscribe(topics)
 
             logger.info("Kafka consumer created", group_id=group_id, topics=topics)
             return consumer
@@ -91,8 +190,24 @@ class ConsumerManager:
         topics: List[str],
         message_handler: Callable[[BaseEvent], None],
         group_id: Optional[str] = None,
+        batch: bool = False,
+        workers: Optional[int] = None,
+        retry: bool = True,
     ):
-        """Start a new consumer for the specified topics."""
+        """Start a new consumer for the specified topics.
+
+        In batch mode each consumed batch is sharded by device ID across
+        ``workers`` keyed workers (KAFKA_CONSUMER_WORKERS by default), which
+        call the handler with their share of the events. Events of one device
+        are handled in order. Offsets are committed in consumption order once
+        every event of a batch has been handled. Batch handlers return the
+        ``(event, error)`` pairs of the events they failed to process.
+
+        Failed messages are routed to retry and dead-letter topics when a
+        producer manager is available. With ``retry`` set and retries enabled
+        (KAFKA_RETRY_ENABLED), a consumer with the same handler is also
+        started for each delay tier of KAFKA_RETRY_DELAYS_SECONDS.
+        """
         try:
             if consumer_id in self.consumers:
                 logger.warning("Consumer already exists", consumer_id=consumer_id)
@@ -102,10 +217,52 @@ class ConsumerManager:
             if group_id is None:
                 group_id = f"{self.kafka_config.consumer_group_id}-{consumer_id}"
 
-            # Create consumer
-            consumer = self._create_consumer(group_id, topics)
+            # Create consumer; batch mode commits explicitly after each batch
+            stop_event = threading.Event()
+            consumer = self._create_consumer(
+                group_id,
+                topics,
+                enable_auto_commit=False if batch else None,
+                on_revoke=(
+                    lambda revoked_consumer, partitions: self._on_partitions_revoked(consumer_id, revoked_consumer, partitions)
+                ),
+            )
             self.consumers[consumer_id] = consumer
+            self.consumer_topics[consumer_id] = list(topics)
+            self.group_ids[consumer_id] = group_id
             self.processing_handlers[consumer_id] = message_handler
+            if batch:
+                self.batch_consumers.add(consumer_id)
+                self.batch_stats[consumer_id] = {"batches": 0, "messages": 0, "max_batch_size": 0, "commit_errors": 0}
+
+                pool = KeyedWorkerPool(
+                    consumer_id,
+                    message_handler,
+                    workers=workers or self.kafka_config.consumer_workers,
+                )
+                pool.start()
+                self.worker_pools[consumer_id] = pool
+                self.commit_queues[consumer_id] = asyncio.Queue(maxsize=self.kafka_config.consumer_queue_max_batches)
+                self.commit_tasks[consumer_id] = asyncio.create_task(self._commit_loop(consumer_id))
+
+            # Poll on a dedicated thread and hand batches to the event loop through a bounded queue
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.kafka_config.consumer_queue_max_batches)
+            self.handoff_queues[consumer_id] = queue
+            self.handoff_stats[consumer_id] = {
+                "batches": 0,
+                "blocked_seconds": 0.0,
+                "latencies": deque(maxlen=1000),
+            }
+            self.poll_stop_events[consumer_id] = stop_event
+            self.event_loops[consumer_id] = asyncio.get_running_loop()
+            poll_thread = threading.Thread(
+                target=self._poll_loop,
+                args=(consumer_id, consumer, queue, self.event_loops[consumer_id], stop_event),
+                name=f"kafka-poll-{consumer_id}",
+                daemon=True,
+            )
+            self.poll_threads[consumer_id] = poll_thread
+            poll_thread.start()
 
             # Start consumer task
             task = asyncio.create_task(self._consume_loop(consumer_id, topics))
@@ -117,8 +274,12 @@ class ConsumerManager:
                 consumer_id=consumer_id,
                 topics=topics,
                 group_id=group_id,
+                batch=batch,
             )
 
+            if retry and self.kafka_config.retry_enabled and self.producer_manager:
+                await self._start_retry_consumers(consumer_id, topics, message_handler, group_id, batch, workers)
+
         except Exception as e:
             logger.error(
                 "Failed to start consumer",
@@ -128,48 +289,122 @@ class ConsumerManager:
             )
             raise
 
+    async def _start_retry_consumers(
+        self,
+        consumer_id: str,
+        topics: List[str],
+        message_handler: Callable,
+        group_id: str,
+        batch: bool,
+        workers: Optional[int],
+    ):
+        """Start one consumer per retry delay tier of a consumer's topics."""
+        delays = self.kafka_config.retry_delays_seconds
+        routing_topics = [retry_topic(topic, delay) for topic in topics for delay in delays]
+        routing_topics += [dead_letter_topic(topic) for topic in topics]
+        try:
+            await self.producer_manager.create_topics(routing_topics)
+        except Exception as e:
+            logger.warning("Failed to create retry topics", consumer_id=consumer_id, error=str(e))
+
+        retry_ids = []
+        for delay in delays:
+            retry_id = f"{consumer_id}.retry.{delay}s"
+            self.retry_delays[retry_id] = delay
+            await self.start_consumer(
+                retry_id,
+                [retry_topic(topic, delay) for topic in topics],
+                message_handler,
+                group_id=f"{group_id}.retry.{delay}s",
+                batch=batch,
+                workers=workers,
+                retry=False,
+            )
+            retry_ids.append(retry_id)
+        self.retry_consumers[consumer_id] = retry_ids
+
+    def _poll_loop(
+        self,
+        consumer_id: str,
+        consumer: Consumer,
+        queue: asyncio.Queue,
+        loop: asyncio.AbstractEventLoop,
+        stop_event: threading.Event,
+    ):
+        """Poll Kafka on a dedicated thread and hand batches of messages to the event loop.
+
+        Blocks while the handoff queue is full, so consumption slows down to
+        the rate the processors keep up with.
+        """
+        max_batch_size = self.kafka_config.consumer_batch_max_size
+        max_latency = self.kafka_config.consumer_batch_max_latency_ms / 1000
+        stats = self.handoff_stats[consumer_id]
+
+        while not stop_event.is_set():
+            try:
+                # Wait until the batch is full or the latency budget is spent
+                messages = consumer.consume(num_messages=max_batch_size, timeout=max_latency)
+            except KafkaException as e:
+                logger.error("Kafka exception in poll loop", consumer_id=consumer_id, error=str(e))
+                stop_event.wait(1)
+                continue
+            except Exception as e:
+                logger.error("Unexpected error in poll loop", consumer_id=consumer_id, error=str(e))
+                stop_event.wait(1)
+                continue
+
+            if not messages:
+                continue
+
+            put_started = time.perf_counter()
+            try:
+                handoff = asyncio.run_coroutine_threadsafe(queue.put((messages, put_started)), loop)
+            except RuntimeError:
+                # Event loop is closed
+                break
+
+            while True:
+                try:
+                    handoff.result(timeout=0.5)
+                    break
+                except concurrent.futures.TimeoutError:
+                    if stop_event.is_set():
+                        handoff.cancel()
+                        break
+                except concurrent.futures.CancelledError:
+                    break
+
+            stats["blocked_seconds"] += time.perf_counter() - put_started
+            CONSUMER_QUEUE_DEPTH.labels(consumer_id=consumer_id).set(queue.qsize())
+
+        logger.info("Poll loop stopped", consumer_id=consumer_id)
+
     async def _consume_loop(self, consumer_id: str, topics: List[str]):
-        """Main consumer loop."""
+        """Main consumer loop; processes batches handed over by the poll thread."""
         consumer = self.consumers[consumer_id]
         message_handler = self.processing_handlers[consumer_id]
+        queue = self.handoff_queues[consumer_id]
+        stats = self.handoff_stats[consumer_id]
+        batch = consumer_id in self.batch_consumers
 
         try:
-            while self.is_running:
+            while True:
+                messages, enqueued_at = await queue.get()
+
+                handoff_latency = time.perf_counter() - enqueued_at
+                stats["batches"] += 1
+                stats["latencies"].append(handoff_latency)
+                HANDOFF_LATENCY.labels(consumer_id=consumer_id).observe(handoff_latency)
+                CONSUMER_QUEUE_DEPTH.labels(consumer_id=consumer_id).set(queue.qsize())
+
                 try:
-                    # Poll for messages
-                    msg = consumer.poll(timeout=1.0)
-
-                    if msg is None:
-                        continue
-
-                    if msg.error():
-                        if msg.error().code() == KafkaError._PARTITION_EOF:
-                            # End of partition event
-                            logger.debug(
-                                "Reached end of partition",
-                                consumer_id=consumer_id,
-                                topic=msg.topic(),
-                                partition=msg.partition(),
-                            )
-                            continue
-                        else:
-                            logger.error(
-                                "Consumer error",
-                                consumer_id=consumer_id,
-                                error=msg.error(),
-                            )
-                            continue
-
-                    # Process message
-                    await self._process_message(consumer_id, msg, message_handler)
-
-                except KafkaException as e:
-                    logger.error(
-                        "Kafka exception in consumer loop",
-                        consumer_id=consumer_id,
-                        error=str(e),
-                    )
-                    await asyncio.sleep(1)
+                    if consumer_id in self.retry_delays:
+                        await self._wait_until_due(messages)
+
+                    if batch:
+                        await self._dispatch_batch(consumer_id, messages)
+                    else:
+                        await self._process_messages(consumer_id, consumer, messages, message_handler)
 
                 except Exception as e:
                     logger.error(
@@ -177,56 +412,345 @@ class ConsumerManager:
                         consumer_id=consumer_id,
                         error=str(e),
                     )
-                    await asyncio.sleep(1)
+                finally:
+                    queue.task_done()
 
         except asyncio.CancelledError:
             logger.info("Consumer loop cancelled", consumer_id=consumer_id)
         finally:
-            # Close consumer
-            try:
-                consumer.close()
-            except Exception as e:
-                logger.error("Error closing consumer", consumer_id=consumer_id, error=str(e))
-
             ACTIVE_CONSUMERS.dec()
 
-    async def _process_message(self, consumer_id: str, msg, message_handler: Callable[[BaseEvent], None]):
-        """Process a single message."""
-        start_time = time.time()
-        topic = msg.topic()
+    async def _wait_until_due(self, messages: List):
+        """Hold a batch of a retry topic until its last message's retry delay has passed.
 
-        try:
-            # Decode message
-            value = msg.value().decode("utf-8") if msg.value() else None
-            if not value:
-                logger.warning("Empty message received", consumer_id=consumer_id, topic=topic)
-                return
+        Messages of a retry topic are due in the order they were produced, as
+        every message of the tier waits the same delay.
+        """
+        due_ms = 0
+        for msg in messages:
+            value = message_headers(msg).get(HEADER_RETRY_DUE_MS) if not msg.error() else None
+            if value:
+                due_ms = max(due_ms, int(value))
+
+        delay = due_ms / 1000 - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _process_messages(
+        self, consumer_id: str, consumer: Consumer, messages: List, message_handler: Callable[[BaseEvent], None]
+    ):
+        """Process a consumed batch one message at a time, storing each offset for auto-commit."""
+        for msg in messages:
+            if msg.error():
+                if msg.error().code() == KafkaError._PARTITION_EOF:
+                    # End of partition event
+                    logger.debug(
+                        "Reached end of partition",
+                        consumer_id=consumer_id,
+                        topic=msg.topic(),
+                        partition=msg.partition(),
+                    )
+                else:
+                    logger.error(
+                        "Consumer error",
+                        consumer_id=consumer_id,
+                        error=msg.error(),
+                    )
+                continue
 
-            # Parse JSON
+            partition = (msg.topic(), msg.partition())
+            if partition in self.blocked_partitions.get(consumer_id, ()):
+                continue
+
+            # Process message
+            failure = await self._process_message(consumer_id, msg, message_handler)
+            if failure:
+                try:
+                    await self._route_failures(consumer_id, [failure])
+                except Exception as e:
+                    self._block_partitions(consumer_id, [failure], e)
+                    continue
+
+            # Only processed messages become eligible for auto-commit
             try:
-                message_data = json.loads(value)
-            except json.JSONDecodeError as e:
-                logger.error(
-                    "Failed to parse JSON message",
+                consumer.store_offsets(message=msg)
+            except KafkaException as e:
+                logger.warning("Failed to store message offset", consumer_id=consumer_id, error=str(e))
+
+    async def _dispatch_batch(self, consumer_id: str, messages: List):
+        """Deserialize a consumed batch, hand it to the keyed workers and queue its offsets for commit."""
+        events = []
+        event_messages: Dict[int, Any] = {}
+        decode_failures: List[Failure] = []
+        next_offsets: Dict[tuple, int] = {}
+        for msg in messages:
+            if msg.error():
+                if msg.error().code() != KafkaError._PARTITION_EOF:
+                    logger.error("Consumer error", consumer_id=consumer_id, error=msg.error())
+                continue
+
+            next_offsets[(msg.topic(), msg.partition())] = msg.offset() + 1
+            event, failure = self._decode_message(consumer_id, msg)
+            if event is not None:
+                events.append(event)
+                event_messages[id(event)] = msg
+            elif failure:
+                decode_failures.append(failure)
+
+        done = await self.worker_pools[consumer_id].submit(events)
+        await self.commit_queues[consumer_id].put(
+            (done, len(messages), event_messages, decode_failures, next_offsets, time.time())
+        )
+
+    async def _commit_loop(self, consumer_id: str):
+        """Commit batch offsets in consumption order as the keyed workers finish each batch."""
+        consumer = self.consumers[consumer_id]
+        queue = self.commit_queues[consumer_id]
+        stats = self.batch_stats[consumer_id]
+
+        while True:
+            done, message_count, event_messages, decode_failures, next_offsets, start_time = await queue.get()
+            try:
+                handler_failures = await done
+
+                topic_counts: Dict[str, int] = {}
+                for msg in event_messages.values():
+                    topic_counts[msg.topic()] = topic_counts.get(msg.topic(), 0) + 1
+                failures = list(decode_failures)
+                for event, error in handler_failures:
+                    msg = event_messages[id(event)]
+                    topic_counts[msg.topic()] -= 1
+                    MESSAGES_RECEIVED.labels(topic=msg.topic(), status="handler_error").inc()
+                    failures.append((msg, type(error).__name__, str(error)))
+                for event_topic, count in topic_counts.items():
+                    MESSAGES_RECEIVED.labels(topic=event_topic, status="success").inc(count)
+
+                # Failed messages are handed off before their offsets are committed
+                try:
+                    await self._route_failures(consumer_id, failures)
+                except Exception as e:
+                    self._block_partitions(consumer_id, failures, e)
+
+                # Every earlier batch has been committed, so these offsets cover all handled
+                # messages, except on partitions that hold a message that could not be routed
+                blocked = self.blocked_partitions.get(consumer_id, set())
+                offsets = [
+                    TopicPartition(topic, partition, offset)
+                    for (topic, partition), offset in next_offsets.items()
+                    if (topic, partition) not in blocked
+                ]
+                if offsets:
+                    try:
+                        consumer.commit(offsets=offsets, asynchronous=True)
+                    except KafkaException as e:
+                        stats["commit_errors"] += 1
+                        logger.warning("Failed to commit batch offsets", consumer_id=consumer_id, error=str(e))
+
+                processing_time = time.time() - start_time
+                stats["batches"] += 1
+                stats["messages"] += message_count
+                stats["max_batch_size"] = max(stats["max_batch_size"], message_count)
+                CONSUMER_BATCH_SIZE.labels(consumer_id=consumer_id).observe(message_count)
+                BATCH_PROCESSING_DURATION.labels(consumer_id=consumer_id).observe(processing_time)
+
+                logger.debug(
+                    "Batch processed",
                     consumer_id=consumer_id,
-                    topic=topic,
-                    error=str(e),
+                    batch_size=message_count,
+                    processing_time=processing_time,
                 )
-                MESSAGES_RECEIVED.labels(topic=topic, status="json_error").inc()
-                return
 
-            # Deserialize event
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Unexpected error in commit loop", consumer_id=consumer_id, error=str(e))
+            finally:
+                queue.task_done()
+
+    def _block_partitions(self, consumer_id: str, failures: List[Failure], error: Exception):
+        """Stop committing the partitions of failed messages that could not be routed.
+
+        Committing a later offset on those partitions would skip the failed
+        messages; leaving them uncommitted gets them redelivered instead.
+        """
+        partitions = {(msg.topic(), msg.partition()) for msg, _, _ in failures}
+        self.blocked_partitions.setdefault(consumer_id, set()).update(partitions)
+        logger.error(
+            "Failed to route failed messages; no longer committing their partitions",
+            consumer_id=consumer_id,
+            partitions=sorted(f"{topic}:{partition}" for topic, partition in partitions),
+            error=str(error),
+        )
+
+    async def _drain(self, consumer_id: str):
+        """Wait until every consumed batch has been handled and its offsets committed."""
+        if consumer_id in self.handoff_queues:
+            await self.handoff_queues[consumer_id].join()
+        if consumer_id in self.commit_queues:
+            await self.commit_queues[consumer_id].join()
+
+    def _on_partitions_revoked(self, consumer_id: str, consumer: Consumer, partitions: List):
+        """Finish and commit in-flight batches before a rebalance takes partitions away.
+
+        Runs on the poll thread inside consume(), so no new batches are handed
+        over while the event loop drains the ones already consumed.
+        """
+        stop_event = self.poll_stop_events.get(consumer_id)
+        loop = self.event_loops.get(consumer_id)
+        if stop_event is None or stop_event.is_set() or loop is None:
+            # Shutting down; stop_consumer() drains before closing the consumer
+            return
+
+        drain = asyncio.run_coroutine_threadsafe(self._drain(consumer_id), loop)
+        try:
+            drain.result(timeout=self.kafka_config.session_timeout_ms / 1000)
+        except concurrent.futures.TimeoutError:
+            drain.cancel()
+            logger.warning(
+                "Timed out draining batches before rebalance; they may be redelivered",
+                consumer_id=consumer_id,
+            )
+        except Exception as e:
+            logger.error("Failed to drain batches before rebalance", consumer_id=consumer_id, error=str(e))
+
+        blocked = self.blocked_partitions.get(consumer_id, set())
+        if consumer_id in self.batch_consumers:
+            # Everything consumed has been handled, so the current position is safe to
+            # commit, except on partitions holding messages that could not be routed
             try:
-                event = deserialize_event(message_data)
+                if blocked:
+                    offsets = [
+                        tp
+                        for tp in consumer.position(consumer.assignment())
+                        if (tp.topic, tp.partition) not in blocked and tp.offset >= 0
+                    ]
+                    if offsets:
+                        consumer.commit(offsets=offsets, asynchronous=False)
+                else:
+                    consumer.commit(asynchronous=False)
+            except KafkaException as e:
+                if e.args[0].code() != KafkaError._NO_OFFSET:
+                    logger.warning("Failed to commit offsets before rebalance", consumer_id=consumer_id, error=str(e))
+
+        # The next owner resumes revoked partitions from their last committed offset
+        blocked.difference_update((tp.topic, tp.partition) for tp in partitions)
+
+        if consumer_id not in self.batch_consumers:
+            return
+
+        logger.info(
+            "Drained consumer before partition revocation",
+            consumer_id=consumer_id,
+            partitions=[f"{tp.topic}:{tp.partition}" for tp in partitions],
+        )
+
+    def _decode_message(self, consumer_id: str, msg) -> Tuple[Optional[BaseEvent], Optional[Failure]]:
+        """Decode and deserialize a message, recording failures in metrics.
+
+        Returns:
+            Tuple of (event, failure); the failure is set if the payload could not be decoded
+        """
+        topic = msg.topic()
+
+        value = msg.value()
+        if not value:
+            logger.warning("Empty message received", consumer_id=consumer_id, topic=topic)
+            return None, None
+
+        # Decode JSON or binary wire format payload
+        try:
+            return decode_event(value), None
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            logger.error(
+                "Failed to parse JSON message",
+                consumer_id=consumer_id,
+                topic=topic,
+                error=str(e),
+            )
+            MESSAGES_RECEIVED.labels(topic=topic, status="json_error").inc()
+            return None, (msg, "json_error", str(e))
+        except Exception as e:
+            logger.error(
+                "Failed to deserialize event",
+                consumer_id=consumer_id,
+                topic=topic,
+                error=str(e),
+            )
+            MESSAGES_RECEIVED.labels(topic=topic, status="deserialize_error").inc()
+            return None, (msg, "deserialize_error", str(e))
+
+    async def _route_failures(self, consumer_id: str, failures: List[Failure]):
+        """Re-publish failed messages to their next retry tier or dead-letter topic.
+
+        Waits until every message has been delivered, retrying with backoff,
+        so offsets are only committed once failed messages are safe elsewhere.
+        Without a producer manager failures are only counted.
+        """
+        if not failures:
+            return
+
+        delays = self.kafka_config.retry_delays_seconds if self.kafka_config.retry_enabled else []
+        messages = []
+        for msg, reason, error in failures:
+            headers: Dict[str, Any] = message_headers(msg)
+            original_topic = headers.get(HEADER_ORIGINAL_TOPIC, b"").decode("utf-8") or msg.topic()
+            attempt = int(headers.get(HEADER_RETRY_ATTEMPT, b"0"))
+
+            if reason not in NON_RETRYABLE_REASONS and attempt < len(delays):
+                destination, topic = "retry", retry_topic(original_topic, delays[attempt])
+                headers[HEADER_RETRY_ATTEMPT] = str(attempt + 1)
+                headers[HEADER_RETRY_DUE_MS] = str(int((time.time() + delays[attempt]) * 1000))
+            else:
+                destination, topic = "dlq", dead_letter_topic(original_topic)
+                headers.pop(HEADER_RETRY_DUE_MS, None)
+
+            if not self.producer_manager:
+                destination = "dropped"
+            FAILED_MESSAGES.labels(topic=original_topic, reason=reason, destination=destination).inc()
+
+            headers[HEADER_ORIGINAL_TOPIC] = original_topic
+            headers[HEADER_FAILURE_REASON] = reason
+            headers[HEADER_FAILURE_ERROR] = error[:1000]
+            messages.append((topic, msg.key(), msg.value() or b"", headers))
+
+        if not self.producer_manager:
+            logger.warning("No producer for failed messages; dropping them", consumer_id=consumer_id, count=len(failures))
+            return
+
+        backoff = 1.0
+        while True:
+            try:
+                result = await self.producer_manager.send_raw_messages(messages, wait=True)
+                if not result["failed"]:
+                    break
+                error = f"{result['failed']} of {result['messages']} messages not delivered"
             except Exception as e:
-                logger.error(
-                    "Failed to deserialize event",
-                    consumer_id=consumer_id,
-                    topic=topic,
-                    error=str(e),
-                )
-                MESSAGES_RECEIVED.labels(topic=topic, status="deserialize_error").inc()
-                return
+                error = str(e)
+
+            stop_event = self.poll_stop_events.get(consumer_id)
+            if stop_event is None or stop_event.is_set():
+                # Not committed, so the batch is redelivered after a restart
+                raise RuntimeError(f"Failed to route failed messages: {error}")
+
+            logger.warning("Failed to route failed messages; retrying", consumer_id=consumer_id, error=error)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+        logger.info("Routed failed messages", consumer_id=consumer_id, count=len(messages))
+
+    async def _process_message(self, consumer_id: str, msg, message_handler: Callable[[BaseEvent], None]) -> Optional[Failure]:
+        """Process a single message.
+
+        Returns:
+            The failure to route to a retry or dead-letter topic, if the message failed
+        """
+        start_time = time.time()
+        topic = msg.topic()
+
+        try:
+            event, failure = self._decode_message(consumer_id, msg)
+            if event is None:
+                return failure
 
             # Call message handler
             try:
@@ -246,7 +770,8 @@ class ConsumerManager:
                     error=str(e),
                 )
                 MESSAGES_RECEIVED.labels(topic=topic, status="handler_error").inc()
-                # Don't raise here - we want to continue processing other messages
+                # Don't raise here - the message is retried from a retry topic instead of blocking the partition
+                return msg, type(e).__name__, str(e)
 
             # Update metrics
             processing_time = time.time() - start_time
@@ -274,6 +799,7 @@ class ConsumerManager:
                 error=str(e),
             )
             MESSAGES_RECEIVED.labels(topic=topic, status="error").inc()
+        return None
 
     async def stop_consumer(self, consumer_id: str):
         """Stop a specific consumer."""
@@ -282,23 +808,58 @@ class ConsumerManager:
                 logger.warning("Consumer not found", consumer_id=consumer_id)
                 return
 
-            # Cancel consumer task
-            if consumer_id in self.consumer_tasks:
-                task = self.consumer_tasks[consumer_id]
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
-                del self.consumer_tasks[consumer_id]
+            # Retry tier consumers stop with their consumer
+            for retry_id in self.retry_consumers.pop(consumer_id, []):
+                if retry_id in self.consumers:
+                    await self.stop_consumer(retry_id)
+
+            # Stop the poll thread before the consumer is closed
+            if consumer_id in self.poll_stop_events:
+                self.poll_stop_events.pop(consumer_id).set()
+            if consumer_id in self.poll_threads:
+                poll_thread = self.poll_threads.pop(consumer_id)
+                await asyncio.get_running_loop().run_in_executor(None, poll_thread.join)
 
-            # Remove consumer
+            # Finish and commit the batches already consumed
+            try:
+                await asyncio.wait_for(self._drain(consumer_id), timeout=self.kafka_config.session_timeout_ms / 1000)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out draining consumer; remaining batches will be redelivered", consumer_id=consumer_id)
+
+            # Cancel consumer, commit and worker tasks
+            for tasks in (self.consumer_tasks, self.commit_tasks):
+                if consumer_id in tasks:
+                    task = tasks.pop(consumer_id)
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+            if consumer_id in self.worker_pools:
+                await self.worker_pools.pop(consumer_id).stop()
+
+            # Close and remove consumer; batches that were not drained are not committed and will be redelivered
             if consumer_id in self.consumers:
+                try:
+                    self.consumers[consumer_id].close()
+                except Exception as e:
+                    logger.error("Error closing consumer", consumer_id=consumer_id, error=str(e))
                 del self.consumers[consumer_id]
+            self.handoff_queues.pop(consumer_id, None)
+            self.handoff_stats.pop(consumer_id, None)
+            self.commit_queues.pop(consumer_id, None)
+            self.event_loops.pop(consumer_id, None)
+            CONSUMER_QUEUE_DEPTH.labels(consumer_id=consumer_id).set(0)
 
             # Remove handler
             if consumer_id in self.processing_handlers:
                 del self.processing_handlers[consumer_id]
+            self.batch_consumers.discard(consumer_id)
+            self.batch_stats.pop(consumer_id, None)
+            self.retry_delays.pop(consumer_id, None)
+            self.blocked_partitions.pop(consumer_id, None)
+            self.consumer_topics.pop(consumer_id, None)
+            self.group_ids.pop(consumer_id, None)
 
             logger.info("Consumer stopped", consumer_id=consumer_id)
 
@@ -314,7 +875,9 @@ class ConsumerManager:
             # Stop all consumers
             consumer_ids = list(self.consumers.keys())
             for consumer_id in consumer_ids:
-                await self.stop_consumer(consumer_id)
+                # Retry tier consumers are stopped with their consumer
+                if consumer_id in self.consumers:
+                    await self.stop_consumer(consumer_id)
 
             logger.info("All consumers stopped")
 
@@ -330,14 +893,18 @@ class ConsumerManager:
                 return
 
             # Get current topics and handler
-            topics = list(self.consumers[consumer_id].list_topics().topics.keys())
+            topics = self.consumer_topics[consumer_id]
             handler = self.processing_handlers[consumer_id]
+            batch = consumer_id in self.batch_consumers
+            retry_delay = self.retry_delays.get(consumer_id)
 
             # Stop consumer
             await self.stop_consumer(consumer_id)
 
             # Start consumer again
-            await self.start_consumer(consumer_id, topics, handler)
+            if retry_delay is not None:
+                self.retry_delays[consumer_id] = retry_delay
+            await self.start_consumer(consumer_id, topics, handler, batch=batch, retry=retry_delay is None)
 
             logger.info("Consumer restarted", consumer_id=consumer_id)
 
@@ -358,15 +925,60 @@ class ConsumerManager:
             assignment = consumer.assignment()
             topics = list(set(tp.topic for tp in assignment))
 
-            return {
+            status = {
                 "status": "running" if task and not task.done() else "stopped",
+                "mode": "batch" if consumer_id in self.batch_consumers else "single",
+                "retry_delay_seconds": self.retry_delays.get(consumer_id),
                 "topics": topics,
                 "assignment": [{"topic": tp.topic, "partition": tp.partition} for tp in assignment],
                 "task_done": task.done() if task else True,
+                "blocked_partitions": sorted(
+                    f"{topic}:{partition}" for topic, partition in self.blocked_partitions.get(consumer_id, ())
+                ),
             }
+
+            if consumer_id in self.batch_stats:
+                batch_stats = dict(self.batch_stats[consumer_id])
+                batch_stats["avg_batch_size"] = (
+                    round(batch_stats["messages"] / batch_stats["batches"], 2) if batch_stats["batches"] else 0.0
+                )
+                status["batch"] = batch_stats
+
+            if consumer_id in self.handoff_queues:
+                status["handoff"] = self._get_handoff_stats(consumer_id)
+
+            if consumer_id in self.worker_pools:
+                status["workers"] = self.worker_pools[consumer_id].get_stats()
+                status["workers"]["pending_commits"] = self.commit_queues[consumer_id].qsize()
+
+            return status
         except Exception as e:
             return {"status": "error", "error": str(e)}
 
+    def _get_handoff_stats(self, consumer_id: str) -> Dict[str, Any]:
+        """Queue depth and poll-thread-to-event-loop handoff latency of a consumer."""
+        queue = self.handoff_queues[consumer_id]
+        stats = self.handoff_stats[consumer_id]
+        poll_thread = self.poll_threads.get(consumer_id)
+
+        handoff = {
+            "poll_thread_alive": bool(poll_thread and poll_thread.is_alive()),
+            "queue_depth": queue.qsize(),
+            "queue_capacity": queue.maxsize,
+            "batches": stats["batches"],
+            "blocked_seconds": round(stats["blocked_seconds"], 3),
+        }
+
+        latencies = np.array(stats["latencies"]) * 1000
+        if len(latencies):
+            handoff["latency_ms"] = {
+                "p50": round(float(np.percentile(latencies, 50)), 3),
+                "p99": round(float(np.percentile(latencies, 99)), 3),
+                "max": round(float(latencies.max()), 3),
+            }
+
+        return handoff
+
     async def get_status(self) -> Dict[str, Any]:
         """Get overall consumer manager status."""
         consumer_statuses = {}
@@ -379,34 +991,56 @@ class ConsumerManager:
             "consumers": consumer_statuses,
         }
 
-    def get_consumer_lag(self, consumer_id: str) -> Dict[str, Any]:
-        """Get consumer lag information."""
-        if consumer_id not in self.consumers:
-            return {"error": "Consumer not found"}
+    def get_partition_offsets(self, consumer_id: str, timeout: float = 5.0) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """Committed offsets and watermarks of every partition of a consumer's topics.
 
+        Covers all partitions of the consumer group, including those assigned
+        to other instances. Makes blocking requests to the brokers, so call it
+        off the event loop.
+        """
         consumer = self.consumers[consumer_id]
+        assigned = {(tp.topic, tp.partition) for tp in consumer.assignment()}
+
+        partitions = []
+        for topic in self.consumer_topics[consumer_id]:
+            metadata = consumer.list_topics(topic, timeout=timeout).topics.get(topic)
+            if metadata is None or metadata.error:
+                continue
+            partitions.extend(TopicPartition(topic, partition) for partition in metadata.partitions)
+
+        offsets = {}
+        for tp in consumer.committed(partitions, timeout=timeout) if partitions else []:
+            low, high = consumer.get_watermark_offsets(tp, timeout=timeout)
+            committed = tp.offset
+            if committed < 0:
+                # Nothing committed yet; the group starts where auto.offset.reset points
+                committed = low if self.kafka_config.auto_offset_reset == "earliest" else high
+
+            offsets[(tp.topic, tp.partition)] = {
+                "committed_offset": committed,
+                "low_water_mark": low,
+                "high_water_mark": high,
+                "lag": max(0, high - committed),
+                "assigned": (tp.topic, tp.partition) in assigned,
+            }
 
-        try:
-            # Get committed offsets
-            assignment = consumer.assignment()
-            committed = consumer.committed(assignment)
-
-            # Get high water marks
-            high_water_marks = consumer.get_watermark_offsets(assignment[0]) if assignment else (0, 0)
+        return offsets
 
-            lag_info = {}
-            for tp in assignment:
-                committed_offset = committed[tp.partition].offset if tp.partition < len(committed) else 0
-                high_water_mark = high_water_marks[1] if len(high_water_marks) > 1 else 0
-                lag = max(0, high_water_mark - committed_offset)
+    def get_consumer_lag(self, consumer_id: str) -> Dict[str, Any]:
+        """Get consumer lag information for the partitions assigned to a consumer."""
+        if consumer_id not in self.consumers:
+            return {"error": "Consumer not found"}
 
-                lag_info[f"{tp.topic}_{tp.partition}"] = {
-                    "committed_offset": committed_offset,
-                    "high_water_mark": high_water_mark,
-                    "lag": lag,
+        try:
+            return {
+                f"{topic}_{partition}": {
+                    "committed_offset": offsets["committed_offset"],
+                    "high_water_mark": offsets["high_water_mark"],
+                    "lag": offsets["lag"],
                 }
-
-            return lag_info
+                for (topic, partition), offsets in self.get_partition_offsets(consumer_id).items()
+                if offsets["assigned"]
+            }
 
         except Exception as e:
             return {"error": str(e)}
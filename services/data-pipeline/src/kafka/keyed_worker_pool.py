@@ -0,0 +1,165 @@
+"""
+Keyed worker pool for parallel event processing with per-key ordering.
+
+Events are sharded across async workers by a stable hash of their key (the
+device ID for device events). Each worker handles its sub-batches one at a
+time in submission order, so the events of one device are processed in the
+order they were consumed while different devices are processed concurrently.
+
+A handler may return the ``(event, error)`` pairs of events it could not
+process; if it raises, every event of the sub-batch is reported as failed.
+"""
+
+import asyncio
+import zlib
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+from ..schemas.events import BaseEvent
+
+logger = structlog.get_logger()
+
+# Prometheus metrics
+WORKER_QUEUE_DEPTH = Gauge(
+    "kafka_worker_queue_depth",
+    "Sub-batches waiting for a keyed worker",
+    ["pool", "worker"],
+)
+WORKER_EVENTS = Counter(
+    "kafka_worker_events_total",
+    "Events processed by keyed workers",
+    ["pool", "worker", "status"],
+)
+
+
+def device_key(event: BaseEvent) -> str:
+    """Sharding key of an event: its device ID, or its event ID if it has none."""
+    return getattr(getattr(event, "data", None), "device_id", None) or event.event_id
+
+
+class KeyedWorkerPool:
+    """Runs a batch handler on a fixed set of workers, sharding events by key."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[BaseEvent]], Any],
+        workers: int = 4,
+        queue_size: int = 4,
+        key_func: Callable[[BaseEvent], str] = device_key,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.key_func = key_func
+
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Set[asyncio.Future] = set()
+        self._worker_events = [0] * self.workers
+        self.stats = {"batches": 0, "sub_batches": 0, "events": 0, "failed_sub_batches": 0, "failed_events": 0}
+
+    def start(self):
+        """Start the worker tasks."""
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+
+    def shard(self, key: str) -> int:
+        """Worker index of a key; stable across restarts and processes."""
+        return zlib.crc32(key.encode("utf-8")) % self.workers
+
+    async def submit(self, events: List[BaseEvent]) -> asyncio.Future:
+        """Queue a batch of events on the workers of their keys.
+
+        Waits while a target worker's queue is full.
+
+        Returns:
+            Future resolving to the ``(event, error)`` pairs of failed events
+            once every event of the batch has been handled
+        """
+        done = asyncio.get_running_loop().create_future()
+
+        shards: Dict[int, List[BaseEvent]] = {}
+        for event in events:
+            shards.setdefault(self.shard(self.key_func(event)), []).append(event)
+
+        self.stats["batches"] += 1
+        self.stats["events"] += len(events)
+        if not shards:
+            done.set_result([])
+            return done
+
+        self._pending.add(done)
+        done.add_done_callback(self._pending.discard)
+
+        tracker = {"remaining": len(shards), "failures": [], "future": done}
+        for index, shard_events in shards.items():
+            await self._queues[index].put((shard_events, tracker))
+            WORKER_QUEUE_DEPTH.labels(pool=self.name, worker=str(index)).set(self._queues[index].qsize())
+
+        return done
+
+    async def _worker(self, index: int):
+        """Process the sub-batches of one shard in order."""
+        queue = self._queues[index]
+        worker = str(index)
+
+        while True:
+            events, tracker = await queue.get()
+            WORKER_QUEUE_DEPTH.labels(pool=self.name, worker=worker).set(queue.qsize())
+
+            failures: List[Tuple[BaseEvent, Exception]] = []
+            try:
+                if asyncio.iscoroutinefunction(self.handler):
+                    failures = await self.handler(events) or []
+                else:
+                    failures = self.handler(events) or []
+                status = "handler_error" if failures else "success"
+
+            except Exception as e:
+                logger.error(
+                    "Keyed worker handler failed",
+                    pool=self.name,
+                    worker=index,
+                    batch_size=len(events),
+                    error=str(e),
+                )
+                failures = [(event, e) for event in events]
+                self.stats["failed_sub_batches"] += 1
+                status = "handler_error"
+
+            finally:
+                queue.task_done()
+
+            self.stats["sub_batches"] += 1
+            self.stats["failed_events"] += len(failures)
+            self._worker_events[index] += len(events)
+            WORKER_EVENTS.labels(pool=self.name, worker=worker, status=status).inc(len(events))
+
+            tracker["failures"].extend(failures)
+            tracker["remaining"] -= 1
+            if not tracker["remaining"] and not tracker["future"].done():
+                tracker["future"].set_result(tracker["failures"])
+
+    async def stop(self):
+        """Stop the workers; batches that did not finish are cancelled."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        for future in list(self._pending):
+            future.cancel()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker counts, queue depths and events processed per worker."""
+        return {
+            "workers": self.workers,
+            "queue_depths": [queue.qsize() for queue in self._queues],
+            "events_per_worker": list(self._worker_events),
+            "in_flight_batches": len(self._pending),
+            **self.stats,
+        }
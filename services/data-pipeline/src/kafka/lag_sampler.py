@@ -0,0 +1,195 @@
+"""
+Continuous consumer lag sampling and horizontal scaling signal.
+
+Every ``lag_sample_interval_seconds`` the sampler reads the committed offsets
+and high watermarks of every partition of each consumer group and records,
+through ``MetricsCollector``:
+
+- lag per partition
+- processing rate: committed offsets advanced per second across the group
+- incoming rate: high watermarks advanced per second
+- time to catch up: lag / (processing rate - incoming rate)
+
+The recommended number of pipeline instances is the rate needed to keep up
+with incoming messages and consume the current lag within
+``scaling_catch_up_target_seconds``, divided by the capacity of one
+instance. Capacity is the highest rate this instance committed its own
+partitions at within the capacity window; an instance that was never
+saturated underestimates it, so the recommendation errs on scaling out.
+Retry tier consumers are left out, as their lag is the intended delay.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import structlog
+
+from ..utils.config import KafkaConfig
+from ..utils.metrics import MetricsCollector
+from .consumer_manager import ConsumerManager
+
+logger = structlog.get_logger()
+
+# Weight of the latest sample in the smoothed rates
+RATE_SMOOTHING = 0.3
+CAPACITY_WINDOW_SECONDS = 3600
+
+
+class ConsumerLagSampler:
+    """Samples consumer group lag and throughput and derives a recommended worker count."""
+
+    def __init__(self, consumer_manager: ConsumerManager, metrics: MetricsCollector, kafka_config: KafkaConfig):
+        self.consumer_manager = consumer_manager
+        self.metrics = metrics
+        self.kafka_config = kafka_config
+        self.interval = kafka_config.lag_sample_interval_seconds
+
+        self._previous: Dict[str, Tuple[float, Dict[Tuple[str, int], Dict[str, Any]]]] = {}
+        self._rates: Dict[str, Dict[str, float]] = {}
+        self._own_rates: Dict[str, Deque[float]] = {}
+        self.samples: Dict[str, Dict[str, Any]] = {}
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background sampling task."""
+        self.task = asyncio.create_task(self._sample_loop())
+        logger.info("Consumer lag sampler started", interval_seconds=self.interval)
+
+    async def stop(self):
+        """Stop the background sampling task."""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def _sample_loop(self):
+        """Sample every consumer at a fixed interval."""
+        while True:
+            try:
+                await self.sample()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Consumer lag sampling failed", error=str(e))
+            await asyncio.sleep(self.interval)
+
+    async def sample(self):
+        """Take one lag sample of every consumer and update the metrics."""
+        loop = asyncio.get_running_loop()
+        for consumer_id in list(self.consumer_manager.consumers):
+            if consumer_id in self.consumer_manager.retry_delays:
+                continue
+
+            group_id = self.consumer_manager.group_ids.get(consumer_id, consumer_id)
+            try:
+                offsets = await loop.run_in_executor(None, self.consumer_manager.get_partition_offsets, consumer_id)
+            except Exception as e:
+                # The consumer may have been stopped while sampling
+                logger.warning("Failed to sample consumer lag", consumer_id=consumer_id, error=str(e))
+                continue
+
+            self.samples[consumer_id] = self._update(consumer_id, group_id, offsets, time.time())
+
+        for consumer_id in set(self.samples) - set(self.consumer_manager.consumers):
+            del self.samples[consumer_id]
+            self._previous.pop(consumer_id, None)
+            self._rates.pop(consumer_id, None)
+            self._own_rates.pop(consumer_id, None)
+
+    def _update(
+        self, consumer_id: str, group_id: str, offsets: Dict[Tuple[str, int], Dict[str, Any]], now: float
+    ) -> Dict[str, Any]:
+        """Derive rates, time to catch up and recommended workers from a new sample."""
+        for (topic, partition), partition_offsets in offsets.items():
+            self.metrics.record_consumer_lag(topic, partition, group_id, partition_offsets["lag"])
+
+        lag = sum(partition_offsets["lag"] for partition_offsets in offsets.values())
+        rates = self._rates.setdefault(consumer_id, {"processing": 0.0, "incoming": 0.0})
+        own_rates = self._own_rates.setdefault(
+            consumer_id, deque(maxlen=max(1, CAPACITY_WINDOW_SECONDS // max(1, self.interval)))
+        )
+
+        previous = self._previous.get(consumer_id)
+        self._previous[consumer_id] = (now, offsets)
+        if previous and now > previous[0]:
+            elapsed = now - previous[0]
+            processed = incoming = own_processed = 0
+            # Partitions that appeared since the last sample have no rate yet
+            for key, partition_offsets in offsets.items():
+                before = previous[1].get(key)
+                if before is None:
+                    continue
+                committed = max(0, partition_offsets["committed_offset"] - before["committed_offset"])
+                processed += committed
+                incoming += max(0, partition_offsets["high_water_mark"] - before["high_water_mark"])
+                if partition_offsets["assigned"]:
+                    own_processed += committed
+
+            first = not own_rates
+            for name, value in (("processing", processed / elapsed), ("incoming", incoming / elapsed)):
+                rates[name] = value if first else RATE_SMOOTHING * value + (1 - RATE_SMOOTHING) * rates[name]
+            own_rates.append(own_processed / elapsed)
+
+        net_rate = rates["processing"] - rates["incoming"]
+        if not lag:
+            catch_up_seconds = 0.0
+        elif net_rate > 0:
+            catch_up_seconds = lag / net_rate
+        else:
+            catch_up_seconds = math.inf
+
+        max_partitions = max(
+            (sum(1 for key in offsets if key[0] == topic) for topic in {key[0] for key in offsets}),
+            default=1,
+        )
+        capacity = max(own_rates, default=0.0)
+        required_rate = rates["incoming"] + lag / self.kafka_config.scaling_catch_up_target_seconds
+        max_workers = self.kafka_config.scaling_max_workers or max_partitions
+        if capacity > 0:
+            recommended = math.ceil(required_rate / capacity)
+        else:
+            # Nothing processed yet, so capacity is unknown
+            recommended = self.kafka_config.scaling_min_workers
+        recommended = max(self.kafka_config.scaling_min_workers, min(max_workers, recommended))
+
+        self.metrics.record_consumer_throughput(group_id, rates["processing"], rates["incoming"], catch_up_seconds)
+        self.metrics.record_recommended_workers(group_id, recommended)
+
+        return {
+            "consumer_group": group_id,
+            "sampled_at": now,
+            "lag": lag,
+            "partitions": {
+                f"{topic}_{partition}": {
+                    "lag": partition_offsets["lag"],
+                    "committed_offset": partition_offsets["committed_offset"],
+                    "high_water_mark": partition_offsets["high_water_mark"],
+                    "assigned": partition_offsets["assigned"],
+                }
+                for (topic, partition), partition_offsets in offsets.items()
+            },
+            "processing_rate": round(rates["processing"], 3),
+            "incoming_rate": round(rates["incoming"], 3),
+            "catch_up_seconds": None if math.isinf(catch_up_seconds) else round(catch_up_seconds, 1),
+            "instance_capacity": round(capacity, 3),
+            "recommended_workers": recommended,
+        }
+
+    def get_recommendation(self) -> Dict[str, Any]:
+        """Recommended worker count: the most any consumer group needs, as every instance runs all consumers."""
+        recommended = max(
+            (sample["recommended_workers"] for sample in self.samples.values()),
+            default=self.kafka_config.scaling_min_workers,
+        )
+        return {
+            "recommended_workers": recommended,
+            "catch_up_target_seconds": self.kafka_config.scaling_catch_up_target_seconds,
+            "sample_interval_seconds": self.interval,
+            "consumers": self.samples,
+        }
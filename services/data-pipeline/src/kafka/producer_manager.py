@@ -5,7 +5,8 @@ Kafka producer manager for sending events to topics.
 import asyncio
 import json
 import time
-from typing import Any, Dict, List, Optional, Union
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import structlog
 from confluent_kafka import Producer
@@ -13,6 +14,7 @@ from confluent_kafka.admin import AdminClient, NewTopic
 from prometheus_client import Counter, Gauge, Histogram
 
 from ..schemas.events import BaseEvent, serialize_event
+from ..schemas.wire_format import encode_event
 from ..utils.config import KafkaConfig
 
 logger = structlog.get_logger()
@@ -21,13 +23,87 @@ logger = structlog.get_logger()
 MESSAGES_SENT = Counter("kafka_messages_sent_total", "Total messages sent to Kafka", ["topic", "status"])
 SEND_DURATION = Histogram("kafka_send_duration_seconds", "Time spent sending messages to Kafka", ["topic"])
 PRODUCER_QUEUE_SIZE = Gauge("kafka_producer_queue_size", "Current producer queue size")
+PRODUCE_BATCH_SIZE = Histogram(
+    "kafka_produce_batch_size",
+    "Messages handed to librdkafka per produce call group",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+
+# librdkafka batching profiles; "default" uses the linger/batch/compression settings from KafkaConfig
+PRODUCER_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "throughput": {"linger.ms": 50, "batch.size": 1048576, "compression.type": "zstd"},
+    "low_latency": {"linger.ms": 0, "batch.size": 16384, "compression.type": "lz4"},
+}
+
+
+class DeliveryReport:
+    """Aggregated delivery results for a group of produced messages.
+
+    Used as the delivery callback of every message in the group, so results
+    are counted in place and metrics are updated once when the group is done
+    instead of once per message.
+    """
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.delivered = 0
+        self.failed = 0
+        self.counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.time()
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+        if not expected:
+            self._finish()
+
+    def __call__(self, err, msg):
+        if err:
+            self.failed += 1
+            self.counts[(msg.topic(), "error")] += 1
+            self.errors[str(err)] += 1
+        else:
+            self.delivered += 1
+            self.counts[(msg.topic(), "success")] += 1
+
+        if self.delivered + self.failed >= self.expected:
+            self._finish()
+
+    def not_queued(self, topic: str, error: str, count: int = 1):
+        """Count messages that never reached the producer queue as failed."""
+        self.failed += count
+        self.counts[(topic, "error")] += count
+        self.errors[error] += count
+        if self.delivered + self.failed >= self.expected:
+            self._finish()
+
+    def _finish(self):
+        if self.done.done():
+            return
+
+        for (topic, status), count in self.counts.items():
+            MESSAGES_SENT.labels(topic=topic, status=status).inc(count)
+        if self.failed:
+            logger.error("Message delivery failed", failed=self.failed, expected=self.expected, errors=dict(self.errors))
+
+        self.done.set_result(self.summary())
+
+    def summary(self) -> Dict[str, Any]:
+        """Delivered and failed counts and the time since the group was produced."""
+        return {
+            "messages": self.expected,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "errors": dict(self.errors),
+            "duration_seconds": round(time.time() - self.started, 6),
+        }
 
 
 class ProducerManager:
     """Manages Kafka producers and message sending."""
 
-    def __init__(self, kafka_config: KafkaConfig):
+    def __init__(self, kafka_config: KafkaConfig, extra_config: Optional[Dict[str, Any]] = None):
         self.kafka_config = kafka_config
+        self.extra_config = extra_config or {}
         self.producer: Optional[Producer] = None
         self.admin_client: Optional[AdminClient] = None
         self.topics_created: set = set()
@@ -45,19 +121,25 @@ class ProducerManager:
     def _initialize_producer(self):
         """Initialize Kafka producer."""
         try:
+            profile = self.kafka_config.producer_profile
+            if profile not in PRODUCER_PROFILES:
+                raise ValueError(f"Unknown producer profile: {profile}")
+
             producer_config = {
                 "bootstrap.servers": self.kafka_config.bootstrap_servers,
                 "security.protocol": self.kafka_config.security_protocol,
                 "compression.type": self.kafka_config.compression_type,
                 "batch.size": self.kafka_config.batch_size,
                 "linger.ms": self.kafka_config.linger_ms,
-                "buffer.memory": self.kafka_config.buffer_memory,
+                "queue.buffering.max.kbytes": self.kafka_config.buffer_memory // 1024,
                 "retries": self.kafka_config.retries,
                 "retry.backoff.ms": self.kafka_config.retry_backoff_ms,
                 "enable.idempotence": True,
                 "acks": "all",
                 "request.timeout.ms": 30000,
                 "delivery.timeout.ms": 120000,
+                **PRODUCER_PROFILES[profile],
+                **self.extra_config,
             }
 
             if self.kafka_config.sasl_mechanism:
@@ -71,7 +153,13 @@ class ProducerManager:
 
             self.producer = Producer(producer_config)
             self.is_running = True
-            logger.info("Kafka producer initialized successfully")
+            logger.info(
+                "Kafka producer initialized successfully",
+                profile=profile,
+                linger_ms=producer_config["linger.ms"],
+                batch_size=producer_config["batch.size"],
+                compression=producer_config["compression.type"],
+            )
 
         except Exception as e:
             logger.error("Failed to initialize Kafka producer", error=str(e))
@@ -102,85 +190,97 @@ class ProducerManager:
             raise
 
     async def _send_loop(self):
-        """Background task for sending messages."""
+        """Background task for sending queued messages.
+
+        Drains up to ``producer_send_batch_size`` queued messages at a time and
+        hands them to librdkafka together; also serves delivery reports.
+        """
+        max_messages = self.kafka_config.producer_send_batch_size
+
         while self.is_running:
             try:
-                # Get message from queue with timeout
+                # Get messages from queue with timeout
                 try:
-                    message = await asyncio.wait_for(self.send_queue.get(), timeout=1.0)
+                    message = await asyncio.wait_for(self.send_queue.get(), timeout=0.1)
                 except asyncio.TimeoutError:
+                    self.producer.poll(0)
                     continue
 
-                topic, key, value, headers = message
-
-                # Send message to Kafka
-                await self._send_message_sync(topic, key, value, headers)
+                messages = [message]
+                while len(messages) < max_messages and not self.send_queue.empty():
+                    messages.append(self.send_queue.get_nowait())
 
-                # Mark task as done
-                self.send_queue.task_done()
+                # Send messages to Kafka
+                try:
+                    await self._produce_messages(messages)
+                finally:
+                    # Mark tasks as done
+                    for _ in messages:
+                        self.send_queue.task_done()
 
             except Exception as e:
                 logger.error("Error in send loop", error=str(e))
                 await asyncio.sleep(1)
 
-    async def _send_message_sync(
-        self,
-        topic: str,
-        key: Optional[str],
-        value: str,
-        headers: Optional[Dict[str, str]],
-    ):
-        """Send message to Kafka synchronously."""
-        try:
-            start_time = time.time()
-
-            # Prepare headers
-            kafka_headers = None
-            if headers:
-                kafka_headers = [(k, v.encode("utf-8")) for k, v in headers.items()]
+    def _encode_headers(self, headers: Optional[Dict[str, Union[str, bytes]]]) -> Optional[List[Tuple[str, bytes]]]:
+        """Encode message headers for librdkafka; bytes values are passed through."""
+        if not headers:
+            return None
+        return [(k, v if isinstance(v, bytes) else v.encode("utf-8")) for k, v in headers.items()]
 
-            # Send message
-            future = self.producer.produce(
-                topic=topic,
-                key=key.encode("utf-8") if key else None,
-                value=value.encode("utf-8"),
-                headers=kafka_headers,
-                callback=self._delivery_callback,
-            )
+    async def _produce_messages(
+        self,
+        messages: List[Tuple[str, Optional[Union[str, bytes]], Union[str, bytes], Optional[Dict[str, Union[str, bytes]]]]],
+    ) -> DeliveryReport:
+        """Hand a group of messages to librdkafka in one pass.
+
+        All messages share one aggregated delivery report. When the local
+        producer queue is full, delivery reports are served until there is room.
+        """
+        start_time = time.time()
+        report = DeliveryReport(len(messages))
+
+        for topic, key, value, headers in messages:
+            kafka_key = key.encode("utf-8") if isinstance(key, str) else key
+            kafka_value = value.encode("utf-8") if isinstance(value, str) else value
+            kafka_headers = self._encode_headers(headers)
+
+            while True:
+                try:
+                    self.producer.produce(
+                        topic=topic,
+                        key=kafka_key,
+                        value=kafka_value,
+                        headers=kafka_headers,
+                        callback=report,
+                    )
+                    break
+                except BufferError:
+                    # Local queue is full; wait for deliveries without blocking the event loop
+                    self.producer.poll(0)
+                    await asyncio.sleep(0.01)
+                except Exception as e:
+                    logger.error("Failed to send message to Kafka", topic=topic, error=str(e))
+                    report.not_queued(topic, str(e))
+                    break
 
-            # Poll for delivery
-            self.producer.poll(0)
+        # Serve delivery reports for earlier messages
+        self.producer.poll(0)
 
-            # Update metrics
-            duration = time.time() - start_time
+        # Update metrics
+        duration = time.time() - start_time
+        PRODUCE_BATCH_SIZE.observe(len(messages))
+        for topic in {message[0] for message in messages}:
             SEND_DURATION.labels(topic=topic).observe(duration)
-            PRODUCER_QUEUE_SIZE.set(len(self.producer))
+        PRODUCER_QUEUE_SIZE.set(len(self.producer))
 
-            logger.debug("Message sent to Kafka", topic=topic, key=key, duration=duration)
-
-        except Exception as e:
-            logger.error("Failed to send message to Kafka", topic=topic, error=str(e))
-            MESSAGES_SENT.labels(topic=topic, status="error").inc()
-            raise
-
-    def _delivery_callback(self, err, msg):
-        """Callback for message delivery."""
-        if err:
-            logger.error("Message delivery failed", error=str(err), topic=msg.topic())
-            MESSAGES_SENT.labels(topic=msg.topic(), status="error").inc()
-        else:
-            logger.debug(
-                "Message delivered",
-                topic=msg.topic(),
-                partition=msg.partition(),
-                offset=msg.offset(),
-            )
-            MESSAGES_SENT.labels(topic=msg.topic(), status="success").inc()
+        logger.debug("Messages sent to Kafka", count=len(messages), duration=duration)
+        return report
 
     async def create_topics(self, topics: List[str], num_partitions: int = 3, replication_factor: int = 1):
         """Create Kafka topics if they don't exist."""
         try:
-            if not self.admin_client:
+            if self.admin_client is None:
                 raise Exception("Admin client not initialized")
 
             # Check which topics already exist
@@ -222,6 +322,36 @@ class ProducerManager:
             logger.error("Failed to create topics", error=str(e))
             raise
 
+    def _prepare_event(
+        self,
+        event: BaseEvent,
+        key: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Optional[str], Union[str, bytes], Dict[str, str]]:
+        """Serialize an event and build its key and headers."""
+        # Serialize event
+        if self.kafka_config.wire_format == "binary":
+            value = encode_event(event)
+        else:
+            value = json.dumps(serialize_event(event), default=str)
+
+        # Use event ID as key if no key provided
+        if key is None:
+            key = event.event_id
+
+        # Add default headers
+        headers = dict(headers) if headers else {}
+        headers.update(
+            {
+                "event_type": event.event_type,
+                "event_id": event.event_id,
+                "timestamp": event.timestamp.isoformat(),
+                "source": event.source,
+                "version": event.version,
+            }
+        )
+        return key, value, headers
+
     async def send_event(
         self,
         topic: str,
@@ -231,27 +361,7 @@ class ProducerManager:
     ):
         """Send an event to a Kafka topic."""
         try:
-            # Serialize event
-            event_data = serialize_event(event)
-            value = json.dumps(event_data, default=str)
-
-            # Use event ID as key if no key provided
-            if key is None:
-                key = event.event_id
-
-            # Add default headers
-            if headers is None:
-                headers = {}
-
-            headers.update(
-                {
-                    "event_type": event.event_type,
-                    "event_id": event.event_id,
-                    "timestamp": event.timestamp.isoformat(),
-                    "source": event.source,
-                    "version": event.version,
-                }
-            )
+            key, value, headers = self._prepare_event(event, key, headers)
 
             # Add to send queue
             await self.send_queue.put((topic, key, value, headers))
@@ -289,28 +399,68 @@ class ProducerManager:
             logger.error("Failed to queue raw message", topic=topic, key=key, error=str(e))
             raise
 
+    async def send_raw_messages(
+        self,
+        messages: List[Tuple[str, Optional[Union[str, bytes]], Union[str, bytes], Optional[Dict[str, Union[str, bytes]]]]],
+        wait: bool = False,
+    ) -> Dict[str, Any]:
+        """Send already encoded (topic, key, value, headers) messages to Kafka together.
+
+        Returns:
+            Delivery summary (delivered and failed counts) if ``wait`` is set,
+            otherwise the number of messages queued
+        """
+        report = await self._produce_messages(messages)
+        if not wait:
+            return {"messages": len(messages)}
+
+        while not report.done.done():
+            self.producer.poll(0)
+            await asyncio.sleep(0.005)
+        return report.done.result()
+
     async def send_batch(
         self,
         topic: str,
         events: List[BaseEvent],
         key_field: Optional[str] = None,
         headers: Optional[Dict[str, str]] = None,
-    ):
-        """Send multiple events to a Kafka topic in batch."""
+        wait: bool = False,
+    ) -> Dict[str, Any]:
+        """Send multiple events to a Kafka topic in batch.
+
+        The events are handed to librdkafka together, bypassing the send queue,
+        and share one aggregated delivery report.
+
+        Args:
+            topic: Topic to send to
+            events: Events to send
+            key_field: Event attribute used as the message key; defaults to the event ID
+            headers: Extra headers added to every message
+            wait: Wait for the delivery reports of the whole batch
+
+        Returns:
+            Delivery summary (delivered and failed counts) if ``wait`` is set,
+            otherwise the number of messages queued
+        """
         try:
+            messages = []
             for event in events:
                 # Determine key
                 key = None
                 if key_field and hasattr(event, key_field):
                     key = getattr(event, key_field)
 
-                await self.send_event(topic, event, key, headers)
+                key, value, event_headers = self._prepare_event(event, key, headers)
+                messages.append((topic, key, value, event_headers))
 
-            logger.info("Batch events queued for sending", topic=topic, count=len(events))
+            result = await self.send_raw_messages(messages, wait=wait)
+            logger.info("Batch events sent", topic=topic, count=len(events))
+            return result
 
         except Exception as e:
             logger.error(
-                "Failed to queue batch events",
+                "Failed to send batch events",
                 topic=topic,
                 count=len(events),
                 error=str(e),
@@ -338,6 +488,8 @@ class ProducerManager:
     async def close(self):
         """Close the producer and cleanup resources."""
         try:
+            # Flush queued messages while the send loop is still running
+            await self.flush()
             self.is_running = False
 
             # Cancel send task
@@ -348,13 +500,8 @@ class ProducerManager:
                 except asyncio.CancelledError:
                     pass
 
-            # Flush remaining messages
-            await self.flush()
-
-            # Close producer
-            if self.producer:
-                self.producer.close()
-                self.producer = None
+            # Release producer; confluent-kafka producers have no close() and are freed once flushed
+            self.producer = None
 
             logger.info("Producer manager closed successfully")
 
@@ -366,6 +513,7 @@ class ProducerManager:
         """Get producer status."""
         return {
             "is_running": self.is_running,
+            "profile": self.kafka_config.producer_profile,
             "queue_size": self.send_queue.qsize(),
             "topics_created": list(self.topics_created),
             "producer_queue_size": len(self.producer) if self.producer else 0,
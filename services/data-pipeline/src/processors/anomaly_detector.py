@@ -4,18 +4,18 @@ Anomaly detection service with machine learning capabilities.
 
 import asyncio
 import json
-import pickle
+import multiprocessing
 import time
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 import joblib
 import numpy as np
 import pandas as pd
 import redis.asyncio as redis
 import structlog
-from joblib import dump, load
 from prometheus_client import Counter, Gauge, Histogram
 from pyod.models.auto_encoder import AutoEncoder
 from pyod.models.knn import KNN
@@ -35,7 +35,16 @@ from ..schemas.events import (
     SeverityLevel,
     TemperatureValidatedEvent,
 )
-from ..utils.config import RedisConfig
+from ..utils.config import ProcessingConfig, RedisConfig
+from .feature_window import (
+    BATTERY_LEVEL,
+    FEATURE_NAMES,
+    SIGNAL_STRENGTH,
+    TEMP_DERIVATIVE,
+    TEMPERATURE,
+    DeviceFeatureBuffer,
+)
+from .model_store import ModelStore
 
 logger = structlog.get_logger()
 
@@ -48,24 +57,107 @@ ANOMALIES_DETECTED = Counter(
 DETECTION_DURATION = Histogram("anomaly_detection_duration_seconds", "Time spent on anomaly detection")
 MODEL_ACCURACY = Gauge("anomaly_model_accuracy", "Anomaly detection model accuracy")
 TRAINING_DURATION = Histogram("anomaly_model_training_duration_seconds", "Time spent training anomaly models")
+TRAINING_JOBS = Counter("anomaly_training_jobs_total", "Per-device model training jobs", ["status"])
 ACTIVE_MODELS = Gauge("anomaly_active_models", "Number of active anomaly detection models")
+RESIDENT_MODELS = Gauge("anomaly_resident_models", "Number of device models held in memory")
+MODEL_CACHE_HITS = Counter("anomaly_model_cache_hits_total", "Model lookups served from memory")
+MODEL_CACHE_LOADS = Counter("anomaly_model_cache_loads_total", "Device models loaded from the model store", ["status"])
+MODEL_CACHE_EVICTIONS = Counter("anomaly_model_cache_evictions_total", "Device models evicted from memory")
+SCORING_BATCH_SIZE = Histogram(
+    "anomaly_scoring_batch_size",
+    "Number of readings scored per device model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+SCORING_LATENCY = Histogram(
+    "anomaly_scoring_latency_seconds",
+    "Time from queueing a reading for scoring until its result is available",
+)
+
+
+def _fit_device_models(X: np.ndarray) -> Tuple[StandardScaler, Dict[str, Any], Dict[str, str]]:
+    """Fit the scaler and anomaly models for one device's feature matrix.
+
+    Runs in a worker process, so it must stay a picklable module-level function.
+
+    Returns:
+        Tuple of (scaler, models by type, training errors by model type)
+    """
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    models = {}
+    errors = {}
+
+    # Isolation Forest; single-threaded, as the pool already runs one fit per worker
+    try:
+        iso_forest = IsolationForest(contamination=0.1, random_state=42, n_jobs=1)
+        iso_forest.fit(X_scaled)
+        models["isolation_forest"] = iso_forest
+    except Exception as e:
+        errors["isolation_forest"] = str(e)
+
+    # Local Outlier Factor
+    try:
+        lof = LOF(contamination=0.1)
+        lof.fit(X_scaled)
+        models["lof"] = lof
+    except Exception as e:
+        errors["lof"] = str(e)
+
+    # K-Nearest Neighbors
+    try:
+        knn = KNN(contamination=0.1)
+        knn.fit(X_scaled)
+        models["knn"] = knn
+    except Exception as e:
+        errors["knn"] = str(e)
+
+    # AutoEncoder (if enough data)
+    if len(X_scaled) >= 500:
+        try:
+            autoencoder = AutoEncoder(contamination=0.1, epochs=50, verbose=0)
+            autoencoder.fit(X_scaled)
+            models["autoencoder"] = autoencoder
+        except Exception as e:
+            errors["autoencoder"] = str(e)
+
+    return scaler, models, errors
 
 
 class AnomalyDetector:
     """Machine learning-based anomaly detector for temperature readings."""
 
-    def __init__(self, producer_manager: ProducerManager, redis_config: RedisConfig):
+    def __init__(
+        self,
+        producer_manager: ProducerManager,
+        redis_config: RedisConfig,
+        processing_config: Optional[ProcessingConfig] = None,
+    ):
         self.producer_manager = producer_manager
         self.redis_config = redis_config
         self.redis_client: Optional[redis.Redis] = None
+        processing_config = processing_config or ProcessingConfig()
 
-        # ML Models
-        self.models: Dict[str, Dict[str, Any]] = {}
+        # ML Models, resident in least-recently-used order
+        self.models: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.scalers: Dict[str, StandardScaler] = {}
         self.model_types = ["isolation_forest", "autoencoder", "lof", "knn"]
 
+        # Model store with lazy per-device loading
+        self.model_store = ModelStore(processing_config.model_store_path)
+        self.max_resident_models = max(1, processing_config.max_resident_models)
+        self._stored_devices: Set[str] = set()
+        self._model_loads: Dict[str, asyncio.Task] = {}
+        self._model_cache_stats = {"hits": 0, "loads": 0, "load_failures": 0, "evictions": 0}
+
+        # Configuration
+        self.feature_history_size = 10000
+        self.feature_window_size = 20
+
         # Data storage
-        self.device_features: Dict[str, deque] = defaultdict(lambda: deque(maxlen=10000))
+        self.device_features: Dict[str, DeviceFeatureBuffer] = defaultdict(
+            lambda: DeviceFeatureBuffer(self.feature_history_size, self.feature_window_size)
+        )
         self.anomaly_history: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
         self.model_performance: Dict[str, Dict[str, float]] = defaultdict(dict)
 
@@ -73,7 +165,7 @@ class AnomalyDetector:
         self.min_training_samples = 100
         self.anomaly_threshold = 0.85
         self.retrain_interval_hours = 24
-        self.feature_window_size = 20
+        self.max_concurrent_trainings = 2
         self.severity_thresholds = {
             SeverityLevel.LOW: 0.7,
             SeverityLevel.MEDIUM: 0.8,
@@ -81,6 +173,24 @@ class AnomalyDetector:
             SeverityLevel.CRITICAL: 0.95,
         }
 
+        # Micro-batched scoring
+        self.scoring_batch_window_ms = 5.0
+        self.scoring_max_batch_size = 256
+        self._pending_scores: Dict[str, List[Tuple[np.ndarray, asyncio.Future, float]]] = defaultdict(list)
+        self._pending_models: Dict[str, Tuple[StandardScaler, Dict[str, Any]]] = {}
+        self._pending_score_count = 0
+        self._scoring_wakeup = asyncio.Event()
+        self._scoring_task: Optional[asyncio.Task] = None
+        self._scoring_latencies: Deque[float] = deque(maxlen=10000)
+        self._scoring_batches: Deque[Tuple[float, int]] = deque(maxlen=10000)
+        self._scoring_stats = {"events_scored": 0, "batches": 0, "model_calls": 0}
+
+        # Off-loop model training
+        self._training_executor: Optional[ProcessPoolExecutor] = None
+        self._training_semaphore = asyncio.Semaphore(self.max_concurrent_trainings)
+        self._training_jobs: Dict[str, asyncio.Task] = {}
+        self.training_status: Dict[str, Dict[str, Any]] = {}
+
         # Background tasks
         self.training_task: Optional[asyncio.Task] = None
         self.maintenance_task: Optional[asyncio.Task] = None
@@ -135,12 +245,9 @@ class AnomalyDetector:
                 logger.debug("Skipping invalid reading", device_id=device_id)
                 return
 
-            # Extract features
+            # Extract and store features
             features = self._extract_features(event)
 
-            # Store features
-            self.device_features[device_id].append(features)
-
             # Check for anomalies
             anomaly_result = await self._detect_anomalies(device_id, features)
 
@@ -186,172 +293,238 @@ class AnomalyDetector:
             logger.error("Failed to process validated reading", device_id=device_id, error=str(e))
             raise
 
-    def _extract_features(self, event: TemperatureValidatedEvent) -> Dict[str, float]:
-        """Extract features from temperature reading."""
-        features = {
-            "temperature": event.data.temperature,
-            "battery_level": event.data.battery_level or 0.0,
-            "signal_strength": event.data.signal_strength or 0.0,
-            "hour_of_day": event.timestamp.hour,
-            "day_of_week": event.timestamp.weekday(),
-            "minute_of_hour": event.timestamp.minute,
-            "processing_time": event.processing_time_ms,
-        }
+    async def process_validated_readings(self, events: List[BaseEvent]) -> List[Tuple[BaseEvent, Exception]]:
+        """Process a batch of validated readings, such as one consumed Kafka batch.
 
-        # Add derived features
-        device_id = event.data.device_id
-        if device_id in self.device_features and self.device_features[device_id]:
-            recent_features = list(self.device_features[device_id])[-self.feature_window_size :]
-
-            if len(recent_features) > 1:
-                # Temperature statistics
-                recent_temps = [f["temperature"] for f in recent_features]
-                features["temp_mean"] = np.mean(recent_temps)
-                features["temp_std"] = np.std(recent_temps)
-                features["temp_min"] = np.min(recent_temps)
-                features["temp_max"] = np.max(recent_temps)
-                features["temp_range"] = features["temp_max"] - features["temp_min"]
-
-                # Temperature derivatives
-                if len(recent_temps) >= 2:
-                    features["temp_derivative"] = recent_temps[-1] - recent_temps[-2]
-                    if len(recent_temps) >= 3:
-                        features["temp_second_derivative"] = (recent_temps[-1] - recent_temps[-2]) - (
-                            recent_temps[-2] - recent_temps[-3]
-                        )
-
-                # Battery trend
-                recent_battery = [f["battery_level"] for f in recent_features if f["battery_level"] > 0]
-                if len(recent_battery) >= 2:
-                    features["battery_trend"] = recent_battery[-1] - recent_battery[0]
-
-                # Signal strength statistics
-                recent_signal = [f["signal_strength"] for f in recent_features if f["signal_strength"] != 0]
-                if len(recent_signal) >= 2:
-                    features["signal_mean"] = np.mean(recent_signal)
-                    features["signal_std"] = np.std(recent_signal)
-
-        return features
-
-    async def _detect_anomalies(self, device_id: str, features: Dict[str, float]) -> Dict[str, Any]:
-        """Detect anomalies using trained models."""
-        try:
-            if device_id not in self.models:
-                return {
-                    "is_anomaly": False,
-                    "confidence": 0.0,
-                    "anomaly_type": "none",
-                    "severity": SeverityLevel.LOW,
-                    "model_scores": {},
-                }
+        Readings are processed concurrently so they are scored together by the
+        micro-batched scoring loop. Features are extracted before each
+        reading's first await, so per-device feature order follows the batch.
 
-            device_models = self.models[device_id]
-            scaler = self.scalers.get(device_id)
-
-            if not scaler:
-                return {
-                    "is_anomaly": False,
-                    "confidence": 0.0,
-                    "anomaly_type": "none",
-                    "severity": SeverityLevel.LOW,
-                    "model_scores": {},
-                }
-
-            # Prepare features
-            feature_vector = np.array(
-                [
-                    [
-                        features.get("temperature", 0),
-                        features.get("battery_level", 0),
-                        features.get("signal_strength", 0),
-                        features.get("hour_of_day", 0),
-                        features.get("day_of_week", 0),
-                        features.get("minute_of_hour", 0),
-                        features.get("processing_time", 0),
-                        features.get("temp_mean", features.get("temperature", 0)),
-                        features.get("temp_std", 0),
-                        features.get("temp_min", features.get("temperature", 0)),
-                        features.get("temp_max", features.get("temperature", 0)),
-                        features.get("temp_range", 0),
-                        features.get("temp_derivative", 0),
-                        features.get("temp_second_derivative", 0),
-                        features.get("battery_trend", 0),
-                        features.get("signal_mean", features.get("signal_strength", 0)),
-                        features.get("signal_std", 0),
-                    ]
-                ]
-            )
+        Returns:
+            The readings that failed with their errors
+        """
+        results = await asyncio.gather(
+            *(self.process_validated_reading(event) for event in events),
+            return_exceptions=True,
+        )
+        failures = [(event, result) for event, result in zip(events, results) if isinstance(result, Exception)]
+        if failures:
+            logger.warning("Failed to process some validated readings", failed=len(failures), batch_size=len(events))
+        return failures
+
+    def _extract_features(self, event: TemperatureValidatedEvent) -> np.ndarray:
+        """Extract features from a temperature reading and append them to the device buffer.
+
+        Rolling window features are maintained incrementally by the device's
+        ring buffer, so this is constant-time per reading.
+        """
+        return self.device_features[event.data.device_id].append_reading(
+            event.data.temperature,
+            event.data.battery_level or 0.0,
+            event.data.signal_strength or 0.0,
+            event.timestamp.hour,
+            event.timestamp.weekday(),
+            event.timestamp.minute,
+            event.processing_time_ms,
+        )
 
-            # Scale features
-            feature_vector_scaled = scaler.transform(feature_vector)
-
-            # Get predictions from all models
-            model_scores = {}
-            for model_type, model in device_models.items():
-                try:
-                    if model_type == "isolation_forest":
-                        score = model.decision_function(feature_vector_scaled)[0]
-                        anomaly_score = 1 - ((score + 1) / 2)  # Convert to 0-1 scale
-                    elif model_type == "autoencoder":
-                        anomaly_score = model.decision_function(feature_vector_scaled)[0]
-                    elif model_type in ["lof", "knn"]:
-                        anomaly_score = model.decision_function(feature_vector_scaled)[0]
-                    else:
-                        continue
-
-                    model_scores[model_type] = anomaly_score
-
-                except Exception as e:
-                    logger.warning(
-                        f"Model {model_type} prediction failed",
-                        device_id=device_id,
-                        error=str(e),
-                    )
+    @staticmethod
+    def _no_anomaly_result(anomaly_type: str = "none") -> Dict[str, Any]:
+        """Result used when a reading cannot be scored."""
+        return {
+            "is_anomaly": False,
+            "confidence": 0.0,
+            "anomaly_type": anomaly_type,
+            "severity": SeverityLevel.LOW,
+            "model_scores": {},
+        }
 
-            if not model_scores:
-                return {
-                    "is_anomaly": False,
-                    "confidence": 0.0,
-                    "anomaly_type": "none",
-                    "severity": SeverityLevel.LOW,
-                    "model_scores": {},
-                }
+    async def _detect_anomalies(self, device_id: str, features: np.ndarray) -> Dict[str, Any]:
+        """Detect anomalies using trained models.
+
+        Readings are queued for the scoring loop, which scores every queued
+        reading of a device with one call per model, and the result is
+        returned once its batch has been scored.
+        """
+        resident = await self._ensure_models_resident(device_id)
+        if resident is None:
+            return self._no_anomaly_result()
+
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        # Copy the row: the ring buffer slot may be reused before the batch is scored.
+        # Keep the models with the batch so an eviction before scoring does not drop them.
+        self._pending_scores[device_id].append((features.copy(), future, time.perf_counter()))
+        self._pending_models[device_id] = resident
+        self._pending_score_count += 1
+        self._scoring_wakeup.set()
+
+        if self._scoring_task is None or self._scoring_task.done():
+            self._scoring_task = asyncio.create_task(self._scoring_loop())
+
+        return await future
+
+    async def _scoring_loop(self):
+        """Background task that scores queued readings in micro-batches."""
+        loop = asyncio.get_event_loop()
+        try:
+            while True:
+                await self._scoring_wakeup.wait()
+                self._scoring_wakeup.clear()
+                if not self._pending_score_count:
+                    continue
+
+                # Give concurrently dispatched readings a chance to join the batch.
+                # If nothing else arrives, score right away so sequential callers
+                # are not delayed by the batch window.
+                deadline = loop.time() + self.scoring_batch_window_ms / 1000
+                queued = self._pending_score_count
+                await asyncio.sleep(0)
+                while queued < self._pending_score_count < self.scoring_max_batch_size and loop.time() < deadline:
+                    queued = self._pending_score_count
+                    await asyncio.sleep(min(0.001, max(0.0, deadline - loop.time())))
+
+                pending, pending_models = self._pending_scores, self._pending_models
+                self._pending_scores = defaultdict(list)
+                self._pending_models = {}
+                self._pending_score_count = 0
+                self._score_pending(pending, pending_models)
+
+        except asyncio.CancelledError:
+            self._fail_pending_scores()
+
+    def _score_pending(
+        self,
+        pending: Dict[str, List[Tuple[np.ndarray, asyncio.Future, float]]],
+        pending_models: Dict[str, Tuple[StandardScaler, Dict[str, Any]]],
+    ):
+        """Score queued readings grouped by device and resolve their futures."""
+        for device_id, entries in pending.items():
+            try:
+                scaler, device_models = pending_models[device_id]
+                results = self._score_device_batch(
+                    device_id, np.vstack([entry[0] for entry in entries]), scaler, device_models
+                )
+            except Exception as e:
+                logger.error("Failed to detect anomalies", device_id=device_id, error=str(e))
+                results = [self._no_anomaly_result("error")] * len(entries)
+
+            finished = time.perf_counter()
+            for (_, future, queued_at), result in zip(entries, results):
+                if not future.done():
+                    future.set_result(result)
+                latency = finished - queued_at
+                self._scoring_latencies.append(latency)
+                SCORING_LATENCY.observe(latency)
+
+            SCORING_BATCH_SIZE.observe(len(entries))
+            self._scoring_batches.append((finished, len(entries)))
+            self._scoring_stats["events_scored"] += len(entries)
+            self._scoring_stats["batches"] += 1
+
+    def _fail_pending_scores(self):
+        """Resolve every queued reading as not anomalous (used on shutdown)."""
+        for entries in self._pending_scores.values():
+            for _, future, _ in entries:
+                if not future.done():
+                    future.set_result(self._no_anomaly_result())
+        self._pending_scores = defaultdict(list)
+        self._pending_models = {}
+        self._pending_score_count = 0
+
+    def _score_device_batch(
+        self,
+        device_id: str,
+        feature_matrix: np.ndarray,
+        scaler: StandardScaler,
+        device_models: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Score a matrix of feature rows (FEATURE_NAMES order) for one device."""
+        if not device_models:
+            return [self._no_anomaly_result()] * len(feature_matrix)
+
+        # Scale features
+        feature_matrix_scaled = scaler.transform(feature_matrix)
+
+        # Get predictions from all models, one call per model for the whole batch
+        model_score_columns = {}
+        for model_type, model in device_models.items():
+            try:
+                if model_type == "isolation_forest":
+                    scores = model.decision_function(feature_matrix_scaled)
+                    anomaly_scores = 1 - ((scores + 1) / 2)  # Convert to 0-1 scale
+                elif model_type in ["autoencoder", "lof", "knn"]:
+                    anomaly_scores = model.decision_function(feature_matrix_scaled)
+                else:
+                    continue
 
-            # Ensemble prediction
-            ensemble_score = np.mean(list(model_scores.values()))
-            is_anomaly = ensemble_score > self.anomaly_threshold
+                model_score_columns[model_type] = np.asarray(anomaly_scores, dtype=np.float64)
+                self._scoring_stats["model_calls"] += 1
 
-            # Determine anomaly type
-            anomaly_type = self._determine_anomaly_type(features, model_scores)
+            except Exception as e:
+                logger.warning(
+                    f"Model {model_type} prediction failed",
+                    device_id=device_id,
+                    error=str(e),
+                )
 
-            # Determine severity
-            severity = self._determine_severity(ensemble_score)
+        if not model_score_columns:
+            return [self._no_anomaly_result()] * len(feature_matrix)
+
+        # Ensemble prediction
+        ensemble_scores = np.mean(np.column_stack(list(model_score_columns.values())), axis=1)
+
+        results = []
+        for row, (features, ensemble_score) in enumerate(zip(feature_matrix, ensemble_scores)):
+            model_scores = {model_type: scores[row] for model_type, scores in model_score_columns.items()}
+            results.append(
+                {
+                    "is_anomaly": ensemble_score > self.anomaly_threshold,
+                    "confidence": ensemble_score,
+                    "anomaly_type": self._determine_anomaly_type(features, model_scores),
+                    "severity": self._determine_severity(ensemble_score),
+                    "model_scores": model_scores,
+                }
+            )
 
-            return {
-                "is_anomaly": is_anomaly,
-                "confidence": ensemble_score,
-                "anomaly_type": anomaly_type,
-                "severity": severity,
-                "model_scores": model_scores,
+        return results
+
+    def _get_scoring_stats(self) -> Dict[str, Any]:
+        """Get micro-batched scoring throughput and latency statistics."""
+        stats = dict(self._scoring_stats)
+        stats["pending"] = self._pending_score_count
+        stats["batch_window_ms"] = self.scoring_batch_window_ms
+        stats["max_batch_size"] = self.scoring_max_batch_size
+        stats["avg_batch_size"] = round(stats["events_scored"] / stats["batches"], 2) if stats["batches"] else 0.0
+
+        # Throughput over the last minute of scored batches
+        now = time.perf_counter()
+        recent = [(finished, size) for finished, size in self._scoring_batches if now - finished <= 60]
+        if recent:
+            span = max(now - recent[0][0], 1.0)
+            stats["throughput_per_second"] = round(sum(size for _, size in recent) / span, 2)
+        else:
+            stats["throughput_per_second"] = 0.0
+
+        if self._scoring_latencies:
+            latencies_ms = np.fromiter(self._scoring_latencies, dtype=np.float64) * 1000
+            stats["latency_ms"] = {
+                "p50": round(float(np.percentile(latencies_ms, 50)), 3),
+                "p99": round(float(np.percentile(latencies_ms, 99)), 3),
+                "max": round(float(latencies_ms.max()), 3),
             }
+        else:
+            stats["latency_ms"] = {"p50": 0.0, "p99": 0.0, "max": 0.0}
 
-        except Exception as e:
-            logger.error("Failed to detect anomalies", device_id=device_id, error=str(e))
-            return {
-                "is_anomaly": False,
-                "confidence": 0.0,
-                "anomaly_type": "error",
-                "severity": SeverityLevel.LOW,
-                "model_scores": {},
-            }
+        return stats
 
-    def _determine_anomaly_type(self, features: Dict[str, float], model_scores: Dict[str, float]) -> str:
+    def _determine_anomaly_type(self, features: np.ndarray, model_scores: Dict[str, float]) -> str:
         """Determine the type of anomaly detected."""
         # Rule-based anomaly type classification
-        temp = features.get("temperature", 0)
-        temp_derivative = features.get("temp_derivative", 0)
-        battery_level = features.get("battery_level", 100)
-        signal_strength = features.get("signal_strength", -50)
+        temp = features[TEMPERATURE]
+        temp_derivative = features[TEMP_DERIVATIVE]
+        battery_level = features[BATTERY_LEVEL]
+        signal_strength = features[SIGNAL_STRENGTH]
 
         # Temperature-based anomalies
         if abs(temp_derivative) > 10:
@@ -476,10 +649,9 @@ class AnomalyDetector:
             if device_id not in self.device_features or not self.device_features[device_id]:
                 return {"min": 0.0, "max": 500.0}
 
-            recent_features = list(self.device_features[device_id])[-100:]  # Last 100 readings
-            temperatures = [f["temperature"] for f in recent_features]
+            temperatures = self.device_features[device_id].recent("temperature", 100)  # Last 100 readings
 
-            if not temperatures:
+            if not len(temperatures):
                 return {"min": 0.0, "max": 500.0}
 
             mean_temp = np.mean(temperatures)
@@ -500,10 +672,9 @@ class AnomalyDetector:
             if device_id not in self.device_features or not self.device_features[device_id]:
                 return {}
 
-            recent_features = list(self.device_features[device_id])[-1000:]  # Last 1000 readings
-            temperatures = [f["temperature"] for f in recent_features]
+            temperatures = self.device_features[device_id].recent("temperature", 1000)  # Last 1000 readings
 
-            if not temperatures:
+            if not len(temperatures):
                 return {}
 
             return {
@@ -546,187 +717,250 @@ class AnomalyDetector:
 
     async def _train_all_models(self):
         """Train models for all devices."""
-        for device_id in list(self.device_features.keys()):
-            if len(self.device_features[device_id]) >= self.min_training_samples:
-                try:
-                    await self._train_device_models(device_id)
-                except Exception as e:
-                    logger.error(
-                        "Failed to train models for device",
-                        device_id=device_id,
-                        error=str(e),
-                    )
+        device_ids = [
+            device_id
+            for device_id in list(self.device_features.keys())
+            if len(self.device_features[device_id]) >= self.min_training_samples
+        ]
+        results = await asyncio.gather(
+            *(self._train_device_models(device_id) for device_id in device_ids),
+            return_exceptions=True,
+        )
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    "Failed to train models for device",
+                    device_id=device_id,
+                    error=str(result),
+                )
+
+    def _get_training_executor(self) -> ProcessPoolExecutor:
+        """Get the process pool used for model training, creating it on first use."""
+        if self._training_executor is None:
+            # Spawn rather than fork: the service process runs Kafka client threads
+            self._training_executor = ProcessPoolExecutor(
+                max_workers=self.max_concurrent_trainings,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._training_executor
+
+    def _schedule_training(self, device_id: str) -> asyncio.Task:
+        """Queue a training job for a device, reusing one that is already queued or running."""
+        job = self._training_jobs.get(device_id)
+        if job is None or job.done():
+            self.training_status[device_id] = {
+                "state": "queued",
+                "queued_at": datetime.utcnow().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "training_samples": None,
+                "models_trained": [],
+                "error": None,
+            }
+            job = asyncio.create_task(self._run_training_job(device_id))
+            self._training_jobs[device_id] = job
+            job.add_done_callback(lambda task, device_id=device_id: self._training_jobs.pop(device_id, None))
+        return job
 
     async def _train_device_models(self, device_id: str):
-        """Train anomaly detection models for a specific device."""
-        try:
-            logger.info("Training models for device", device_id=device_id)
-
-            # Prepare training data
-            features_list = list(self.device_features[device_id])
-
-            # Convert to feature matrix
-            feature_matrix = []
-            for features in features_list:
-                feature_vector = [
-                    features.get("temperature", 0),
-                    features.get("battery_level", 0),
-                    features.get("signal_strength", 0),
-                    features.get("hour_of_day", 0),
-                    features.get("day_of_week", 0),
-                    features.get("minute_of_hour", 0),
-                    features.get("processing_time", 0),
-                    features.get("temp_mean", features.get("temperature", 0)),
-                    features.get("temp_std", 0),
-                    features.get("temp_min", features.get("temperature", 0)),
-                    features.get("temp_max", features.get("temperature", 0)),
-                    features.get("temp_range", 0),
-                    features.get("temp_derivative", 0),
-                    features.get("temp_second_derivative", 0),
-                    features.get("battery_trend", 0),
-                    features.get("signal_mean", features.get("signal_strength", 0)),
-                    features.get("signal_std", 0),
-                ]
-                feature_matrix.append(feature_vector)
+        """Train anomaly detection models for a specific device.
 
-            X = np.array(feature_matrix)
+        Fitting runs in the training process pool so the event loop keeps
+        consuming while models train; waits for the job to finish.
+        """
+        await asyncio.shield(self._schedule_training(device_id))
 
-            # Scale features
-            scaler = StandardScaler()
-            X_scaled = scaler.fit_transform(X)
-            self.scalers[device_id] = scaler
+    async def _run_training_job(self, device_id: str):
+        """Run one device's training job once a training slot is free."""
+        status = self.training_status[device_id]
 
-            # Train multiple models
-            models = {}
+        try:
+            async with self._training_semaphore:
+                logger.info("Training models for device", device_id=device_id)
 
-            # Isolation Forest
-            try:
-                iso_forest = IsolationForest(contamination=0.1, random_state=42, n_jobs=-1)
-                iso_forest.fit(X_scaled)
-                models["isolation_forest"] = iso_forest
-            except Exception as e:
+                # Snapshot training data when the job actually starts
+                X = self.device_features[device_id].matrix()
+                status["state"] = "running"
+                status["started_at"] = datetime.utcnow().isoformat()
+                status["training_samples"] = len(X)
+
+                loop = asyncio.get_event_loop()
+                scaler, models, errors = await loop.run_in_executor(self._get_training_executor(), _fit_device_models, X)
+
+            for model_type, error in errors.items():
                 logger.warning(
-                    "Failed to train Isolation Forest",
+                    f"Failed to train {model_type}",
                     device_id=device_id,
-                    error=str(e),
+                    error=error,
                 )
 
-            # Local Outlier Factor
-            try:
-                lof = LOF(contamination=0.1)
-                lof.fit(X_scaled)
-                models["lof"] = lof
-            except Exception as e:
-                logger.warning("Failed to train LOF", device_id=device_id, error=str(e))
+            # Swap scaler and models together without yielding, so scoring never
+            # sees a new scaler paired with old models
+            self._install_models(device_id, scaler, models)
 
-            # K-Nearest Neighbors
-            try:
-                knn = KNN(contamination=0.1)
-                knn.fit(X_scaled)
-                models["knn"] = knn
-            except Exception as e:
-                logger.warning("Failed to train KNN", device_id=device_id, error=str(e))
-
-            # AutoEncoder (if enough data)
-            if len(X_scaled) >= 500:
-                try:
-                    autoencoder = AutoEncoder(contamination=0.1, epochs=50, verbose=0)
-                    autoencoder.fit(X_scaled)
-                    models["autoencoder"] = autoencoder
-                except Exception as e:
-                    logger.warning("Failed to train AutoEncoder", device_id=device_id, error=str(e))
-
-            # Store models
-            self.models[device_id] = models
+            status["state"] = "completed"
+            status["models_trained"] = list(models.keys())
+            TRAINING_JOBS.labels(status="completed").inc()
 
-            # Save models to Redis
-            await self._save_models(device_id)
-
-            # Update metrics
-            ACTIVE_MODELS.set(len(self.models))
+            # Persist to the model store
+            await self._save_models(
+                device_id,
+                scaler,
+                models,
+                {"training_samples": len(X), "trained_at": status["started_at"]},
+            )
 
             logger.info(
                 "Model training completed",
                 device_id=device_id,
                 models_trained=list(models.keys()),
-                training_samples=len(X_scaled),
+                training_samples=len(X),
             )
 
+        except asyncio.CancelledError:
+            status["state"] = "cancelled"
+            TRAINING_JOBS.labels(status="cancelled").inc()
+            raise
+
         except Exception as e:
+            status["state"] = "failed"
+            status["error"] = str(e)
+            TRAINING_JOBS.labels(status="failed").inc()
             logger.error("Failed to train device models", device_id=device_id, error=str(e))
             raise
 
-    async def _save_models(self, device_id: str):
-        """Save trained models to Redis."""
-        try:
-            if not self.redis_client:
-                return
+        finally:
+            status["finished_at"] = datetime.utcnow().isoformat()
 
-            # Save models
-            models_data = {}
-            for model_type, model in self.models[device_id].items():
-                models_data[model_type] = pickle.dumps(model)
+    def get_training_status(self) -> Dict[str, Any]:
+        """Get queued, running and finished training jobs."""
+        jobs_by_state: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for device_id, status in self.training_status.items():
+            jobs_by_state[status["state"]].append({"device_id": device_id, **status})
 
-            await self.redis_client.hset(f"anomaly_models:{device_id}", mapping=models_data)
+        return {
+            "max_concurrent_trainings": self.max_concurrent_trainings,
+            "queued": jobs_by_state.get("queued", []),
+            "running": jobs_by_state.get("running", []),
+            "finished": [job for state in ("completed", "failed", "cancelled") for job in jobs_by_state.get(state, [])],
+        }
 
-            # Save scaler
-            if device_id in self.scalers:
-                scaler_data = pickle.dumps(self.scalers[device_id])
-                await self.redis_client.set(f"anomaly_scaler:{device_id}", scaler_data)
+    async def _save_models(
+        self,
+        device_id: str,
+        scaler: StandardScaler,
+        models: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """Save trained models to the model store."""
+        try:
+            metadata = {"feature_names": list(FEATURE_NAMES), **(metadata or {})}
+            loop = asyncio.get_event_loop()
+            version = await loop.run_in_executor(None, self.model_store.save, device_id, scaler, models, metadata)
+            self._stored_devices.add(device_id)
+            ACTIVE_MODELS.set(len(self._stored_devices | set(self.models)))
 
-            # Set expiration
-            await self.redis_client.expire(f"anomaly_models:{device_id}", 86400 * 7)  # 7 days
-            await self.redis_client.expire(f"anomaly_scaler:{device_id}", 86400 * 7)
+            logger.debug("Models saved to model store", device_id=device_id, version=version)
 
         except Exception as e:
-            logger.error("Failed to save models to Redis", device_id=device_id, error=str(e))
+            logger.error("Failed to save models to model store", device_id=device_id, error=str(e))
 
     async def _load_models(self):
-        """Load existing models from Redis."""
+        """Index the devices that have models in the model store.
+
+        Models themselves are loaded lazily on a device's first reading.
+        """
         try:
-            if not self.redis_client:
-                return
+            loop = asyncio.get_event_loop()
+            self._stored_devices = await loop.run_in_executor(None, self.model_store.list_devices)
 
-            # Get all model keys
-            model_keys = await self.redis_client.keys("anomaly_models:*")
+            # Update metrics
+            ACTIVE_MODELS.set(len(self._stored_devices | set(self.models)))
 
-            for key in model_keys:
-                device_id = key.decode("utf-8").split(":")[1]
+            logger.info("Model store indexed", stored_devices=len(self._stored_devices))
 
-                try:
-                    # Load models
-                    models_data = await self.redis_client.hgetall(key)
-                    models = {}
+        except Exception as e:
+            logger.error("Failed to index model store", error=str(e))
 
-                    for model_type, model_data in models_data.items():
-                        model_type = model_type.decode("utf-8")
-                        models[model_type] = pickle.loads(model_data)
+    async def _ensure_models_resident(self, device_id: str) -> Optional[Tuple[StandardScaler, Dict[str, Any]]]:
+        """Make sure a device's models are in memory, loading them from the store if needed.
 
-                    self.models[device_id] = models
+        Returns:
+            Tuple of (scaler, models) to score with, or None if the device has no models
+        """
+        if device_id in self.models and device_id in self.scalers:
+            self.models.move_to_end(device_id)
+            self._model_cache_stats["hits"] += 1
+            MODEL_CACHE_HITS.inc()
+            return self.scalers[device_id], self.models[device_id]
 
-                    # Load scaler
-                    scaler_data = await self.redis_client.get(f"anomaly_scaler:{device_id}")
-                    if scaler_data:
-                        self.scalers[device_id] = pickle.loads(scaler_data)
+        if device_id not in self._stored_devices:
+            return None
 
-                    logger.info(
-                        "Models loaded from Redis",
-                        device_id=device_id,
-                        models=list(models.keys()),
-                    )
+        pending_load = self._model_loads.get(device_id)
+        if pending_load is None:
+            pending_load = asyncio.create_task(self._load_device_models(device_id))
+            self._model_loads[device_id] = pending_load
+            pending_load.add_done_callback(lambda task, device_id=device_id: self._model_loads.pop(device_id, None))
 
-                except Exception as e:
-                    logger.warning(
-                        "Failed to load models for device",
-                        device_id=device_id,
-                        error=str(e),
-                    )
-
-            # Update metrics
-            ACTIVE_MODELS.set(len(self.models))
+        return await asyncio.shield(pending_load)
 
+    async def _load_device_models(self, device_id: str) -> Optional[Tuple[StandardScaler, Dict[str, Any]]]:
+        """Load one device's models from the model store into the resident cache."""
+        try:
+            loop = asyncio.get_event_loop()
+            stored = await loop.run_in_executor(None, self.model_store.load, device_id)
         except Exception as e:
-            logger.error("Failed to load models from Redis", error=str(e))
+            logger.warning("Failed to load models for device", device_id=device_id, error=str(e))
+            stored = None
+
+        if stored is None:
+            self._stored_devices.discard(device_id)
+            self._model_cache_stats["load_failures"] += 1
+            MODEL_CACHE_LOADS.labels(status="failed").inc()
+            return None
+
+        scaler, models, manifest = stored
+        # A training job may have installed newer models while this load was running
+        if device_id in self.models:
+            scaler, models = self.scalers[device_id], self.models[device_id]
+        else:
+            self._install_models(device_id, scaler, models)
+
+        self._model_cache_stats["loads"] += 1
+        MODEL_CACHE_LOADS.labels(status="success").inc()
+        logger.debug(
+            "Models loaded from model store",
+            device_id=device_id,
+            version=manifest.get("version"),
+            models=list(models.keys()),
+        )
+        return scaler, models
+
+    def _install_models(self, device_id: str, scaler: StandardScaler, models: Dict[str, Any]):
+        """Make a device's scaler and models resident, evicting the least recently used devices."""
+        self.scalers[device_id] = scaler
+        self.models[device_id] = models
+        self.models.move_to_end(device_id)
+
+        while len(self.models) > self.max_resident_models:
+            evicted_id, _ = self.models.popitem(last=False)
+            self.scalers.pop(evicted_id, None)
+            self._model_cache_stats["evictions"] += 1
+            MODEL_CACHE_EVICTIONS.inc()
+
+        RESIDENT_MODELS.set(len(self.models))
+
+    def _get_model_cache_stats(self) -> Dict[str, Any]:
+        """Get resident model cache statistics."""
+        stats = dict(self._model_cache_stats)
+        lookups = stats["hits"] + stats["loads"] + stats["load_failures"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["resident"] = len(self.models)
+        stats["max_resident"] = self.max_resident_models
+        stats["stored"] = len(self._stored_devices)
+        stats["loading"] = len(self._model_loads)
+        return stats
 
     async def _maintenance_loop(self):
         """Background task for maintenance operations."""
@@ -760,16 +994,29 @@ class AnomalyDetector:
         except Exception as e:
             logger.error("Failed to cleanup old anomalies", error=str(e))
 
-    async def retrain_model(self, device_id: Optional[str] = None):
-        """Manually retrain models."""
+    async def retrain_model(self, device_id: Optional[str] = None, wait: bool = True):
+        """Manually retrain models.
+
+        Args:
+            device_id: Device to retrain, or None for every device with enough data
+            wait: Wait for training to finish instead of only queueing the jobs
+        """
         try:
             if device_id:
                 if device_id in self.device_features and len(self.device_features[device_id]) >= self.min_training_samples:
+                    if not wait:
+                        self._schedule_training(device_id)
+                        return {"status": "retraining_queued", "device_id": device_id}
                     await self._train_device_models(device_id)
                     return {"status": "retraining_completed", "device_id": device_id}
                 else:
                     return {"status": "insufficient_data", "device_id": device_id}
             else:
+                if not wait:
+                    for candidate in list(self.device_features.keys()):
+                        if len(self.device_features[candidate]) >= self.min_training_samples:
+                            self._schedule_training(candidate)
+                    return {"status": "retraining_all_queued"}
                 await self._train_all_models()
                 return {"status": "retraining_all_completed"}
 
@@ -781,15 +1028,21 @@ class AnomalyDetector:
         """Get service status."""
         return {
             "is_running": self.is_running,
-            "active_models": len(self.models),
+            "active_models": len(self._stored_devices | set(self.models)),
+            "model_cache": self._get_model_cache_stats(),
             "devices_monitored": len(self.device_features),
             "total_anomalies": sum(len(anomalies) for anomalies in self.anomaly_history.values()),
             "model_types": self.model_types,
             "anomaly_threshold": self.anomaly_threshold,
             "min_training_samples": self.min_training_samples,
+            "scoring": self._get_scoring_stats(),
+            "training_jobs": {
+                state: len(jobs) if isinstance(jobs, list) else jobs for state, jobs in self.get_training_status().items()
+            },
             "background_tasks": {
                 "training": (not self.training_task.done() if self.training_task else False),
                 "maintenance": (not self.maintenance_task.done() if self.maintenance_task else False),
+                "scoring": (not self._scoring_task.done() if self._scoring_task else False),
             },
         }
 
@@ -803,10 +1056,13 @@ class AnomalyDetector:
                 self.training_task.cancel()
             if self.maintenance_task:
                 self.maintenance_task.cancel()
-
-            # Save models before shutdown
-            for device_id in self.models:
-                await self._save_models(device_id)
+            if self._scoring_task:
+                self._scoring_task.cancel()
+            self._fail_pending_scores()
+            for job in list(self._training_jobs.values()):
+                job.cancel()
+            if self._training_executor:
+                self._training_executor.shutdown(wait=False, cancel_futures=True)
 
             # Close Redis connection
             if self.redis_client:
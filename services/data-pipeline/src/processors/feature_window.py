@@ -0,0 +1,250 @@
+"""
+Per-device feature ring buffers for anomaly detection.
+
+Feature vectors are written into preallocated NumPy arrays and the rolling
+window statistics used as derived features are maintained incrementally, so
+extracting the features of a reading is constant-time per event.
+"""
+
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+import numpy as np
+
+# Column order of the feature matrix used for scaling, training and scoring
+FEATURE_NAMES = (
+    "temperature",
+    "battery_level",
+    "signal_strength",
+    "hour_of_day",
+    "day_of_week",
+    "minute_of_hour",
+    "processing_time",
+    "temp_mean",
+    "temp_std",
+    "temp_min",
+    "temp_max",
+    "temp_range",
+    "temp_derivative",
+    "temp_second_derivative",
+    "battery_trend",
+    "signal_mean",
+    "signal_std",
+)
+FEATURE_INDEX = {name: index for index, name in enumerate(FEATURE_NAMES)}
+NUM_FEATURES = len(FEATURE_NAMES)
+
+TEMPERATURE = FEATURE_INDEX["temperature"]
+BATTERY_LEVEL = FEATURE_INDEX["battery_level"]
+SIGNAL_STRENGTH = FEATURE_INDEX["signal_strength"]
+TEMP_DERIVATIVE = FEATURE_INDEX["temp_derivative"]
+
+
+class SlidingWindowStats:
+    """Running mean, variance, min and max over the last ``size`` samples.
+
+    Mean and variance use Welford's update extended with removal of the
+    sample leaving the window. Min and max are tracked with monotonic deques
+    of sample positions. Samples pushed with ``valid=False`` occupy a window
+    position but do not contribute to the statistics.
+    """
+
+    def __init__(self, size: int, track_extremes: bool = True):
+        self.size = size
+        self.track_extremes = track_extremes
+        self._values = np.zeros(size, dtype=np.float64)
+        self._valid = np.zeros(size, dtype=bool)
+        self._position = 0  # total samples pushed
+        self.count = 0  # valid samples in window
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._min_positions: Deque[int] = deque()
+        self._max_positions: Deque[int] = deque()
+        self._valid_positions: Deque[int] = deque()
+
+    def push(self, value: float, valid: bool = True) -> None:
+        """Add a sample, evicting the oldest one once the window is full."""
+        slot = self._position % self.size
+
+        if self._position >= self.size and self._valid[slot]:
+            self._remove(self._values[slot])
+
+        self._values[slot] = value
+        self._valid[slot] = valid
+        position = self._position
+        self._position += 1
+
+        oldest = self._position - self.size
+        while self._valid_positions and self._valid_positions[0] < oldest:
+            self._valid_positions.popleft()
+
+        if self.track_extremes:
+            while self._min_positions and self._min_positions[0] < oldest:
+                self._min_positions.popleft()
+            while self._max_positions and self._max_positions[0] < oldest:
+                self._max_positions.popleft()
+
+        if not valid:
+            return
+
+        self._add(value)
+        self._valid_positions.append(position)
+
+        if self.track_extremes:
+            while self._min_positions and self._value_at(self._min_positions[-1]) >= value:
+                self._min_positions.pop()
+            self._min_positions.append(position)
+            while self._max_positions and self._value_at(self._max_positions[-1]) <= value:
+                self._max_positions.pop()
+            self._max_positions.append(position)
+
+    def _add(self, value: float) -> None:
+        """Welford update for a sample entering the window."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float) -> None:
+        """Inverse Welford update for a sample leaving the window."""
+        if self.count <= 1:
+            self.count = 0
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self._m2 = max(0.0, self._m2 - delta * (value - self.mean))
+
+    def _value_at(self, position: int) -> float:
+        """Sample stored for an absolute position."""
+        return self._values[position % self.size]
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of the valid samples in the window."""
+        return (self._m2 / self.count) ** 0.5 if self.count else 0.0
+
+    @property
+    def min(self) -> float:
+        """Minimum valid sample in the window."""
+        return self._value_at(self._min_positions[0])
+
+    @property
+    def max(self) -> float:
+        """Maximum valid sample in the window."""
+        return self._value_at(self._max_positions[0])
+
+    @property
+    def window_length(self) -> int:
+        """Number of window positions filled, valid or not."""
+        return min(self._position, self.size)
+
+    def first_valid(self) -> float:
+        """Oldest valid sample still in the window."""
+        return self._value_at(self._valid_positions[0])
+
+    def last_valid(self) -> float:
+        """Newest valid sample in the window."""
+        return self._value_at(self._valid_positions[-1])
+
+    def last(self, offset: int = 0) -> float:
+        """Sample ``offset`` positions before the newest one."""
+        return self._values[(self._position - 1 - offset) % self.size]
+
+
+class DeviceFeatureBuffer:
+    """Ring buffer of feature vectors for one device with rolling window stats."""
+
+    def __init__(self, capacity: int = 10000, window_size: int = 20):
+        self.capacity = capacity
+        self.window_size = window_size
+        self._features = np.zeros((capacity, NUM_FEATURES), dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+        self._temperature = SlidingWindowStats(window_size)
+        self._battery = SlidingWindowStats(window_size, track_extremes=False)
+        self._signal = SlidingWindowStats(window_size, track_extremes=False)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append_reading(
+        self,
+        temperature: float,
+        battery_level: float,
+        signal_strength: float,
+        hour_of_day: int,
+        day_of_week: int,
+        minute_of_hour: int,
+        processing_time: float,
+    ) -> np.ndarray:
+        """Compute the features of a reading and append them to the buffer.
+
+        Derived features describe the window of readings *before* this one.
+
+        Returns:
+            The stored feature row (a view into the ring buffer)
+        """
+        row = self._features[self._head]
+        row[0] = temperature
+        row[1] = battery_level
+        row[2] = signal_strength
+        row[3] = hour_of_day
+        row[4] = day_of_week
+        row[5] = minute_of_hour
+        row[6] = processing_time
+
+        temps = self._temperature
+        if temps.window_length > 1:
+            row[7] = temps.mean
+            row[8] = temps.std
+            row[9] = temps.min
+            row[10] = temps.max
+            row[11] = row[10] - row[9]
+            row[12] = temps.last(0) - temps.last(1)
+            row[13] = row[12] - (temps.last(1) - temps.last(2)) if temps.window_length >= 3 else 0.0
+            row[14] = self._battery.last_valid() - self._battery.first_valid() if self._battery.count >= 2 else 0.0
+            if self._signal.count >= 2:
+                row[15] = self._signal.mean
+                row[16] = self._signal.std
+            else:
+                row[15] = signal_strength
+                row[16] = 0.0
+        else:
+            row[7] = temperature
+            row[8] = 0.0
+            row[9] = temperature
+            row[10] = temperature
+            row[11:15] = 0.0
+            row[15] = signal_strength
+            row[16] = 0.0
+
+        temps.push(temperature)
+        self._battery.push(battery_level, valid=battery_level > 0)
+        self._signal.push(signal_strength, valid=signal_strength != 0)
+
+        self._head = (self._head + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+        return row
+
+    def _ordered_indices(self, n: Optional[int] = None) -> Tuple[slice, ...]:
+        """Slices covering the newest ``n`` rows in chronological order."""
+        n = self._count if n is None else min(n, self._count)
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            return (slice(start, start + n),)
+        return (slice(start, self.capacity), slice(0, (start + n) - self.capacity))
+
+    def matrix(self, n: Optional[int] = None) -> np.ndarray:
+        """Copy of the newest ``n`` feature rows (all by default), oldest first."""
+        parts = [self._features[part] for part in self._ordered_indices(n)]
+        return parts[0].copy() if len(parts) == 1 else np.concatenate(parts)
+
+    def recent(self, feature: str, n: Optional[int] = None) -> np.ndarray:
+        """Newest ``n`` values of a single feature, oldest first."""
+        column = FEATURE_INDEX[feature]
+        parts = [self._features[part, column] for part in self._ordered_indices(n)]
+        return parts[0].copy() if len(parts) == 1 else np.concatenate(parts)
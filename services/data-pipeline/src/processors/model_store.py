@@ -0,0 +1,161 @@
+"""
+Versioned on-disk store for per-device anomaly detection models.
+
+Layout::
+
+    <root>/<device>/CURRENT                 name of the active version directory
+    <root>/<device>/v<N>/manifest.json      store format, model types and training metadata
+    <root>/<device>/v<N>/scaler.joblib
+    <root>/<device>/v<N>/<model_type>.joblib
+
+Models are written with joblib without compression so the NumPy arrays they
+hold are memory-mapped read-only on load instead of copied into the heap.
+Versions are written to a temporary directory and renamed into place, and
+``CURRENT`` is replaced atomically, so readers never see a partial version.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+
+import joblib
+import structlog
+
+logger = structlog.get_logger()
+
+STORE_FORMAT_VERSION = 1
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+SCALER_FILE = "scaler.joblib"
+
+
+class ModelStore:
+    """Stores one directory of versioned model files per device."""
+
+    def __init__(self, root: str, keep_versions: int = 2):
+        self.root = Path(root)
+        self.keep_versions = max(1, keep_versions)
+
+    def _device_dir(self, device_id: str) -> Path:
+        """Directory of a device; the ID is quoted so it is always a single path component.
+
+        Raises:
+            ValueError: If the device ID would resolve outside the store root
+        """
+        name = quote(device_id, safe="")
+        if name in ("", ".", ".."):
+            raise ValueError(f"Invalid device ID for model store: {device_id!r}")
+        device_dir = self.root / name
+        if device_dir.resolve().parent != self.root.resolve():
+            raise ValueError(f"Invalid device ID for model store: {device_id!r}")
+        return device_dir
+
+    def list_devices(self) -> Set[str]:
+        """Devices that have a current model version on disk."""
+        if not self.root.is_dir():
+            return set()
+        return {unquote(path.name) for path in self.root.iterdir() if (path / CURRENT_FILE).is_file()}
+
+    def current_version(self, device_id: str) -> Optional[int]:
+        """Active model version of a device, or None if it has none."""
+        try:
+            name = (self._device_dir(device_id) / CURRENT_FILE).read_text().strip()
+            return int(name.lstrip("v"))
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save(
+        self,
+        device_id: str,
+        scaler: Any,
+        models: Dict[str, Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Write a new model version for a device and make it current.
+
+        Returns:
+            The version number written
+        """
+        device_dir = self._device_dir(device_id)
+        device_dir.mkdir(parents=True, exist_ok=True)
+        version = (self.current_version(device_id) or 0) + 1
+
+        staging = Path(tempfile.mkdtemp(prefix=f".v{version}-", dir=device_dir))
+        try:
+            joblib.dump(scaler, staging / SCALER_FILE)
+            for model_type, model in models.items():
+                joblib.dump(model, staging / f"{model_type}.joblib")
+
+            manifest = {
+                "format_version": STORE_FORMAT_VERSION,
+                "device_id": device_id,
+                "version": version,
+                "model_types": list(models.keys()),
+                "saved_at": datetime.utcnow().isoformat(),
+                **(metadata or {}),
+            }
+            (staging / MANIFEST_FILE).write_text(json.dumps(manifest, default=str))
+
+            version_dir = device_dir / f"v{version}"
+            if version_dir.exists():
+                shutil.rmtree(version_dir)
+            os.rename(staging, version_dir)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        current_tmp = device_dir / f".{CURRENT_FILE}.tmp"
+        current_tmp.write_text(f"v{version}")
+        os.replace(current_tmp, device_dir / CURRENT_FILE)
+
+        self._prune(device_dir, version)
+        return version
+
+    def load(self, device_id: str) -> Optional[Tuple[Any, Dict[str, Any], Dict[str, Any]]]:
+        """Load the current model version of a device.
+
+        Returns:
+            Tuple of (scaler, models by type, manifest), or None if the device
+            has no stored models or they were written by an unsupported format
+        """
+        version = self.current_version(device_id)
+        if version is None:
+            return None
+
+        version_dir = self._device_dir(device_id) / f"v{version}"
+        manifest = json.loads((version_dir / MANIFEST_FILE).read_text())
+        if manifest.get("format_version") != STORE_FORMAT_VERSION:
+            logger.warning(
+                "Skipping models with unsupported store format",
+                device_id=device_id,
+                format_version=manifest.get("format_version"),
+            )
+            return None
+
+        scaler = joblib.load(version_dir / SCALER_FILE, mmap_mode="r")
+        models = {
+            model_type: joblib.load(version_dir / f"{model_type}.joblib", mmap_mode="r")
+            for model_type in manifest["model_types"]
+        }
+        return scaler, models, manifest
+
+    def delete(self, device_id: str) -> None:
+        """Remove every stored version of a device."""
+        shutil.rmtree(self._device_dir(device_id), ignore_errors=True)
+
+    def _prune(self, device_dir: Path, current: int) -> None:
+        """Remove versions older than the ``keep_versions`` newest ones."""
+        for path in device_dir.iterdir():
+            if not path.is_dir() or not path.name.startswith("v"):
+                continue
+            try:
+                version = int(path.name[1:])
+            except ValueError:
+                continue
+            if version <= current - self.keep_versions:
+                shutil.rmtree(path, ignore_errors=True)
@@ -3,9 +3,8 @@ Temperature aggregation service with real-time processing.
 """
 
 import asyncio
-import json
 import time
-from collections import defaultdict, deque
+from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -17,6 +16,8 @@ from prometheus_client import Counter, Gauge, Histogram
 from ..kafka.producer_manager import ProducerManager
 from ..schemas.events import BaseEvent, TemperatureReadingEvent, TemperatureValidatedEvent, ValidationError
 from ..utils.config import RedisConfig
+from .series_codec import decode_reading, encode_reading
+from .time_series import DeviceTimeSeries
 
 logger = structlog.get_logger()
 
@@ -36,6 +37,11 @@ AGGREGATION_DURATION = Histogram(
 )
 ACTIVE_DEVICES = Gauge("temperature_active_devices", "Number of active temperature devices")
 CACHE_HIT_RATIO = Gauge("temperature_cache_hit_ratio", "Cache hit ratio for temperature data")
+REDIS_PIPELINE_COMMANDS = Histogram(
+    "temperature_redis_pipeline_commands",
+    "Redis commands sent per write pipeline",
+    buckets=(4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048),
+)
 
 
 class TemperatureAggregationService:
@@ -47,12 +53,15 @@ class TemperatureAggregationService:
         self.redis_client: Optional[redis.Redis] = None
 
         # In-memory data structures
-        self.device_data: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.device_history_size = 1000
+        self.device_data: Dict[str, DeviceTimeSeries] = defaultdict(lambda: DeviceTimeSeries(self.device_history_size))
         self.device_stats: Dict[str, Dict[str, Any]] = {}
         self.last_seen: Dict[str, datetime] = {}
 
         # Processing configuration
         self.window_size_minutes = 5
+        self.series_retention_hours = 24
+        self.series_trim_interval_seconds = 300
         self.max_temperature_change_per_minute = 50.0  # degrees
         self.min_temperature = -40.0
         self.max_temperature = 1000.0
@@ -61,8 +70,12 @@ class TemperatureAggregationService:
         # Background tasks
         self.aggregation_task: Optional[asyncio.Task] = None
         self.cleanup_task: Optional[asyncio.Task] = None
+        self.trim_task: Optional[asyncio.Task] = None
         self.is_running = False
 
+        # Redis write metrics
+        self.redis_write_stats = {"pipelines": 0, "commands": 0, "readings": 0, "trimmed": 0}
+
         # Cache metrics
         self.cache_hits = 0
         self.cache_misses = 0
@@ -106,7 +119,7 @@ class TemperatureAggregationService:
                 socket_connect_timeout=self.redis_config.socket_connect_timeout,
                 retry_on_timeout=self.redis_config.retry_on_timeout,
                 health_check_interval=self.redis_config.health_check_interval,
-                decode_responses=True,
+                decode_responses=False,  # Series members are binary
             )
 
             # Test connection
@@ -117,6 +130,7 @@ class TemperatureAggregationService:
             self.is_running = True
             self.aggregation_task = asyncio.create_task(self._aggregation_loop())
             self.cleanup_task = asyncio.create_task(self._cleanup_loop())
+            self.trim_task = asyncio.create_task(self._series_trim_loop())
 
         except Exception as e:
             logger.error("Failed to initialize Redis connection", error=str(e))
@@ -178,6 +192,75 @@ class TemperatureAggregationService:
             TEMPERATURE_READINGS_PROCESSED.labels(device_id=device_id, status="error").inc()
             raise
 
+    async def process_temperature_readings(self, events: List[BaseEvent]) -> List[Tuple[BaseEvent, Exception]]:
+        """Process a batch of temperature readings, such as one consumed Kafka batch.
+
+        Readings are validated in order against the in-memory history, their
+        Redis writes are sent in one pipeline for the whole batch, and a
+        validated event is produced for each reading.
+
+        Returns:
+            The readings that failed validation with their errors, so the
+            consumer can route them to a retry or dead-letter topic
+        """
+        start_time = time.time()
+        processed: List[Tuple[TemperatureReadingEvent, Dict[str, Any]]] = []
+        failures: List[Tuple[BaseEvent, Exception]] = []
+
+        for event in events:
+            if not isinstance(event, TemperatureReadingEvent):
+                logger.warning(
+                    "Received non-temperature reading event",
+                    event_type=type(event).__name__,
+                )
+                continue
+
+            try:
+                validation_result = await self._validate_temperature_reading(event)
+                self._store_in_memory(event)
+                self._update_device_tracking(event)
+                processed.append((event, validation_result))
+            except Exception as e:
+                logger.error(
+                    "Failed to process temperature reading",
+                    device_id=event.data.device_id,
+                    error=str(e),
+                )
+                TEMPERATURE_READINGS_PROCESSED.labels(device_id=event.data.device_id, status="error").inc()
+                failures.append((event, e))
+
+        await self._write_readings_to_redis([event for event, _ in processed])
+
+        for event, validation_result in processed:
+            device_id = event.data.device_id
+            try:
+                validated_event = TemperatureValidatedEvent(
+                    event_id=f"{event.event_id}_validated",
+                    source="temperature_aggregator",
+                    data=event.data,
+                    validation_status=validation_result["status"],
+                    validation_errors=validation_result["errors"],
+                    processing_time_ms=(time.time() - start_time) * 1000,
+                )
+                await self.producer_manager.send_event("temperature.readings.validated", validated_event)
+                TEMPERATURE_READINGS_PROCESSED.labels(device_id=device_id, status=validation_result["status"]).inc()
+            except Exception as e:
+                logger.error(
+                    "Failed to send validated reading",
+                    device_id=device_id,
+                    error=str(e),
+                )
+                TEMPERATURE_READINGS_PROCESSED.labels(device_id=device_id, status="error").inc()
+
+        VALIDATION_DURATION.observe(time.time() - start_time)
+
+        logger.debug(
+            "Temperature reading batch processed",
+            readings=len(processed),
+            processing_time_ms=(time.time() - start_time) * 1000,
+        )
+        return failures
+
     async def _validate_temperature_reading(self, event: TemperatureReadingEvent) -> Dict[str, Any]:
         """Validate a temperature reading against rules."""
         errors = []
@@ -199,9 +282,8 @@ class TemperatureAggregationService:
 
         # Rule 2: Rate of change check
         if device_id in self.device_data and self.device_data[device_id]:
-            recent_readings = list(self.device_data[device_id])
-            if len(recent_readings) > 0:
-                last_reading = recent_readings[-1]
+            last_reading = self.device_data[device_id].last()
+            if last_reading is not None:
                 time_diff = (event.timestamp - last_reading["timestamp"]).total_seconds() / 60.0
                 if time_diff > 0:
                     temp_change = abs(temperature - last_reading["temperature"])
@@ -221,7 +303,7 @@ class TemperatureAggregationService:
             device_id in self.device_data
             and len(self.device_data[device_id]) >= self.validation_rules["spike_detection"]["min_samples"]
         ):
-            recent_temps = [r["temperature"] for r in list(self.device_data[device_id])[-10:]]
+            recent_temps = self.device_data[device_id].recent_temperatures(10).tolist()
             if recent_temps:
                 mean_temp = sum(recent_temps) / len(recent_temps)
                 std_temp = (sum((t - mean_temp) ** 2 for t in recent_temps) / len(recent_temps)) ** 0.5
@@ -254,49 +336,90 @@ class TemperatureAggregationService:
 
     async def _store_temperature_reading(self, event: TemperatureReadingEvent):
         """Store temperature reading in Redis and memory."""
-        device_id = event.data.device_id
+        await self._store_temperature_readings([event])
+
+    async def _store_temperature_readings(self, events: List[TemperatureReadingEvent]):
+        """Store temperature readings in Redis and memory."""
+        await self._write_readings_to_redis(events)
+        for event in events:
+            self._store_in_memory(event)
+
+    async def _write_readings_to_redis(self, events: List[TemperatureReadingEvent]):
+        """Write temperature readings to Redis in a single pipeline.
 
+        Each device gets one zadd for its readings, its newest reading as the
+        latest hash and one expire per key. Trimming the series to the
+        retention window is left to the periodic sweep.
+        """
         try:
             # Store in Redis
-            if self.redis_client:
-                key = f"temperature:{device_id}"
-                reading_data = {
-                    "timestamp": event.timestamp.isoformat(),
-                    "temperature": event.data.temperature,
-                    "battery_level": event.data.battery_level,
-                    "signal_strength": event.data.signal_strength,
-                    "location": event.data.location,
-                    "status": event.data.status,
-                }
-
-                # Store latest reading
-                await self.redis_client.hset(f"{key}:latest", mapping=reading_data)
-
-                # Store in time series (sorted set)
-                timestamp_score = event.timestamp.timestamp()
-                await self.redis_client.zadd(f"{key}:series", {json.dumps(reading_data): timestamp_score})
-
-                # Keep only last 24 hours
-                cutoff_time = (datetime.utcnow() - timedelta(hours=24)).timestamp()
-                await self.redis_client.zremrangebyscore(f"{key}:series", 0, cutoff_time)
-
-                # Set expiration
-                await self.redis_client.expire(f"{key}:latest", 3600)  # 1 hour
-                await self.redis_client.expire(f"{key}:series", 86400)  # 24 hours
+            if self.redis_client and events:
+                series: Dict[str, Dict[bytes, float]] = defaultdict(dict)
+                latest: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
+
+                for event in events:
+                    device_id = event.data.device_id
+                    reading_data = {
+                        "timestamp": event.timestamp.isoformat(),
+                        "temperature": event.data.temperature,
+                        "battery_level": event.data.battery_level,
+                        "signal_strength": event.data.signal_strength,
+                        "location": event.data.location,
+                        "status": event.data.status,
+                    }
+                    # Redis rejects None values, and one bad hset would fail
+                    # the whole shared pipeline on execute().
+                    reading_data = {field: value for field, value in reading_data.items() if value is not None}
+                    member = encode_reading(
+                        event.timestamp,
+                        event.data.temperature,
+                        event.data.battery_level,
+                        event.data.signal_strength,
+                        event.data.location,
+                        event.data.status,
+                    )
+                    series[device_id][member] = event.timestamp.timestamp()
+                    if device_id not in latest or event.timestamp >= latest[device_id][0]:
+                        latest[device_id] = (event.timestamp, reading_data)
+
+                pipe = self.redis_client.pipeline(transaction=False)
+                for device_id, members in series.items():
+                    key = f"temperature:{device_id}"
+
+                    # Store latest reading
+                    pipe.hset(f"{key}:latest", mapping=latest[device_id][1])
+
+                    # Store in time series (sorted set)
+                    pipe.zadd(f"{key}:series", members)
+
+                    # Set expiration
+                    pipe.expire(f"{key}:latest", 3600)  # 1 hour
+                    pipe.expire(f"{key}:series", 86400)  # 24 hours
+
+                commands = len(series) * 4
+                await pipe.execute()
+
+                self.redis_write_stats["pipelines"] += 1
+                self.redis_write_stats["commands"] += commands
+                self.redis_write_stats["readings"] += len(events)
+                REDIS_PIPELINE_COMMANDS.observe(commands)
 
         except Exception as e:
-            logger.error("Failed to store reading in Redis", device_id=device_id, error=str(e))
-
-        # Store in memory
-        self.device_data[device_id].append(
-            {
-                "timestamp": event.timestamp,
-                "temperature": event.data.temperature,
-                "battery_level": event.data.battery_level,
-                "signal_strength": event.data.signal_strength,
-                "location": event.data.location,
-                "status": event.data.status,
-            }
+            logger.error(
+                "Failed to store readings in Redis",
+                device_ids=sorted({event.data.device_id for event in events}),
+                error=str(e),
+            )
+
+    def _store_in_memory(self, event: TemperatureReadingEvent):
+        """Append a reading to the device's in-memory time series."""
+        self.device_data[event.data.device_id].append(
+            event.timestamp,
+            event.data.temperature,
+            event.data.battery_level,
+            event.data.signal_strength,
+            event.data.location,
+            event.data.status,
         )
 
     def _update_device_tracking(self, event: TemperatureReadingEvent):
@@ -369,31 +492,32 @@ class TemperatureAggregationService:
             if device_id not in self.device_data or not self.device_data[device_id]:
                 return
 
-            # Get recent readings
+            # Advance the device's incremental window to the current cycle
             now = datetime.utcnow()
             window_start = now - timedelta(minutes=self.window_size_minutes)
 
-            recent_readings = [r for r in self.device_data[device_id] if r["timestamp"] >= window_start]
+            series = self.device_data[device_id]
+            window = series.window_aggregate(window_start.timestamp())
 
-            if not recent_readings:
+            if window is None:
                 return
 
-            # Calculate aggregated statistics
-            temperatures = [r["temperature"] for r in recent_readings]
+            last_reading = series.last()
 
             aggregated_data = {
                 "device_id": device_id,
                 "window_start": window_start.isoformat(),
                 "window_end": now.isoformat(),
-                "reading_count": len(recent_readings),
-                "min_temperature": min(temperatures),
-                "max_temperature": max(temperatures),
-                "avg_temperature": sum(temperatures) / len(temperatures),
-                "temperature_trend": self._calculate_temperature_trend(temperatures),
-                "battery_level": recent_readings[-1]["battery_level"],
-                "signal_strength": recent_readings[-1]["signal_strength"],
-                "location": recent_readings[-1]["location"],
-                "status": recent_readings[-1]["status"],
+                "reading_count": window["count"],
+                "min_temperature": window["min"],
+                "max_temperature": window["max"],
+                "avg_temperature": window["mean"],
+                "temperature_trend": self._calculate_temperature_trend(window["slope"], window["span_seconds"]),
+                "temperature_slope_per_minute": round(window["slope"] * 60, 4),
+                "battery_level": last_reading["battery_level"],
+                "signal_strength": last_reading["signal_strength"],
+                "location": last_reading["location"],
+                "status": last_reading["status"],
             }
 
             # Store aggregated data in Redis
@@ -405,28 +529,23 @@ class TemperatureAggregationService:
             logger.debug(
                 "Device data aggregated",
                 device_id=device_id,
-                reading_count=len(recent_readings),
+                reading_count=window["count"],
             )
 
         except Exception as e:
             logger.error("Failed to aggregate device data", device_id=device_id, error=str(e))
 
-    def _calculate_temperature_trend(self, temperatures: List[float]) -> str:
-        """Calculate temperature trend from a list of temperatures."""
-        if len(temperatures) < 2:
-            return "stable"
-
-        # Simple trend calculation
-        first_half = temperatures[: len(temperatures) // 2]
-        second_half = temperatures[len(temperatures) // 2 :]
+    def _calculate_temperature_trend(self, slope: float, span_seconds: float) -> str:
+        """Calculate temperature trend from the window's least-squares slope.
 
-        if not first_half or not second_half:
+        The slope is projected over half the window span, which for a steady
+        trend matches the difference between the averages of the second and
+        first half of the window.
+        """
+        if span_seconds <= 0:
             return "stable"
 
-        first_avg = sum(first_half) / len(first_half)
-        second_avg = sum(second_half) / len(second_half)
-
-        diff = second_avg - first_avg
+        diff = slope * span_seconds / 2
 
         if diff > 2.0:
             return "increasing"
@@ -445,6 +564,39 @@ class TemperatureAggregationService:
                 logger.error("Error in cleanup loop", error=str(e))
                 await asyncio.sleep(300)  # Wait before retrying
 
+    async def _series_trim_loop(self):
+        """Background task that trims Redis time series to the retention window."""
+        while self.is_running:
+            try:
+                await asyncio.sleep(self.series_trim_interval_seconds)
+                await self._trim_series()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Error in series trim loop", error=str(e))
+
+    async def _trim_series(self) -> int:
+        """Remove series entries older than the retention window for every known device.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.redis_client or not self.device_stats:
+            return 0
+
+        cutoff_time = (datetime.utcnow() - timedelta(hours=self.series_retention_hours)).timestamp()
+        device_ids = list(self.device_stats.keys())
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for device_id in device_ids:
+            pipe.zremrangebyscore(f"temperature:{device_id}:series", 0, cutoff_time)
+        results = await pipe.execute()
+
+        removed = sum(results)
+        self.redis_write_stats["trimmed"] += removed
+        logger.debug("Trimmed Redis time series", devices=len(device_ids), removed=removed)
+        return removed
+
     async def _cleanup_old_data(self):
         """Clean up old data from memory and Redis."""
         try:
@@ -452,21 +604,16 @@ class TemperatureAggregationService:
 
             # Clean up memory data
             for device_id in list(self.device_data.keys()):
-                original_size = len(self.device_data[device_id])
-                self.device_data[device_id] = deque(
-                    [r for r in self.device_data[device_id] if r["timestamp"] > cutoff_time],
-                    maxlen=1000,
-                )
-                cleaned_size = len(self.device_data[device_id])
+                removed = self.device_data[device_id].trim_before(cutoff_time.timestamp())
 
-                if original_size != cleaned_size:
+                if removed:
                     logger.debug(
                         "Cleaned up old data",
                         device_id=device_id,
-                        removed=original_size - cleaned_size,
+                        removed=removed,
                     )
 
-            # Clean up Redis data is handled in _store_temperature_reading
+            # Redis series are trimmed by _series_trim_loop
 
         except Exception as e:
             logger.error("Failed to cleanup old data", error=str(e))
@@ -484,24 +631,15 @@ class TemperatureAggregationService:
 
                 if redis_data:
                     self.cache_hits += 1
-                    return [json.loads(data) for data in redis_data]
+                    return [decode_reading(data) for data in redis_data]
                 else:
                     self.cache_misses += 1
 
             # Fall back to memory data
             if device_id in self.device_data:
-                memory_data = [
-                    {
-                        "timestamp": r["timestamp"].isoformat(),
-                        "temperature": r["temperature"],
-                        "battery_level": r["battery_level"],
-                        "signal_strength": r["signal_strength"],
-                        "location": r["location"],
-                        "status": r["status"],
-                    }
-                    for r in self.device_data[device_id]
-                    if start_time <= r["timestamp"] <= end_time
-                ]
+                memory_data = self.device_data[device_id].readings_between(start_time.timestamp(), end_time.timestamp())
+                for reading in memory_data:
+                    reading["timestamp"] = reading["timestamp"].isoformat()
                 return memory_data
 
             return []
@@ -542,6 +680,7 @@ class TemperatureAggregationService:
             "is_running": self.is_running,
             "active_devices": len(self.device_stats),
             "total_readings": sum(stats["reading_count"] for stats in self.device_stats.values()),
+            "buffered_readings": sum(len(series) for series in self.device_data.values()),
             "cache_hit_ratio": (
                 self.cache_hits / (self.cache_hits + self.cache_misses) if (self.cache_hits + self.cache_misses) > 0 else 0
             ),
@@ -549,7 +688,9 @@ class TemperatureAggregationService:
             "background_tasks": {
                 "aggregation": (not self.aggregation_task.done() if self.aggregation_task else False),
                 "cleanup": not self.cleanup_task.done() if self.cleanup_task else False,
+                "series_trim": not self.trim_task.done() if self.trim_task else False,
             },
+            "redis_writes": dict(self.redis_write_stats),
         }
 
     async def shutdown(self):
@@ -562,6 +703,8 @@ class TemperatureAggregationService:
                 self.aggregation_task.cancel()
             if self.cleanup_task:
                 self.cleanup_task.cancel()
+            if self.trim_task:
+                self.trim_task.cancel()
 
             # Close Redis connection
             if self.redis_client:
@@ -0,0 +1,325 @@
+"""
+Per-device ring-buffer time series for temperature aggregation.
+
+Readings are stored in preallocated NumPy arrays kept in timestamp order; a
+late reading (for example one re-delivered from a retry topic) is inserted
+behind the newer readings already stored. The aggregation window (count, sum,
+min, max and least-squares slope over time) is maintained incrementally:
+readings are added to the window as they arrive and evicted when the window
+start moves past them, so an aggregation cycle only touches readings that
+entered or left the window since the last cycle instead of rescanning the
+device's history.
+"""
+
+from collections import deque
+from datetime import datetime, tzinfo
+from typing import Any, Deque, Dict, Hashable, List, Optional
+
+import numpy as np
+
+
+class DeviceTimeSeries:
+    """Fixed-capacity time series of readings for one device."""
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._temperatures = np.zeros(capacity, dtype=np.float64)
+        self._battery_levels = np.full(capacity, np.nan, dtype=np.float64)
+        self._signal_strengths = np.full(capacity, np.nan, dtype=np.float64)
+
+        # Location and status repeat across readings, so store small codes
+        self._locations = np.zeros(capacity, dtype=np.uint16)
+        self._statuses = np.zeros(capacity, dtype=np.uint16)
+        self._label_codes: Dict[Hashable, int] = {}
+        self._label_values: List[Any] = []
+
+        self._tzinfo: Optional[tzinfo] = None
+        self._start = 0  # absolute position of the oldest retained reading
+        self._end = 0  # absolute position after the newest reading
+
+        # Sliding window state; times are relative to an origin that is reset
+        # whenever the window empties, keeping them small for the running sums
+        self._window_start = 0
+        self._window_cutoff = -np.inf  # latest window start (epoch seconds)
+        self._origin = 0.0
+        self._count = 0
+        self._mean_t = 0.0
+        self._mean_y = 0.0
+        self._m2_t = 0.0
+        self._c_ty = 0.0
+        self._min_positions: Deque[int] = deque()
+        self._max_positions: Deque[int] = deque()
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _label_code(self, value: Any) -> int:
+        """Code for a location or status value, assigned on first use."""
+        code = self._label_codes.get(value)
+        if code is None:
+            code = self._label_codes[value] = len(self._label_values)
+            self._label_values.append(value)
+        return code
+
+    def append(
+        self,
+        timestamp: datetime,
+        temperature: float,
+        battery_level: Optional[float] = None,
+        signal_strength: Optional[float] = None,
+        location: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> None:
+        """Append a reading, overwriting the oldest one when the buffer is full.
+
+        A reading older than the newest one stored is inserted in timestamp
+        order; one older than every reading in a full buffer is dropped.
+        """
+        ts = timestamp.timestamp()
+        if self._end - self._start == self.capacity:
+            if ts < self._timestamps[self._start % self.capacity]:
+                return
+            if self._window_start == self._start:
+                self._evict_from_window()
+            self._start += 1
+
+        if self._tzinfo is None:
+            self._tzinfo = timestamp.tzinfo
+
+        position = self._end
+        if position > self._start and ts < self._timestamps[(position - 1) % self.capacity]:
+            position = self._open_slot(ts)
+        slot = position % self.capacity
+        self._timestamps[slot] = ts
+        self._temperatures[slot] = temperature
+        self._battery_levels[slot] = np.nan if battery_level is None else battery_level
+        self._signal_strengths[slot] = np.nan if signal_strength is None else signal_strength
+        self._locations[slot] = self._label_code(location)
+        self._statuses[slot] = self._label_code(status)
+        self._end += 1
+
+        if ts < self._window_cutoff:
+            # Older than the window start: the reading lands before the window
+            self._window_start = max(self._window_start, position + 1)
+        elif position == self._end - 1:
+            self._add_to_window(position, ts, temperature)
+        else:
+            self._add_to_stats(ts, temperature)
+            self._rebuild_extrema()
+
+    def _open_slot(self, ts: float) -> int:
+        """Shift the readings newer than ``ts`` up one position.
+
+        Returns:
+            The freed position, where a reading at ``ts`` keeps the buffer in
+            timestamp order
+        """
+        positions = np.arange(self._start, self._end)
+        position = self._start + int(np.searchsorted(self._timestamps[positions % self.capacity], ts, side="right"))
+        source = np.arange(position, self._end) % self.capacity
+        target = (source + 1) % self.capacity
+        for values in (
+            self._timestamps,
+            self._temperatures,
+            self._battery_levels,
+            self._signal_strengths,
+            self._locations,
+            self._statuses,
+        ):
+            values[target] = values[source]
+
+        if position < self._window_start:
+            self._window_start += 1
+        self._min_positions = deque(p + 1 if p >= position else p for p in self._min_positions)
+        self._max_positions = deque(p + 1 if p >= position else p for p in self._max_positions)
+        return position
+
+    def _add_to_window(self, position: int, ts: float, y: float) -> None:
+        """Add the newest reading to the running window statistics."""
+        self._add_to_stats(ts, y)
+
+        while self._min_positions and self._temperatures[self._min_positions[-1] % self.capacity] >= y:
+            self._min_positions.pop()
+        self._min_positions.append(position)
+        while self._max_positions and self._temperatures[self._max_positions[-1] % self.capacity] <= y:
+            self._max_positions.pop()
+        self._max_positions.append(position)
+
+    def _add_to_stats(self, ts: float, y: float) -> None:
+        """Add a reading to the window count, means and co-moments."""
+        if not self._count:
+            self._origin = ts
+        t = ts - self._origin
+        self._count += 1
+        dt = t - self._mean_t
+        self._mean_t += dt / self._count
+        self._mean_y += (y - self._mean_y) / self._count
+        self._m2_t += dt * (t - self._mean_t)
+        self._c_ty += dt * (y - self._mean_y)
+
+    def _rebuild_extrema(self) -> None:
+        """Rebuild the min/max position queues after an out-of-order insert.
+
+        A position stays in the min queue while every later reading in the
+        window is higher (and in the max queue while every later one is lower).
+        """
+        positions = np.arange(self._window_start, self._end)
+        if not len(positions):
+            self._min_positions, self._max_positions = deque(), deque()
+            return
+        values = self._temperatures[positions % self.capacity]
+        later_min = np.append(np.minimum.accumulate(values[::-1])[::-1][1:], np.inf)
+        later_max = np.append(np.maximum.accumulate(values[::-1])[::-1][1:], -np.inf)
+        self._min_positions = deque(int(p) for p in positions[values < later_min])
+        self._max_positions = deque(int(p) for p in positions[values > later_max])
+
+    def _evict_from_window(self) -> None:
+        """Remove the oldest reading in the window from the running statistics."""
+        position = self._window_start
+        slot = position % self.capacity
+        t, y = self._timestamps[slot] - self._origin, self._temperatures[slot]
+        self._window_start += 1
+
+        if self._count <= 1:
+            self._count = 0
+            self._mean_t = self._mean_y = self._m2_t = self._c_ty = 0.0
+        else:
+            self._count -= 1
+            mean_t = self._mean_t - (t - self._mean_t) / self._count
+            mean_y = self._mean_y - (y - self._mean_y) / self._count
+            self._m2_t = max(0.0, self._m2_t - (t - mean_t) * (t - self._mean_t))
+            self._c_ty -= (t - mean_t) * (y - self._mean_y)
+            self._mean_t, self._mean_y = mean_t, mean_y
+
+        if self._min_positions and self._min_positions[0] == position:
+            self._min_positions.popleft()
+        if self._max_positions and self._max_positions[0] == position:
+            self._max_positions.popleft()
+
+    def _evict_window_before(self, window_start: float) -> None:
+        """Evict every reading from the front of the window older than ``window_start``.
+
+        The front of the window is scanned in chunks that double in size, so
+        finding the cutoff costs time proportional to the readings evicted
+        rather than to the window. The evicted block is then removed from the
+        running statistics in one step (the inverse of merging two partial
+        aggregates).
+        """
+        evict_count = 0
+        chunk = 16
+        while self._window_start + evict_count < self._end:
+            start = self._window_start + evict_count
+            slots = np.arange(start, min(start + chunk, self._end)) % self.capacity
+            keep = self._timestamps[slots] >= window_start
+            if keep.any():
+                evict_count += int(np.argmax(keep))
+                break
+            evict_count += len(slots)
+            chunk *= 2
+        if not evict_count:
+            return
+
+        evicted = np.arange(self._window_start, self._window_start + evict_count) % self.capacity
+        new_window_start = self._window_start + evict_count
+        remaining = self._count - evict_count
+
+        if remaining <= 0:
+            self._count = 0
+            self._mean_t = self._mean_y = self._m2_t = self._c_ty = 0.0
+        else:
+            t = self._timestamps[evicted] - self._origin
+            y = self._temperatures[evicted]
+            mean_t, mean_y = t.mean(), y.mean()
+            m2_t = float(np.dot(t - mean_t, t - mean_t))
+            c_ty = float(np.dot(t - mean_t, y - mean_y))
+
+            rest_mean_t = (self._count * self._mean_t - evict_count * mean_t) / remaining
+            rest_mean_y = (self._count * self._mean_y - evict_count * mean_y) / remaining
+            delta_t = mean_t - rest_mean_t
+            delta_y = mean_y - rest_mean_y
+            weight = evict_count * remaining / self._count
+
+            self._m2_t = max(0.0, self._m2_t - m2_t - delta_t * delta_t * weight)
+            self._c_ty = self._c_ty - c_ty - delta_t * delta_y * weight
+            self._mean_t, self._mean_y = float(rest_mean_t), float(rest_mean_y)
+            self._count = remaining
+
+        self._window_start = new_window_start
+        while self._min_positions and self._min_positions[0] < new_window_start:
+            self._min_positions.popleft()
+        while self._max_positions and self._max_positions[0] < new_window_start:
+            self._max_positions.popleft()
+
+    def window_aggregate(self, window_start: float) -> Optional[Dict[str, Any]]:
+        """Aggregate the readings at or after ``window_start`` (epoch seconds).
+
+        The window start only moves forward; readings older than it are
+        evicted from the running statistics.
+
+        Returns:
+            Window count, sum, mean, min, max, least-squares slope in degrees
+            per second and the time span covered, or None if the window is empty
+        """
+        self._window_cutoff = max(self._window_cutoff, window_start)
+        self._evict_window_before(self._window_cutoff)
+
+        if not self._count:
+            return None
+
+        first = self._timestamps[self._window_start % self.capacity]
+        last = self._timestamps[(self._end - 1) % self.capacity]
+        return {
+            "count": self._count,
+            "sum": float(self._mean_y * self._count),
+            "mean": float(self._mean_y),
+            "min": float(self._temperatures[self._min_positions[0] % self.capacity]),
+            "max": float(self._temperatures[self._max_positions[0] % self.capacity]),
+            "slope": float(self._c_ty / self._m2_t) if self._count > 1 and self._m2_t > 0 else 0.0,
+            "span_seconds": float(last - first),
+        }
+
+    def trim_before(self, cutoff: float) -> int:
+        """Drop readings older than ``cutoff`` (epoch seconds).
+
+        Returns:
+            Number of readings removed
+        """
+        removed = 0
+        while self._start < self._end and self._timestamps[self._start % self.capacity] < cutoff:
+            if self._window_start == self._start:
+                self._evict_from_window()
+            self._start += 1
+            removed += 1
+        return removed
+
+    def _reading_at(self, position: int) -> Dict[str, Any]:
+        """Reading stored at an absolute position."""
+        slot = position % self.capacity
+        battery_level = self._battery_levels[slot]
+        signal_strength = self._signal_strengths[slot]
+        return {
+            "timestamp": datetime.fromtimestamp(self._timestamps[slot], self._tzinfo),
+            "temperature": float(self._temperatures[slot]),
+            "battery_level": None if np.isnan(battery_level) else float(battery_level),
+            "signal_strength": None if np.isnan(signal_strength) else float(signal_strength),
+            "location": self._label_values[self._locations[slot]],
+            "status": self._label_values[self._statuses[slot]],
+        }
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        """Newest reading, or None if the series is empty."""
+        return self._reading_at(self._end - 1) if self._end > self._start else None
+
+    def recent_temperatures(self, n: int) -> np.ndarray:
+        """Newest ``n`` temperatures, oldest first."""
+        n = min(n, len(self))
+        slots = np.arange(self._end - n, self._end) % self.capacity
+        return self._temperatures[slots]
+
+    def readings_between(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """Readings with ``start <= timestamp <= end`` (epoch seconds), oldest first."""
+        positions = np.arange(self._start, self._end)
+        timestamps = self._timestamps[positions % self.capacity]
+        selected = positions[(timestamps >= start) & (timestamps <= end)]
+        return [self._reading_at(int(position)) for position in selected]
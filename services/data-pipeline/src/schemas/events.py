@@ -4,7 +4,7 @@ Event schemas for Kafka messages.
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field, validator
 
@@ -84,7 +84,7 @@ class TemperatureReading(BaseModel):
 class TemperatureReadingEvent(BaseEvent):
     """Raw temperature reading event."""
 
-    event_type: EventType = Field(default=EventType.TEMPERATURE_READING, const=True)
+    event_type: Literal[EventType.TEMPERATURE_READING] = Field(default=EventType.TEMPERATURE_READING)
     data: TemperatureReading = Field(..., description="Temperature reading data")
 
 
@@ -99,7 +99,7 @@ class ValidationError(BaseModel):
 class TemperatureValidatedEvent(BaseEvent):
     """Validated temperature reading event."""
 
-    event_type: EventType = Field(default=EventType.TEMPERATURE_VALIDATED, const=True)
+    event_type: Literal[EventType.TEMPERATURE_VALIDATED] = Field(default=EventType.TEMPERATURE_VALIDATED)
     data: TemperatureReading = Field(..., description="Validated temperature reading")
     validation_status: str = Field(..., description="Validation status")
     validation_errors: List[ValidationError] = Field(default=[], description="Validation errors")
@@ -126,7 +126,7 @@ class AnomalyDetails(BaseModel):
 class AnomalyDetectedEvent(BaseEvent):
     """Anomaly detected event."""
 
-    event_type: EventType = Field(default=EventType.ANOMALY_DETECTED, const=True)
+    event_type: Literal[EventType.ANOMALY_DETECTED] = Field(default=EventType.ANOMALY_DETECTED)
     device_id: str = Field(..., description="Device identifier")
     temperature_reading: TemperatureReading = Field(..., description="Temperature reading that triggered anomaly")
     anomaly_details: AnomalyDetails = Field(..., description="Anomaly detection details")
@@ -144,7 +144,7 @@ class AlertAction(BaseModel):
 class AlertTriggeredEvent(BaseEvent):
     """Alert triggered event."""
 
-    event_type: EventType = Field(default=EventType.ALERT_TRIGGERED, const=True)
+    event_type: Literal[EventType.ALERT_TRIGGERED] = Field(default=EventType.ALERT_TRIGGERED)
     device_id: str = Field(..., description="Device identifier")
     alert_type: str = Field(..., description="Type of alert")
     severity: SeverityLevel = Field(..., description="Alert severity")
@@ -167,7 +167,7 @@ class HomeAssistantState(BaseModel):
 class HomeAssistantStateUpdateEvent(BaseEvent):
     """Home Assistant state update event."""
 
-    event_type: EventType = Field(default=EventType.HOMEASSISTANT_STATE_UPDATE, const=True)
+    event_type: Literal[EventType.HOMEASSISTANT_STATE_UPDATE] = Field(default=EventType.HOMEASSISTANT_STATE_UPDATE)
     device_id: str = Field(..., description="Device identifier")
     ha_state: HomeAssistantState = Field(..., description="Home Assistant state")
     update_status: str = Field(..., description="Update status")
@@ -207,12 +207,146 @@ EVENT_SCHEMAS = {
 }
 
 
+_DEVICE_STATUSES = {status.value: status for status in DeviceStatus}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _fast_timestamp(value: Any) -> Optional[datetime]:
+    """Timestamp of a plainly valid event, or None if full validation is needed."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _fast_temperature_reading(data: Any) -> Optional[TemperatureReading]:
+    """Build a TemperatureReading without running the model validators.
+
+    Only plainly valid readings take this path; anything unusual returns None
+    so full validation produces the usual errors.
+    """
+    if not isinstance(data, dict):
+        return None
+
+    device_id = data.get("device_id")
+    device_name = data.get("device_name")
+    temperature = data.get("temperature")
+    temperature_unit = data.get("temperature_unit", "F")
+    battery_level = data.get("battery_level")
+    signal_strength = data.get("signal_strength")
+    location = data.get("location")
+    status = _DEVICE_STATUSES.get(data.get("status", DeviceStatus.ONLINE.value))
+
+    if not (
+        isinstance(device_id, str)
+        and isinstance(device_name, str)
+        and _is_number(temperature)
+        and -100 <= temperature <= 1000
+        and isinstance(temperature_unit, str)
+        and (battery_level is None or (_is_number(battery_level) and 0 <= battery_level <= 100))
+        and (signal_strength is None or (_is_number(signal_strength) and -100 <= signal_strength <= 0))
+        and (location is None or isinstance(location, str))
+        and status is not None
+    ):
+        return None
+
+    return TemperatureReading.construct(
+        device_id=device_id,
+        device_name=device_name,
+        temperature=float(temperature),
+        temperature_unit=temperature_unit,
+        battery_level=None if battery_level is None else float(battery_level),
+        signal_strength=None if signal_strength is None else float(signal_strength),
+        location=location,
+        status=status,
+    )
+
+
+def _fast_event_fields(event_type: EventType, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Base event fields of a plainly valid event, or None if full validation is needed."""
+    event_id = data.get("event_id")
+    source = data.get("source")
+    version = data.get("version", "1.0")
+    timestamp = _fast_timestamp(data["timestamp"]) if "timestamp" in data else datetime.utcnow()
+
+    if not (
+        isinstance(event_id, str)
+        and isinstance(source, str)
+        and isinstance(version, str)
+        and timestamp is not None
+        and data.get("event_type", event_type.value) == event_type.value
+    ):
+        return None
+
+    return {
+        "event_id": event_id,
+        "event_type": event_type.value,
+        "timestamp": timestamp,
+        "source": source,
+        "version": version,
+    }
+
+
+def _fast_temperature_reading_event(data: Dict[str, Any]) -> Optional[BaseEvent]:
+    """Fast path for TemperatureReadingEvent, the highest-volume event."""
+    fields = _fast_event_fields(EventType.TEMPERATURE_READING, data)
+    reading = _fast_temperature_reading(data.get("data"))
+    if fields is None or reading is None:
+        return None
+    return TemperatureReadingEvent.construct(data=reading, **fields)
+
+
+def _fast_temperature_validated_event(data: Dict[str, Any]) -> Optional[BaseEvent]:
+    """Fast path for TemperatureValidatedEvent without validation errors."""
+    fields = _fast_event_fields(EventType.TEMPERATURE_VALIDATED, data)
+    reading = _fast_temperature_reading(data.get("data"))
+    validation_status = data.get("validation_status")
+    processing_time_ms = data.get("processing_time_ms")
+
+    if (
+        fields is None
+        or reading is None
+        or not isinstance(validation_status, str)
+        or not _is_number(processing_time_ms)
+        or data.get("validation_errors")
+    ):
+        return None
+
+    return TemperatureValidatedEvent.construct(
+        data=reading,
+        validation_status=validation_status,
+        validation_errors=[],
+        processing_time_ms=float(processing_time_ms),
+        **fields,
+    )
+
+
+# Fast paths that skip model construction for plainly valid high-volume events
+FAST_VALIDATORS = {
+    EventType.TEMPERATURE_READING: _fast_temperature_reading_event,
+    EventType.TEMPERATURE_VALIDATED: _fast_temperature_validated_event,
+}
+
+
 def validate_event(event_type: EventType, data: Dict[str, Any]) -> BaseEvent:
     """Validate an event against its schema."""
     schema_class = EVENT_SCHEMAS.get(event_type)
     if not schema_class:
         raise ValueError(f"Unknown event type: {event_type}")
 
+    fast_validator = FAST_VALIDATORS.get(event_type)
+    if fast_validator:
+        event = fast_validator(data)
+        if event is not None:
+            return event
+
     try:
         return schema_class(**data)
     except Exception as e:
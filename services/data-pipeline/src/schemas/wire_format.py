@@ -0,0 +1,230 @@
+"""
+Compact binary wire format for Kafka event payloads.
+
+Every binary payload starts with a two byte header::
+
+    version    u8   WIRE_FORMAT_VERSION
+    schema     u8   schema ID of the event type (SCHEMA_IDS)
+
+Temperature reading and validated events, the high-volume types, follow it
+with a fixed little-endian layout and their strings::
+
+    timestamp  i64  microseconds since the epoch, UTC wall clock
+    temp       f64  temperature
+    battery    f64  battery level
+    signal     f64  signal strength
+    status     u8   index into STATUS_CODES
+    flags      u8   bit 0: timestamp was timezone-aware (UTC)
+                    bits 1-3: battery level, signal strength, location are missing
+    lengths    u16 x 7  byte lengths of the strings that follow
+    strings    UTF-8: event_id, source, version, device_id, device_name,
+               temperature_unit, location
+
+Validated events append ``processing_time_ms`` (f64), the validation status
+and the validation errors as a JSON array (u32 length, 0 when there are none). Other event types
+carry their JSON document after the header.
+
+JSON payloads start with ``{`` and are still decoded, so consumers accept
+both formats while producers are switched over.
+"""
+
+import json
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple, Union
+
+from .events import BaseEvent, DeviceStatus, EventType, deserialize_event, serialize_event, validate_event
+
+WIRE_FORMAT_VERSION = 1
+
+# Schema IDs are part of the wire format; never renumber them
+SCHEMA_IDS = {
+    EventType.TEMPERATURE_READING: 1,
+    EventType.TEMPERATURE_VALIDATED: 2,
+    EventType.ANOMALY_DETECTED: 3,
+    EventType.ALERT_TRIGGERED: 4,
+    EventType.HOMEASSISTANT_STATE_UPDATE: 5,
+}
+_SCHEMA_TYPES = {schema_id: event_type for event_type, schema_id in SCHEMA_IDS.items()}
+
+STATUS_CODES = [status.value for status in DeviceStatus]
+_STATUS_INDEX = {status: code for code, status in enumerate(STATUS_CODES)}
+
+_HEADER = struct.Struct("<BB")
+_READING = struct.Struct("<qdddBB")
+_VALIDATED = struct.Struct("<d")
+_STRING_LENGTH = struct.Struct("<H")
+_READING_STRINGS = struct.Struct("<7H")
+_JSON_LENGTH = struct.Struct("<I")
+
+_FLAG_AWARE = 0x01
+_FLAG_NO_BATTERY = 0x02
+_FLAG_NO_SIGNAL = 0x04
+_FLAG_NO_LOCATION = 0x08
+
+_EPOCH = datetime(1970, 1, 1)
+_READING_TYPES = (EventType.TEMPERATURE_READING.value, EventType.TEMPERATURE_VALIDATED.value)
+
+
+def _pack_string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _STRING_LENGTH.pack(len(data)) + data
+
+
+def _unpack_string(payload: bytes, offset: int) -> Tuple[str, int]:
+    (length,) = _STRING_LENGTH.unpack_from(payload, offset)
+    offset += _STRING_LENGTH.size
+    return payload[offset : offset + length].decode("utf-8"), offset + length
+
+
+def _event_type_value(event: BaseEvent) -> str:
+    event_type = event.event_type
+    return event_type.value if isinstance(event_type, EventType) else event_type
+
+
+def _encode_reading_event(event: BaseEvent, event_type: str) -> bytes:
+    reading = event.data
+    timestamp = event.timestamp
+
+    flags = 0
+    if timestamp.tzinfo is not None:
+        flags |= _FLAG_AWARE
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    if reading.battery_level is None:
+        flags |= _FLAG_NO_BATTERY
+    if reading.signal_strength is None:
+        flags |= _FLAG_NO_SIGNAL
+    if reading.location is None:
+        flags |= _FLAG_NO_LOCATION
+
+    status = reading.status.value if isinstance(reading.status, DeviceStatus) else reading.status
+    strings = [
+        value.encode("utf-8")
+        for value in (
+            event.event_id,
+            event.source,
+            event.version,
+            reading.device_id,
+            reading.device_name,
+            reading.temperature_unit,
+            reading.location or "",
+        )
+    ]
+    parts = [
+        _HEADER.pack(WIRE_FORMAT_VERSION, SCHEMA_IDS[EventType(event_type)]),
+        _READING.pack(
+            (timestamp - _EPOCH) // timedelta(microseconds=1),
+            reading.temperature,
+            reading.battery_level or 0.0,
+            reading.signal_strength or 0.0,
+            _STATUS_INDEX[status],
+            flags,
+        ),
+        _READING_STRINGS.pack(*map(len, strings)),
+        *strings,
+    ]
+
+    if event_type == EventType.TEMPERATURE_VALIDATED.value:
+        errors = b""
+        if event.validation_errors:
+            errors = json.dumps([error.dict() for error in event.validation_errors], default=str).encode("utf-8")
+        parts += [
+            _VALIDATED.pack(event.processing_time_ms),
+            _pack_string(event.validation_status),
+            _JSON_LENGTH.pack(len(errors)),
+            errors,
+        ]
+
+    return b"".join(parts)
+
+
+def _decode_reading_event(payload: bytes, event_type: EventType) -> BaseEvent:
+    offset = _HEADER.size
+    micros, temperature, battery, signal, status, flags = _READING.unpack_from(payload, offset)
+    offset += _READING.size
+
+    lengths = _READING_STRINGS.unpack_from(payload, offset)
+    offset += _READING_STRINGS.size
+    if offset + sum(lengths) > len(payload):
+        raise ValueError("Truncated event payload")
+
+    strings: List[str] = []
+    for length in lengths:
+        strings.append(payload[offset : offset + length].decode("utf-8"))
+        offset += length
+    event_id, source, version, device_id, device_name, temperature_unit, location = strings
+
+    timestamp = _EPOCH + timedelta(microseconds=micros)
+    if flags & _FLAG_AWARE:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+    data: Dict[str, Any] = {
+        "event_id": event_id,
+        "event_type": event_type.value,
+        "timestamp": timestamp,
+        "source": source,
+        "version": version,
+        "data": {
+            "device_id": device_id,
+            "device_name": device_name,
+            "temperature": temperature,
+            "temperature_unit": temperature_unit,
+            "battery_level": None if flags & _FLAG_NO_BATTERY else battery,
+            "signal_strength": None if flags & _FLAG_NO_SIGNAL else signal,
+            "location": None if flags & _FLAG_NO_LOCATION else location,
+            "status": STATUS_CODES[status] if status < len(STATUS_CODES) else status,
+        },
+    }
+
+    if event_type == EventType.TEMPERATURE_VALIDATED:
+        (data["processing_time_ms"],) = _VALIDATED.unpack_from(payload, offset)
+        data["validation_status"], offset = _unpack_string(payload, offset + _VALIDATED.size)
+        (length,) = _JSON_LENGTH.unpack_from(payload, offset)
+        offset += _JSON_LENGTH.size
+        data["validation_errors"] = json.loads(payload[offset : offset + length]) if length else []
+
+    # Values are still range-checked by the fast-path validator
+    return validate_event(event_type, data)
+
+
+def encode_event(event: BaseEvent) -> bytes:
+    """Encode an event in the binary wire format."""
+    event_type = _event_type_value(event)
+    if event_type in _READING_TYPES:
+        return _encode_reading_event(event, event_type)
+
+    header = _HEADER.pack(WIRE_FORMAT_VERSION, SCHEMA_IDS[EventType(event_type)])
+    return header + json.dumps(serialize_event(event), default=str).encode("utf-8")
+
+
+def decode_event(payload: Union[bytes, str]) -> BaseEvent:
+    """Decode an event payload in the binary wire format or as a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If a JSON payload is malformed
+        ValueError: If a binary payload is malformed, of an unsupported
+            version or schema, or fails validation
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+
+    if payload[:1] == b"{":
+        return deserialize_event(json.loads(payload))
+
+    if len(payload) < _HEADER.size:
+        raise ValueError("Truncated event payload")
+
+    version, schema_id = _HEADER.unpack_from(payload)
+    if version != WIRE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported wire format version: {version}")
+
+    event_type = _SCHEMA_TYPES.get(schema_id)
+    if event_type is None:
+        raise ValueError(f"Unknown schema ID: {schema_id}")
+
+    try:
+        if event_type.value in _READING_TYPES:
+            return _decode_reading_event(payload, event_type)
+        return deserialize_event(json.loads(payload[_HEADER.size :]))
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Malformed {event_type.value} payload: {e}")
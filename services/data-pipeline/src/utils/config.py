@@ -3,7 +3,7 @@ Configuration management for the data pipeline service.
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 from dotenv import load_dotenv
@@ -34,6 +34,20 @@ class KafkaConfig:
     buffer_memory: int = 33554432
     retries: int = 3
     retry_backoff_ms: int = 100
+    consumer_batch_max_size: int = 500
+    consumer_batch_max_latency_ms: int = 100
+    consumer_queue_max_batches: int = 8
+    consumer_workers: int = 4
+    producer_profile: str = "default"
+    producer_send_batch_size: int = 1000
+    wire_format: str = "json"
+    retry_enabled: bool = True
+    # Delay tiers must stay below max.poll.interval.ms (5 minutes), as retry consumers wait out the delay
+    retry_delays_seconds: List[int] = field(default_factory=lambda: [5, 30, 120])
+    lag_sample_interval_seconds: int = 15
+    scaling_catch_up_target_seconds: int = 300
+    scaling_min_workers: int = 1
+    scaling_max_workers: int = 0  # 0: partition count of the consumer's largest topic
 
 
 @dataclass
@@ -63,6 +77,8 @@ class ProcessingConfig:
     processing_timeout_seconds: int = 30
     max_retries: int = 3
     retry_delay_seconds: int = 1
+    model_store_path: str = "/app/models"
+    max_resident_models: int = 1000
 
 
 @dataclass
@@ -98,6 +114,21 @@ class Config:
             batch_size=int(os.getenv("KAFKA_BATCH_SIZE", "16384")),
             linger_ms=int(os.getenv("KAFKA_LINGER_MS", "5")),
             retries=int(os.getenv("KAFKA_RETRIES", "3")),
+            consumer_batch_max_size=int(os.getenv("KAFKA_CONSUMER_BATCH_MAX_SIZE", "500")),
+            consumer_batch_max_latency_ms=int(os.getenv("KAFKA_CONSUMER_BATCH_MAX_LATENCY_MS", "100")),
+            consumer_queue_max_batches=int(os.getenv("KAFKA_CONSUMER_QUEUE_MAX_BATCHES", "8")),
+            consumer_workers=int(os.getenv("KAFKA_CONSUMER_WORKERS", "4")),
+            producer_profile=os.getenv("KAFKA_PRODUCER_PROFILE", "default"),
+            producer_send_batch_size=int(os.getenv("KAFKA_PRODUCER_SEND_BATCH_SIZE", "1000")),
+            wire_format=os.getenv("KAFKA_WIRE_FORMAT", "json"),
+            retry_enabled=os.getenv("KAFKA_RETRY_ENABLED", "true").lower() == "true",
+            retry_delays_seconds=[
+                int(delay) for delay in os.getenv("KAFKA_RETRY_DELAYS_SECONDS", "5,30,120").split(",") if delay.strip()
+            ],
+            lag_sample_interval_seconds=int(os.getenv("KAFKA_LAG_SAMPLE_INTERVAL_SECONDS", "15")),
+            scaling_catch_up_target_seconds=int(os.getenv("KAFKA_SCALING_CATCH_UP_TARGET_SECONDS", "300")),
+            scaling_min_workers=int(os.getenv("KAFKA_SCALING_MIN_WORKERS", "1")),
+            scaling_max_workers=int(os.getenv("KAFKA_SCALING_MAX_WORKERS", "0")),
         )
 
         self.redis_config = RedisConfig(
@@ -121,6 +152,8 @@ class Config:
             processing_timeout_seconds=int(os.getenv("PROCESSING_TIMEOUT_SECONDS", "30")),
             max_retries=int(os.getenv("MAX_RETRIES", "3")),
             retry_delay_seconds=int(os.getenv("RETRY_DELAY_SECONDS", "1")),
+            model_store_path=os.getenv("MODEL_STORE_PATH", "/app/models"),
+            max_resident_models=int(os.getenv("MAX_RESIDENT_MODELS", "1000")),
         )
 
         self.monitoring_config = MonitoringConfig(
@@ -204,9 +237,8 @@ class Config:
             "enable.auto.commit": self.kafka_config.enable_auto_commit,
             "auto.commit.interval.ms": self.kafka_config.auto_commit_interval_ms,
             "session.timeout.ms": self.kafka_config.session_timeout_ms,
-            "max.poll.records": self.kafka_config.max_poll_records,
             "fetch.min.bytes": self.kafka_config.fetch_min_bytes,
-            "fetch.max.wait.ms": self.kafka_config.fetch_max_wait_ms,
+            "fetch.wait.max.ms": self.kafka_config.fetch_max_wait_ms,
             "enable.partition.eof": False,
         }
 
@@ -8,7 +8,17 @@ from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import structlog
-from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, Info, Summary, generate_latest
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    Info,
+    Summary,
+    generate_latest,
+)
 
 logger = structlog.get_logger()
 
@@ -17,7 +27,8 @@ class MetricsCollector:
     """Centralized metrics collection and monitoring."""
 
     def __init__(self, registry: Optional[CollectorRegistry] = None):
-        self.registry = registry
+        # Metrics created with registry=None are not registered anywhere, so default to the global registry
+        self.registry = registry if registry is not None else REGISTRY
         self.start_time = time.time()
 
         # Application metrics
@@ -77,6 +88,34 @@ class MetricsCollector:
             registry=self.registry,
         )
 
+        self.kafka_consumer_processing_rate = Gauge(
+            "grill_stats_kafka_consumer_processing_rate",
+            "Messages committed per second by a consumer group",
+            ["consumer_group"],
+            registry=self.registry,
+        )
+
+        self.kafka_consumer_incoming_rate = Gauge(
+            "grill_stats_kafka_consumer_incoming_rate",
+            "Messages produced per second to the topics of a consumer group",
+            ["consumer_group"],
+            registry=self.registry,
+        )
+
+        self.kafka_consumer_catch_up_seconds = Gauge(
+            "grill_stats_kafka_consumer_catch_up_seconds",
+            "Estimated time for a consumer group to consume its lag (+Inf if it is falling behind)",
+            ["consumer_group"],
+            registry=self.registry,
+        )
+
+        self.kafka_recommended_workers = Gauge(
+            "grill_stats_kafka_recommended_workers",
+            "Recommended number of pipeline instances for a consumer group",
+            ["consumer_group"],
+            registry=self.registry,
+        )
+
         # Processing metrics
         self.processing_duration = Histogram(
             "grill_stats_processing_duration_seconds",
@@ -261,6 +300,22 @@ class MetricsCollector:
         """Record Kafka consumption duration."""
         self.kafka_consume_duration.labels(topic=topic, consumer_group=consumer_group).observe(duration)
 
+    def record_consumer_lag(self, topic: str, partition: int, consumer_group: str, lag: int):
+        """Record the lag of a consumer group on a partition."""
+        self.kafka_consumer_lag.labels(topic=topic, partition=str(partition), consumer_group=consumer_group).set(lag)
+
+    def record_consumer_throughput(
+        self, consumer_group: str, processing_rate: float, incoming_rate: float, catch_up_seconds: float
+    ):
+        """Record processing and incoming message rates and time to catch up of a consumer group."""
+        self.kafka_consumer_processing_rate.labels(consumer_group=consumer_group).set(processing_rate)
+        self.kafka_consumer_incoming_rate.labels(consumer_group=consumer_group).set(incoming_rate)
+        self.kafka_consumer_catch_up_seconds.labels(consumer_group=consumer_group).set(catch_up_seconds)
+
+    def record_recommended_workers(self, consumer_group: str, workers: int):
+        """Record the recommended number of pipeline instances for a consumer group."""
+        self.kafka_recommended_workers.labels(consumer_group=consumer_group).set(workers)
+
     def record_processing_duration(self, processor: str, event_type: str, duration: float):
         """Record event processing duration."""
         self.processing_duration.labels(processor=processor, event_type=event_type).observe(duration)
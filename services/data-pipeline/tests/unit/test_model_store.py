@@ -0,0 +1,33 @@
+import pytest
+from src.processors.model_store import ModelStore
+
+
+@pytest.mark.parametrize("device_id", ["", ".", ".."])
+def test_rejects_device_ids_outside_store_root(tmp_path, device_id):
+    """Test that IDs resolving to the store root or its parent are rejected."""
+    root = tmp_path / "models"
+    sentinel = tmp_path / "keep.txt"
+    sentinel.write_text("keep")
+    store = ModelStore(str(root))
+
+    with pytest.raises(ValueError):
+        store.save(device_id, {"mean": 0.0}, {})
+    with pytest.raises(ValueError):
+        store.delete(device_id)
+
+    assert store.current_version(device_id) is None
+    assert sentinel.read_text() == "keep"
+
+
+def test_device_ids_with_separators_stay_under_root(tmp_path):
+    """Test that path separators in a device ID are quoted into one directory."""
+    store = ModelStore(str(tmp_path / "models"))
+
+    version = store.save("../grill/1", {"mean": 0.0}, {})
+
+    assert version == 1
+    assert store.list_devices() == {"../grill/1"}
+    assert [path.name for path in (tmp_path / "models").iterdir()] == ["..%2Fgrill%2F1"]
+
+    store.delete("../grill/1")
+    assert store.list_devices() == set()
@@ -0,0 +1,84 @@
+import json
+import struct
+from datetime import datetime, timezone
+
+import pytest
+from src.processors.series_codec import SERIES_FORMAT_VERSION, decode_reading, encode_reading
+from src.schemas.events import DeviceStatus
+
+
+def test_round_trip_aware_timestamp():
+    """Test that an aware reading decodes to the same UTC instant and values."""
+    timestamp = datetime(2025, 7, 4, 12, 30, 45, 123456, tzinfo=timezone.utc)
+    member = encode_reading(timestamp, 225.5, 85.0, -60.0, "backyard", DeviceStatus.ONLINE)
+
+    assert decode_reading(member) == {
+        "timestamp": timestamp.isoformat(),
+        "temperature": 225.5,
+        "battery_level": 85.0,
+        "signal_strength": -60.0,
+        "location": "backyard",
+        "status": "online",
+    }
+
+
+def test_round_trip_naive_timestamp():
+    """Test that a naive timestamp stays naive."""
+    timestamp = datetime(2025, 7, 4, 12, 30, 45)
+
+    reading = decode_reading(encode_reading(timestamp, 200.0, status="offline"))
+
+    assert reading["timestamp"] == "2025-07-04T12:30:45"
+    assert reading["status"] == "offline"
+
+
+def test_round_trip_missing_optional_fields():
+    """Test that missing battery, signal, location and status decode as None."""
+    reading = decode_reading(encode_reading(datetime(2025, 7, 4, tzinfo=timezone.utc), 180.25))
+
+    assert reading["temperature"] == 180.25
+    assert reading["battery_level"] is None
+    assert reading["signal_strength"] is None
+    assert reading["location"] is None
+    assert reading["status"] is None
+
+
+def test_long_location_is_truncated_on_character_boundary():
+    """Test that a location cut at 255 bytes never splits a multi-byte character."""
+    location = "ab" + "é" * 200  # 402 bytes; byte 255 falls inside an "é"
+
+    member = encode_reading(datetime(2025, 7, 4, tzinfo=timezone.utc), 200.0, location=location)
+    decoded = decode_reading(member)["location"]
+
+    assert decoded == location[: len(decoded)]
+    assert len(decoded.encode("utf-8")) == 254
+
+
+def test_decode_legacy_json_member():
+    """Test that members written as JSON documents before the binary format still decode."""
+    legacy = {
+        "timestamp": "2025-07-04T12:30:45+00:00",
+        "temperature": 225.0,
+        "battery_level": 80,
+        "signal_strength": None,
+        "location": "patio",
+        "status": "online",
+    }
+
+    assert decode_reading(json.dumps(legacy)) == legacy
+    assert decode_reading(json.dumps(legacy).encode("utf-8")) == legacy
+
+
+def test_decode_rejects_unknown_version():
+    """Test that members from a newer format version are rejected."""
+    member = bytearray(encode_reading(datetime(2025, 7, 4), 200.0))
+    member[0] = SERIES_FORMAT_VERSION + 1
+
+    with pytest.raises(ValueError, match="Unsupported series member version"):
+        decode_reading(bytes(member))
+
+
+def test_decode_rejects_truncated_member():
+    """Test that a member shorter than the header is rejected."""
+    with pytest.raises(struct.error):
+        decode_reading(encode_reading(datetime(2025, 7, 4), 200.0)[:10])
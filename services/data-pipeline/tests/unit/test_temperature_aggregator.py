@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from redis.connection import Encoder
+from src.processors.temperature_aggregator import TemperatureAggregationService
+from src.schemas.events import TemperatureReading, TemperatureReadingEvent
+from src.utils.config import RedisConfig
+
+
+class RecordingPipeline:
+    """Pipeline stand-in that encodes values the way redis-py does."""
+
+    def __init__(self):
+        self.encoder = Encoder("utf-8", "strict", False)
+        self.commands = []
+
+    def hset(self, key, mapping):
+        for field, value in mapping.items():
+            self.encoder.encode(field)
+            self.encoder.encode(value)
+        self.commands.append(("hset", key, mapping))
+
+    def zadd(self, key, members):
+        self.commands.append(("zadd", key, members))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        return [True] * len(self.commands)
+
+
+def _event(device_id, timestamp, location):
+    return TemperatureReadingEvent(
+        event_id=f"{device_id}-{timestamp.timestamp()}",
+        source="test",
+        timestamp=timestamp,
+        data=TemperatureReading(
+            device_id=device_id,
+            device_name=device_id,
+            temperature=225.0,
+            battery_level=80.0,
+            signal_strength=None,
+            location=location,
+        ),
+    )
+
+
+def test_write_readings_to_redis_skips_none_fields():
+    """Test that a reading without a location does not fail the batch pipeline."""
+    pipe = RecordingPipeline()
+    now = datetime(2025, 7, 4, 12, 0, tzinfo=timezone.utc)
+    events = [
+        _event("device_a", now, None),
+        _event("device_b", now + timedelta(seconds=1), "backyard"),
+    ]
+
+    async def write():
+        # The constructor schedules the Redis connection, so it needs a running loop
+        with patch.object(TemperatureAggregationService, "_initialize_redis", AsyncMock()):
+            service = TemperatureAggregationService(MagicMock(), RedisConfig(host="localhost", port=6379))
+        service.redis_client = MagicMock()
+        service.redis_client.pipeline.return_value = pipe
+        await service._write_readings_to_redis(events)
+        return service
+
+    service = asyncio.run(write())
+
+    hsets = {key: mapping for command, key, mapping in (c for c in pipe.commands if c[0] == "hset")}
+    assert "location" not in hsets["temperature:device_a:latest"]
+    assert "signal_strength" not in hsets["temperature:device_a:latest"]
+    assert hsets["temperature:device_b:latest"]["location"] == "backyard"
+    assert {key for command, key, _ in pipe.commands if command == "zadd"} == {
+        "temperature:device_a:series",
+        "temperature:device_b:series",
+    }
+    assert service.redis_write_stats["pipelines"] == 1
+    assert service.redis_write_stats["readings"] == 2
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from src.processors.time_series import DeviceTimeSeries
+
+
+def _reference_aggregate(timestamps, temperatures, window_start):
+    selected = [(t, y) for t, y in zip(timestamps, temperatures) if t >= window_start]
+    t = np.array([t for t, _ in selected])
+    y = np.array([y for _, y in selected])
+    slope = float(np.polyfit(t - t[0], y, 1)[0]) if len(t) > 1 else 0.0
+    return {"count": len(y), "mean": y.mean(), "min": y.min(), "max": y.max(), "slope": slope}
+
+
+@pytest.mark.parametrize("evict_per_cycle", [1, 15, 16, 17, 100])
+def test_window_aggregate_matches_full_rescan(evict_per_cycle):
+    """Test that incremental eviction agrees with rescanning the window."""
+    series = DeviceTimeSeries(capacity=1000)
+    rng = np.random.default_rng(7)
+    start = datetime(2025, 7, 4, 12, 0, tzinfo=timezone.utc)
+    window = 300
+
+    timestamps, temperatures = [], []
+    for i in range(900):
+        timestamp = start + timedelta(seconds=i)
+        temperature = 200 + 0.05 * i + float(rng.normal(0, 1))
+        series.append(timestamp, temperature)
+        timestamps.append(timestamp.timestamp())
+        temperatures.append(temperature)
+
+        if i >= window and i % evict_per_cycle == 0:
+            window_start = timestamps[-1] - window
+            aggregate = series.window_aggregate(window_start)
+            expected = _reference_aggregate(timestamps, temperatures, window_start)
+
+            assert aggregate["count"] == expected["count"]
+            assert aggregate["mean"] == pytest.approx(expected["mean"])
+            assert aggregate["min"] == pytest.approx(expected["min"])
+            assert aggregate["max"] == pytest.approx(expected["max"])
+            assert aggregate["slope"] == pytest.approx(expected["slope"], rel=1e-6)
+
+
+def test_window_aggregate_evicts_everything_before_window():
+    """Test that a window past the newest reading is empty."""
+    series = DeviceTimeSeries(capacity=100)
+    start = datetime(2025, 7, 4, 12, 0, tzinfo=timezone.utc)
+    for i in range(50):
+        series.append(start + timedelta(seconds=i), 225.0)
+
+    assert series.window_aggregate((start + timedelta(seconds=60)).timestamp()) is None
+    assert len(series) == 50
+
+
+def test_late_reading_before_window_is_excluded():
+    """Test that a reading arriving after newer ones, older than the window, is not aggregated."""
+    series = DeviceTimeSeries(capacity=100)
+    series.append(datetime.fromtimestamp(1000, timezone.utc), 200.0)
+    series.append(datetime.fromtimestamp(2000, timezone.utc), 210.0)
+    series.append(datetime.fromtimestamp(500, timezone.utc), 999.0)
+
+    aggregate = series.window_aggregate(1500)
+
+    assert aggregate["count"] == 1
+    assert aggregate["max"] == 210.0
+    assert aggregate["span_seconds"] == 0.0
+    assert [r["timestamp"].timestamp() for r in series.readings_between(0, 3000)] == [500, 1000, 2000]
+
+
+def test_late_readings_match_full_rescan():
+    """Test that out-of-order arrivals agree with rescanning the window."""
+    series = DeviceTimeSeries(capacity=1000)
+    rng = np.random.default_rng(11)
+    window = 120
+
+    timestamps, temperatures = [], []
+    for i in range(600):
+        # Every fifth reading is delivered up to three minutes late
+        timestamp = 1_750_000_000.0 + i - (float(rng.integers(0, 180)) if i % 5 == 0 else 0.0)
+        temperature = 200 + 0.05 * i + float(rng.normal(0, 1))
+        series.append(datetime.fromtimestamp(timestamp, timezone.utc), temperature)
+        timestamps.append(timestamp)
+        temperatures.append(temperature)
+
+        if i >= window and i % 7 == 0:
+            window_start = 1_750_000_000.0 + i - window
+            aggregate = series.window_aggregate(window_start)
+            expected = _reference_aggregate(*zip(*sorted(zip(timestamps, temperatures))), window_start)
+
+            assert aggregate["count"] == expected["count"]
+            assert aggregate["mean"] == pytest.approx(expected["mean"])
+            assert aggregate["min"] == pytest.approx(expected["min"])
+            assert aggregate["max"] == pytest.approx(expected["max"])
+            assert aggregate["slope"] == pytest.approx(expected["slope"], rel=1e-6)
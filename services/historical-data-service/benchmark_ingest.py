@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Ingest benchmark for the historical data service.
+Compares the row-by-row INSERT loop with the COPY-based bulk ingest path
+and reports rows/sec for each. Requires a running TimescaleDB.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from database.timescale_manager import READING_COLUMNS, TimescaleManager
+from utils.data_seeder import TemperatureDataSeeder
+
+# Load environment variables
+load_dotenv()
+
+BENCHMARK_DEVICE_PREFIX = "benchmark_device_"
+
+
+def insert_row_by_row(timescale_manager, readings):
+    """Reference implementation: one INSERT per reading (the previous batch path)."""
+    rows, _ = TimescaleManager._prepare_reading_rows(readings)
+    placeholders = ", ".join(["%s"] * len(READING_COLUMNS))
+    query = f"INSERT INTO temperature_readings ({', '.join(READING_COLUMNS)}) VALUES ({placeholders})"
+
+    with timescale_manager.connection() as conn, conn.cursor() as cursor:
+        for _, row in rows:
+            cursor.execute(query, row)
+    return len(rows)
+
+
+def generate_readings(seeder, device_count, probe_count, rows_per_probe):
+    """Generate benchmark readings spread across devices and probes."""
+    probe_ids = [f"probe_{n}" for n in range(1, probe_count + 1)]
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(seconds=rows_per_probe - 1)
+
+    readings = []
+    for n in range(device_count):
+        readings.extend(
+            seeder.generate_sample_temperature_data(
+                device_id=f"{BENCHMARK_DEVICE_PREFIX}{n:04d}",
+                probe_ids=probe_ids,
+                start_time=start_time,
+                end_time=end_time,
+                interval_minutes=1 / 60,
+            )
+        )
+    return readings
+
+
+def cleanup(timescale_manager):
+    """Remove rows written by the benchmark."""
+    with timescale_manager.connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM temperature_readings WHERE device_id LIKE %s",
+            (f"{BENCHMARK_DEVICE_PREFIX}%",),
+        )
+
+
+def run(label, func, readings):
+    """Time a single ingest run and print rows/sec."""
+    started = time.perf_counter()
+    stored = func(readings)
+    elapsed = time.perf_counter() - started
+    rate = stored / elapsed if elapsed else 0.0
+    print(f"{label:<14} {stored:>9} rows  {elapsed:>8.3f}s  {rate:>12,.0f} rows/sec")
+    return rate
+
+
+def main():
+    """Run the ingest benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--probes", type=int, default=4)
+    parser.add_argument("--rows-per-probe", type=int, default=600)
+    args = parser.parse_args()
+
+    try:
+        timescale_manager = TimescaleManager(
+            host=os.getenv("TIMESCALEDB_HOST", "localhost"),
+            port=int(os.getenv("TIMESCALEDB_PORT", "5432")),
+            database=os.getenv("TIMESCALEDB_DATABASE", "grill_monitoring"),
+            username=os.getenv("TIMESCALEDB_USERNAME", "grill_monitor"),
+            password=os.getenv("TIMESCALEDB_PASSWORD", "testpass"),
+        )
+        timescale_manager.init_db()
+    except Exception as e:
+        print(f"❌ Failed to connect to TimescaleDB: {e}")
+        return 1
+
+    readings = generate_readings(
+        TemperatureDataSeeder(timescale_manager),
+        args.devices,
+        args.probes,
+        args.rows_per_probe,
+    )
+    print(f"📊 Benchmarking ingest of {len(readings)} readings\n")
+
+    try:
+        cleanup(timescale_manager)
+        loop_rate = run("row-by-row", lambda r: insert_row_by_row(timescale_manager, r), readings)
+        cleanup(timescale_manager)
+        copy_rate = run(
+            "COPY bulk",
+            lambda r: timescale_manager.bulk_store_temperature_readings(r, refresh_rollups=False)["stored_count"],
+            readings,
+        )
+    finally:
+        cleanup(timescale_manager)
+
+    if loop_rate:
+        print(f"\n⚡ Speedup: {copy_rate / loop_rate:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Query-shape benchmark for the historical data service.
+Seeds temperature_readings (10M+ rows by default) with the data seeder and
+reports p50/p99 latency of the queries behind each history and statistics
+route, so index changes can be compared on the same data. Seed once with
+--keep, then rerun with --skip-seed after changing indexes.
+Requires a running TimescaleDB initialized with database-init/timescale-init.sql.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from database.query_planner import ROLLUP_TIERS, encode_history_cursor
+from database.timescale_manager import TimescaleManager
+from utils.data_seeder import TemperatureDataSeeder
+
+# Load environment variables
+load_dotenv()
+
+BENCHMARK_DEVICE_PREFIX = "benchmark_query_device_"
+BENCHMARK_GRILL_PREFIX = "benchmark_query_grill_"
+
+# Readings buffered before each bulk COPY while seeding
+SEED_BATCH_SIZE = 50000
+
+
+def seed(timescale_manager, device_count, probe_count, grill_count, days, interval_seconds):
+    """Bulk-ingest benchmark readings and return the seeded range."""
+    seeder = TemperatureDataSeeder(timescale_manager)
+    probe_ids = [f"probe_{n}" for n in range(1, probe_count + 1)]
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(days=days)
+
+    expected = device_count * probe_count * days * 86400 // interval_seconds
+    print(f"🌱 Seeding ~{expected:,} readings ({device_count} devices x {probe_count} probes, {days} days)...")
+
+    started = time.perf_counter()
+    stored = 0
+    readings = []
+    for day in range(days):
+        day_start = start_time + timedelta(days=day)
+        day_end = min(end_time, day_start + timedelta(days=1) - timedelta(seconds=interval_seconds))
+        for n in range(device_count):
+            readings.extend(
+                seeder.generate_sample_temperature_data(
+                    device_id=f"{BENCHMARK_DEVICE_PREFIX}{n:04d}",
+                    probe_ids=probe_ids,
+                    start_time=day_start,
+                    end_time=day_end,
+                    interval_minutes=interval_seconds / 60,
+                    grill_id=f"{BENCHMARK_GRILL_PREFIX}{n % grill_count:04d}",
+                )
+            )
+            if len(readings) >= SEED_BATCH_SIZE:
+                stored += timescale_manager.bulk_store_temperature_readings(readings, refresh_rollups=False)["stored_count"]
+                readings = []
+        print(f"   day {day + 1}/{days}: {stored:,} readings stored")
+
+    if readings:
+        stored += timescale_manager.bulk_store_temperature_readings(readings, refresh_rollups=False)["stored_count"]
+
+    print(f"📥 Seeded {stored:,} readings in {time.perf_counter() - started:.0f}s")
+    return start_time, end_time
+
+
+def prepare(timescale_manager, start_time, end_time):
+    """Refresh the rollup tiers over the seeded range and update planner statistics."""
+    with timescale_manager.connection(statement_timeout_ms=0) as conn, conn.cursor() as cursor:
+        for tier in reversed(ROLLUP_TIERS):
+            if tier.view in timescale_manager._available_rollups():
+                cursor.execute(
+                    "CALL refresh_continuous_aggregate(%s, %s, %s)",
+                    (tier.view, start_time - tier.width, end_time),
+                )
+        cursor.execute("ANALYZE temperature_readings")
+
+
+def cleanup(timescale_manager):
+    """Remove rows written by the benchmark."""
+    with timescale_manager.connection(statement_timeout_ms=0) as conn, conn.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM temperature_readings WHERE device_id LIKE %s",
+            (f"{BENCHMARK_DEVICE_PREFIX}%",),
+        )
+        print(f"🧹 Removed {cursor.rowcount:,} benchmark readings")
+
+
+def list_indexes(timescale_manager):
+    """Index definitions on temperature_readings."""
+    with timescale_manager.connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = 'temperature_readings' ORDER BY indexname",
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def query_shapes(timescale_manager, device_count, probe_count, grill_count):
+    """Benchmarked queries, named after the route and parameters they serve.
+
+    Each entry maps a name to a function of a random generator that runs one
+    query with a random device, probe or grill, so the timings are not served
+    from one hot index page.
+    """
+
+    def device(rng):
+        return f"{BENCHMARK_DEVICE_PREFIX}{rng.randrange(device_count):04d}"
+
+    def probe(rng):
+        return f"probe_{rng.randint(1, probe_count)}"
+
+    def grill(rng):
+        return f"{BENCHMARK_GRILL_PREFIX}{rng.randrange(grill_count):04d}"
+
+    def last(**delta):
+        end_time = datetime.utcnow()
+        return {"start_time": end_time - timedelta(**delta), "end_time": end_time}
+
+    def deep_page(rng):
+        # The page a week back, as reached by following next_cursor from the newest reading
+        end_time = datetime.utcnow()
+        device_id, probe_id = device(rng), probe(rng)
+        page_cursor = encode_history_cursor(
+            {"time": end_time - timedelta(days=7), "device_id": device_id, "probe_id": probe_id}
+        )
+        return timescale_manager.get_temperature_history(
+            device_id=device_id,
+            probe_id=probe_id,
+            start_time=end_time - timedelta(days=30),
+            end_time=end_time,
+            limit=1000,
+            page_cursor=page_cursor,
+        )
+
+    history = timescale_manager.get_temperature_history
+    stats = timescale_manager.get_temperature_statistics
+    return {
+        "history device+probe 24h": lambda rng: history(device_id=device(rng), probe_id=probe(rng), **last(hours=24)),
+        "history device 24h limit 1000": lambda rng: history(device_id=device(rng), **last(hours=24), limit=1000),
+        "history grill 24h limit 1000": lambda rng: history(grill_id=grill(rng), **last(hours=24), limit=1000),
+        "history device avg 1h 7d": lambda rng: history(
+            device_id=device(rng), aggregation="avg", interval="1h", **last(days=7)
+        ),
+        "history device+probe page @7d": deep_page,
+        "device history avg 1m 24h": lambda rng: history(
+            device_id=device(rng), aggregation="avg", interval="1m", **last(hours=24), limit=1000
+        ),
+        "statistics device+probe 24h": lambda rng: stats(device_id=device(rng), probe_id=probe(rng), **last(hours=24)),
+        "statistics grill 24h": lambda rng: stats(grill_id=grill(rng), **last(hours=24)),
+    }
+
+
+def percentile(latencies, fraction):
+    """Nearest-rank percentile of a list of latencies."""
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    """Run the query-shape benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=60)
+    parser.add_argument("--probes", type=int, default=4)
+    parser.add_argument("--grills", type=int, default=20)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--reading-interval-seconds", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the queried devices")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse readings kept by an earlier --keep run")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded readings for further runs")
+    args = parser.parse_args()
+
+    try:
+        timescale_manager = TimescaleManager(
+            host=os.getenv("TIMESCALEDB_HOST", "localhost"),
+            port=int(os.getenv("TIMESCALEDB_PORT", "5432")),
+            database=os.getenv("TIMESCALEDB_DATABASE", "grill_monitoring"),
+            username=os.getenv("TIMESCALEDB_USERNAME", "grill_monitor"),
+            password=os.getenv("TIMESCALEDB_PASSWORD", "testpass"),
+        )
+        timescale_manager.init_db()
+    except Exception as e:
+        print(f"❌ Failed to connect to TimescaleDB: {e}")
+        return 1
+
+    try:
+        if not args.skip_seed:
+            cleanup(timescale_manager)
+            start_time, end_time = seed(
+                timescale_manager,
+                args.devices,
+                args.probes,
+                args.grills,
+                args.days,
+                args.reading_interval_seconds,
+            )
+            prepare(timescale_manager, start_time, end_time)
+
+        print("\n🗂️  Indexes on temperature_readings:")
+        for indexdef in list_indexes(timescale_manager):
+            print(f"   {indexdef}")
+
+        print(f"\n📊 {args.repeat} runs per query shape (ms)\n")
+        print(f"{'query shape':<34} {'rows':>7} {'p50':>9} {'p99':>9} {'max':>9}")
+
+        shapes = query_shapes(timescale_manager, args.devices, args.probes, args.grills)
+        for name, run in shapes.items():
+            rng = random.Random(args.seed)
+            latencies = []
+            rows = 0
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                result = run(rng)
+                latencies.append((time.perf_counter() - started) * 1000)
+                rows += len(result) if isinstance(result, list) else result.get("reading_count") or 0
+
+            print(
+                f"{name:<34} {rows / args.repeat:>7.0f} {statistics.median(latencies):>9.2f} "
+                f"{percentile(latencies, 0.99):>9.2f} {max(latencies):>9.2f}"
+            )
+    finally:
+        if not args.keep:
+            cleanup(timescale_manager)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
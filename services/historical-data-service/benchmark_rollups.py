@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+History query benchmark for the historical data service.
+Seeds 30 days of readings, materializes the rollup tiers and compares
+30-day aggregated history queries over raw readings (time_bucket on
+temperature_readings) with the same queries routed to the rollup tiers.
+Requires a running TimescaleDB initialized with database-init/timescale-init.sql.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "src"))
+
+from database.query_planner import ROLLUP_TIERS, choose_rollup
+from database.timescale_manager import TimescaleManager
+from utils.data_seeder import TemperatureDataSeeder
+
+# Load environment variables
+load_dotenv()
+
+BENCHMARK_DEVICE_PREFIX = "benchmark_rollup_device_"
+
+QUERY_SHAPES = (
+    ("avg", "15m"),
+    ("avg", "1h"),
+    ("max", "6h"),
+    ("avg", "1d"),
+)
+
+
+def seed(timescale_manager, device_count, probe_count, days, interval_seconds):
+    """Bulk-ingest benchmark readings day by day and return the seeded range."""
+    seeder = TemperatureDataSeeder(timescale_manager)
+    probe_ids = [f"probe_{n}" for n in range(1, probe_count + 1)]
+    end_time = datetime.utcnow()
+    start_time = end_time - timedelta(days=days)
+
+    stored = 0
+    for day in range(days):
+        day_start = start_time + timedelta(days=day)
+        day_end = min(end_time, day_start + timedelta(days=1) - timedelta(seconds=interval_seconds))
+        readings = []
+        for n in range(device_count):
+            readings.extend(
+                seeder.generate_sample_temperature_data(
+                    device_id=f"{BENCHMARK_DEVICE_PREFIX}{n:04d}",
+                    probe_ids=probe_ids,
+                    start_time=day_start,
+                    end_time=day_end,
+                    interval_minutes=interval_seconds / 60,
+                )
+            )
+        stored += timescale_manager.bulk_store_temperature_readings(readings, refresh_rollups=False)["stored_count"]
+
+    print(f"📥 Seeded {stored} readings over {days} days")
+    return start_time, end_time
+
+
+def refresh_rollups(timescale_manager, start_time, end_time):
+    """Materialize the seeded range in every rollup tier.
+
+    The refresh policies only cover recent buckets, so backfilled history
+    has to be refreshed explicitly.
+    """
+    with timescale_manager.connection(statement_timeout_ms=0) as conn, conn.cursor() as cursor:
+        for tier in reversed(ROLLUP_TIERS):
+            started = time.perf_counter()
+            cursor.execute(
+                "CALL refresh_continuous_aggregate(%s, %s, %s)",
+                (tier.view, start_time - tier.width, end_time),
+            )
+            print(f"🔄 Refreshed {tier.view:<20} {time.perf_counter() - started:>8.2f}s")
+
+
+def cleanup(timescale_manager, start_time, end_time):
+    """Remove rows written by the benchmark and refresh the rollups over them."""
+    with timescale_manager.connection(statement_timeout_ms=0) as conn, conn.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM temperature_readings WHERE device_id LIKE %s",
+            (f"{BENCHMARK_DEVICE_PREFIX}%",),
+        )
+    if start_time:
+        refresh_rollups(timescale_manager, start_time, end_time)
+
+
+def time_query(timescale_manager, repeat, **query):
+    """Run a history query ``repeat`` times and return (rows, latencies in ms)."""
+    latencies = []
+    rows = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = timescale_manager.get_temperature_history(**query)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return rows, latencies
+
+
+def count_mismatches(raw_rows, rollup_rows):
+    """Number of rows that differ between the raw and rollup results, including missing rows."""
+
+    def key(row):
+        return row["time"], row["device_id"], row.get("probe_id"), row.get("grill_id"), row.get("unit")
+
+    def values(row):
+        return [row.get(column) for column in ("temperature", "battery_level", "signal_strength")]
+
+    rollup_by_key = {key(row): row for row in rollup_rows}
+    mismatches = len(set(rollup_by_key) - {key(row) for row in raw_rows})
+    for row in raw_rows:
+        other = rollup_by_key.get(key(row))
+        if other is None:
+            mismatches += 1
+            continue
+        for expected, actual in zip(values(row), values(other)):
+            if (expected is None) != (actual is None) or (expected is not None and abs(expected - actual) > 1e-6):
+                mismatches += 1
+                break
+    return mismatches
+
+
+def main():
+    """Run the rollup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--probes", type=int, default=4)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--reading-interval-seconds", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded readings for further runs")
+    args = parser.parse_args()
+
+    try:
+        timescale_manager = TimescaleManager(
+            host=os.getenv("TIMESCALEDB_HOST", "localhost"),
+            port=int(os.getenv("TIMESCALEDB_PORT", "5432")),
+            database=os.getenv("TIMESCALEDB_DATABASE", "grill_monitoring"),
+            username=os.getenv("TIMESCALEDB_USERNAME", "grill_monitor"),
+            password=os.getenv("TIMESCALEDB_PASSWORD", "testpass"),
+        )
+        timescale_manager.init_db()
+    except Exception as e:
+        print(f"❌ Failed to connect to TimescaleDB: {e}")
+        return 1
+
+    available = timescale_manager._available_rollups()
+    if not available:
+        print("❌ No rollup tiers found; apply database-init/timescale-init.sql first")
+        return 1
+
+    start_time = end_time = None
+    try:
+        cleanup(timescale_manager, None, None)
+        start_time, end_time = seed(timescale_manager, args.devices, args.probes, args.days, args.reading_interval_seconds)
+        refresh_rollups(timescale_manager, start_time, end_time)
+
+        # Query the range up to now, so the un-materialized tail is read from raw readings
+        query_start = datetime.utcnow() - timedelta(days=args.days)
+        query_end = datetime.utcnow()
+        print(f"\n📊 {args.days}-day history of one device, {args.repeat} runs each (median / max ms)\n")
+        print(f"{'query':<12} {'tier':<20} {'rows':>6} {'raw':>17} {'rollup':>17} {'speedup':>8}")
+
+        for aggregation, interval in QUERY_SHAPES:
+            query = {
+                "device_id": f"{BENCHMARK_DEVICE_PREFIX}0000",
+                "start_time": query_start,
+                "end_time": query_end,
+                "aggregation": aggregation,
+                "interval": interval,
+            }
+            tier = choose_rollup(interval, query_start, query_end, available)
+            raw_rows, raw_ms = time_query(timescale_manager, args.repeat, use_rollups=False, **query)
+            rollup_rows, rollup_ms = time_query(timescale_manager, args.repeat, use_rollups=True, **query)
+
+            raw_median = statistics.median(raw_ms)
+            rollup_median = statistics.median(rollup_ms)
+            mismatches = count_mismatches(raw_rows, rollup_rows)
+            mismatch = f"  ⚠️ {mismatches} rows differ" if mismatches else ""
+            print(
+                f"{aggregation + ' ' + interval:<12} {tier.view if tier else 'raw':<20} {len(raw_rows):>6} "
+                f"{raw_median:>8.1f} / {max(raw_ms):>6.1f} {rollup_median:>8.1f} / {max(rollup_ms):>6.1f} "
+                f"{raw_median / rollup_median if rollup_median else 0:>7.1f}x{mismatch}"
+            )
+    finally:
+        if not args.keep:
+            cleanup(timescale_manager, start_time, end_time)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
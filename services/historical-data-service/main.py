@@ -50,6 +50,10 @@ try:
         database=os.getenv("TIMESCALEDB_DATABASE", "grill_monitoring"),
         username=os.getenv("TIMESCALEDB_USERNAME", "grill_monitor"),
         password=os.getenv("TIMESCALEDB_PASSWORD", "testpass"),
+        min_connections=int(os.getenv("TIMESCALEDB_POOL_MIN_SIZE", "1")),
+        max_connections=int(os.getenv("TIMESCALEDB_POOL_MAX_SIZE", "10")),
+        statement_timeout_ms=int(os.getenv("TIMESCALEDB_STATEMENT_TIMEOUT_MS", "30000")),
+        checkout_timeout=float(os.getenv("TIMESCALEDB_POOL_TIMEOUT", "5")),
     )
     logger.info("TimescaleDB connection initialized successfully")
 except Exception as e:
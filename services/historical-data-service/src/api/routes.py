@@ -1,18 +1,40 @@
+import csv
+import io
 import json
 import os
 from datetime import datetime, timedelta
+from itertools import chain
 
 import jwt
 import structlog
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from opentelemetry import trace
 from pydantic import ValidationError
+from src.database.query_planner import decode_history_cursor, encode_history_cursor
 from src.database.timescale_manager import TimescaleManager
 from src.models.temperature_models import TemperatureQuery, TemperatureReading
 
 logger = structlog.get_logger()
 tracer = trace.get_tracer(__name__)
 
+# Streaming export formats for the history endpoints (``format`` parameter)
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+HISTORY_CSV_COLUMNS = (
+    "time",
+    "device_id",
+    "probe_id",
+    "grill_id",
+    "temperature",
+    "unit",
+    "battery_level",
+    "signal_strength",
+    "metadata",
+)
+
+# Rows serialized into each chunk of a streamed response
+STREAM_CHUNK_ROWS = 500
+
 
 def get_user_id_from_jwt(token):
     """Extract user ID from JWT token."""
@@ -46,6 +68,81 @@ def get_user_devices(user_id):
         return []
 
 
+def encode_history_rows(rows, export_format):
+    """Serialize history rows as NDJSON or CSV, yielding one chunk per ``STREAM_CHUNK_ROWS`` rows."""
+    buffer = io.StringIO()
+    if export_format == "csv":
+        writer = csv.writer(buffer)
+        writer.writerow(HISTORY_CSV_COLUMNS)
+
+        def write(row):
+            if row.get("metadata") is not None:
+                row["metadata"] = json.dumps(row["metadata"])
+            writer.writerow([row.get(column) for column in HISTORY_CSV_COLUMNS])
+
+    else:
+
+        def write(row):
+            buffer.write(json.dumps(row, default=str))
+            buffer.write("\n")
+
+    pending = 0
+    for row in rows:
+        write(row)
+        pending += 1
+        if pending >= STREAM_CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def parse_history_cursor(aggregation):
+    """The ``cursor`` query parameter, or an error response if it is not a valid history cursor."""
+    page_cursor = request.args.get("cursor")
+    if page_cursor:
+        try:
+            decode_history_cursor(page_cursor, aggregation)
+        except ValueError:
+            return page_cursor, (jsonify({"status": "error", "message": "Invalid cursor"}), 400)
+    return page_cursor, None
+
+
+def next_history_cursor(rows, limit):
+    """Cursor for the page after ``rows``, or None when the page is the last one."""
+    if limit and len(rows) >= limit:
+        return encode_history_cursor(rows[-1])
+    return None
+
+
+def stream_history_response(rows, export_format, filename):
+    """Chunked response streaming history rows in an export format.
+
+    The first row is fetched before the response starts, so that failures
+    running the query are still reported as errors rather than as an empty
+    export. Failures after that cut the response short.
+    """
+    rows = iter(rows)
+    try:
+        first = [next(rows)]
+    except StopIteration:
+        first = []
+    rows = chain(first, rows)
+
+    def generate():
+        try:
+            yield from encode_history_rows(rows, export_format)
+        except Exception as e:
+            logger.error("History export failed mid-stream", error=str(e))
+            raise
+
+    headers = {"Content-Disposition": f"attachment; filename={filename}.{export_format}"}
+    return Response(generate(), mimetype=STREAM_FORMATS[export_format], headers=headers)
+
+
 def register_routes(app, timescale_manager: TimescaleManager):
     """Register all API routes with the Flask app."""
 
@@ -89,6 +186,10 @@ def register_routes(app, timescale_manager: TimescaleManager):
             else:
                 health_status["dependencies"]["timescaledb"] = "error"
 
+        # Report connection pool utilization
+        if timescale_manager:
+            health_status["connection_pool"] = timescale_manager.get_pool_status()
+
         # Determine overall status
         dep_statuses = list(health_status["dependencies"].values())
 
@@ -174,36 +275,53 @@ def register_routes(app, timescale_manager: TimescaleManager):
                         400,
                     )
 
-                # Validate readings
+                # Validate readings, remembering each one's position in the request
                 validated_readings = []
-                for reading_data in readings:
+                request_indexes = []
+                failed = []
+                for index, reading_data in enumerate(readings):
                     try:
                         reading = TemperatureReading(**reading_data)
                         validated_readings.append(reading.dict())
-                    except ValidationError as e:
+                        request_indexes.append(index)
+                    except (ValidationError, TypeError) as e:
                         logger.warning(
                             "Invalid temperature reading",
                             reading=reading_data,
                             error=str(e),
                         )
-                        continue
+                        failed.append({"index": index, "error": str(e)})
 
                 if not validated_readings:
                     return (
-                        jsonify({"status": "error", "message": "No valid readings provided"}),
+                        jsonify(
+                            {
+                                "status": "error",
+                                "message": "No valid readings provided",
+                                "failed": failed,
+                            }
+                        ),
                         400,
                     )
 
                 # Store readings
-                stored_count = timescale_manager.store_batch_temperature_readings(validated_readings)
+                result = timescale_manager.bulk_store_temperature_readings(validated_readings)
+                stored_count = result["stored_count"]
+                failed.extend({"index": request_indexes[item["index"]], "error": item["error"]} for item in result["failed"])
+                failed.sort(key=lambda item: item["index"])
 
-                logger.info("Batch temperature data stored", count=stored_count)
-                return jsonify(
-                    {
-                        "status": "success",
-                        "stored_count": stored_count,
-                        "total_count": len(readings),
-                    }
+                logger.info("Batch temperature data stored", count=stored_count, failed=len(failed))
+                return (
+                    jsonify(
+                        {
+                            "status": "success" if stored_count else "error",
+                            "stored_count": stored_count,
+                            "failed_count": len(failed),
+                            "total_count": len(readings),
+                            "failed": failed,
+                        }
+                    ),
+                    200 if stored_count else 500,
                 )
 
             except Exception as e:
@@ -225,6 +343,22 @@ def register_routes(app, timescale_manager: TimescaleManager):
                 aggregation = request.args.get("aggregation", "none")
                 interval = request.args.get("interval", "1h")
                 limit = request.args.get("limit")
+                export_format = request.args.get("format", "json").lower()
+
+                if export_format != "json" and export_format not in STREAM_FORMATS:
+                    return (
+                        jsonify(
+                            {
+                                "status": "error",
+                                "message": f"Invalid format. Use one of: json, {', '.join(STREAM_FORMATS)}",
+                            }
+                        ),
+                        400,
+                    )
+
+                page_cursor, error_response = parse_history_cursor(aggregation)
+                if error_response:
+                    return error_response
 
                 # Convert limit to integer if provided
                 if limit:
@@ -283,6 +417,31 @@ def register_routes(app, timescale_manager: TimescaleManager):
                         400,
                     )
 
+                # Stream large exports row by row instead of building one JSON body
+                if export_format in STREAM_FORMATS:
+                    logger.info(
+                        "Streaming temperature history",
+                        format=export_format,
+                        device_id=device_id,
+                        probe_id=probe_id,
+                        grill_id=grill_id,
+                    )
+                    return stream_history_response(
+                        timescale_manager.stream_temperature_history(
+                            device_id=device_id,
+                            probe_id=probe_id,
+                            grill_id=grill_id,
+                            start_time=start_time,
+                            end_time=end_time,
+                            aggregation=aggregation,
+                            interval=interval,
+                            limit=limit,
+                            page_cursor=page_cursor,
+                        ),
+                        export_format,
+                        "temperature_history",
+                    )
+
                 # Get historical data
                 history_data = timescale_manager.get_temperature_history(
                     device_id=device_id,
@@ -293,6 +452,7 @@ def register_routes(app, timescale_manager: TimescaleManager):
                     aggregation=aggregation,
                     interval=interval,
                     limit=limit,
+                    page_cursor=page_cursor,
                 )
 
                 logger.info(
@@ -308,6 +468,7 @@ def register_routes(app, timescale_manager: TimescaleManager):
                         "status": "success",
                         "data": history_data,
                         "count": len(history_data),
+                        "next_cursor": next_history_cursor(history_data, limit),
                         "query": {
                             "device_id": device_id,
                             "probe_id": probe_id,
@@ -317,6 +478,7 @@ def register_routes(app, timescale_manager: TimescaleManager):
                             "aggregation": aggregation,
                             "interval": interval,
                             "limit": limit,
+                            "cursor": page_cursor,
                         },
                     }
                 )
@@ -348,13 +510,31 @@ def register_routes(app, timescale_manager: TimescaleManager):
                 aggregation = request.args.get("aggregation", "none")
                 interval = request.args.get("interval", "1m")
                 limit = request.args.get("limit")
+                export_format = request.args.get("format", "json").lower()
 
-                # Convert limit to integer if provided
+                if export_format != "json" and export_format not in STREAM_FORMATS:
+                    return (
+                        jsonify(
+                            {
+                                "status": "error",
+                                "message": f"Invalid format. Use one of: json, {', '.join(STREAM_FORMATS)}",
+                            }
+                        ),
+                        400,
+                    )
+
+                page_cursor, error_response = parse_history_cursor(aggregation)
+                if error_response:
+                    return error_response
+
+                # Convert limit to integer if provided; streamed exports are only limited on request
                 if limit:
                     try:
                         limit = int(limit)
                     except ValueError:
                         limit = 1000  # Default limit
+                elif export_format in STREAM_FORMATS:
+                    limit = None
                 else:
                     limit = 1000
 
@@ -408,6 +588,29 @@ def register_routes(app, timescale_manager: TimescaleManager):
                         400,
                     )
 
+                # Stream exports as flat rows rather than grouping them by probe in memory
+                if export_format in STREAM_FORMATS:
+                    logger.info(
+                        "Streaming device history",
+                        format=export_format,
+                        device_id=device_id,
+                        user_id=user_id,
+                    )
+                    return stream_history_response(
+                        timescale_manager.stream_temperature_history(
+                            device_id=device_id,
+                            probe_id=probe_id,
+                            start_time=start_time,
+                            end_time=end_time,
+                            aggregation=aggregation,
+                            interval=interval,
+                            limit=limit,
+                            page_cursor=page_cursor,
+                        ),
+                        export_format,
+                        f"{device_id}_history",
+                    )
+
                 # Get historical data
                 history_data = timescale_manager.get_temperature_history(
                     device_id=device_id,
@@ -417,6 +620,7 @@ def register_routes(app, timescale_manager: TimescaleManager):
                     aggregation=aggregation,
                     interval=interval,
                     limit=limit,
+                    page_cursor=page_cursor,
                 )
 
                 # Group data by probe for easier frontend consumption
@@ -458,6 +662,7 @@ def register_routes(app, timescale_manager: TimescaleManager):
                             "device_id": device_id,
                             "probes": probe_list,
                             "total_readings": len(history_data),
+                            "next_cursor": next_history_cursor(history_data, limit),
                             "time_range": {
                                 "start": start_time.isoformat(),
                                 "end": end_time.isoformat(),
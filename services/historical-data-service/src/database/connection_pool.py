@@ -0,0 +1,251 @@
+"""
+Thread-safe connection pool for TimescaleDB.
+
+Connections are shared by the Flask request threads:
+
+- up to ``max_size`` connections are open at once and ``min_size`` are
+  opened up front; returned connections stay open for the next checkout
+- checkout blocks for up to ``checkout_timeout`` seconds when all
+  ``max_size`` connections are in use instead of failing immediately
+- connections idle for longer than ``idle_check_seconds`` are pinged on
+  checkout and replaced when the ping fails; connections found closed are
+  replaced as well
+- every statement is bounded by ``statement_timeout_ms``, set per
+  connection and overridable per checkout
+- connections are in autocommit mode unless a checkout asks for a
+  transaction (needed for server-side cursors), which is rolled back and
+  autocommit restored on checkin
+- ``execute_prepared`` runs a query as a server-side prepared statement,
+  prepared once per connection and keyed by the query text
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import psycopg2
+import structlog
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extensions import connection as PgConnection
+
+logger = structlog.get_logger()
+
+_NAMED_PARAMETER = re.compile(r"%\((\w+)\)s")
+
+
+class PoolTimeout(Exception):
+    """No pooled connection became available within the checkout timeout."""
+
+
+class PooledConnection(PgConnection):
+    """Autocommit connection that tracks its last use and its prepared statements."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.autocommit = True
+        self.last_used = time.monotonic()
+        # Statement name -> parameter names in positional order, least recently used first
+        self.prepared: "OrderedDict[str, List[str]]" = OrderedDict()
+
+
+class TimescaleConnectionPool:
+    """Bounded pool of TimescaleDB connections shared by request threads."""
+
+    def __init__(
+        self,
+        min_size: int,
+        max_size: int,
+        checkout_timeout: float,
+        statement_timeout_ms: int,
+        idle_check_seconds: float = 30.0,
+        max_prepared: int = 64,
+        **connect_kwargs: Any,
+    ):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.statement_timeout_ms = statement_timeout_ms
+        self.idle_check_seconds = idle_check_seconds
+        self.max_prepared = max_prepared
+
+        self.connect_kwargs = connect_kwargs
+        self.closed = False
+
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        # Most recently returned last, so stale connections sink to the bottom
+        self._idle: List[PooledConnection] = []
+        self._open = 0
+        self._waiting = 0
+        self._stats = {"checkouts": 0, "checkout_timeouts": 0, "discarded": 0}
+
+        for _ in range(min_size):
+            self._idle.append(self._open_connection())
+
+    def close(self):
+        """Close idle connections now and checked out ones when they are returned."""
+        with self._lock:
+            self.closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn in idle:
+            conn.close()
+
+    def _open_connection(self) -> PooledConnection:
+        """Open a new connection with the pool's statement timeout."""
+        conn = psycopg2.connect(
+            connection_factory=PooledConnection,
+            options=f"-c statement_timeout={self.statement_timeout_ms}",
+            **self.connect_kwargs,
+        )
+        with self._lock:
+            self._open += 1
+        return conn
+
+    @contextmanager
+    def connection(self, statement_timeout_ms: Optional[int] = None, autocommit: bool = True) -> Iterator[PooledConnection]:
+        """Check out a connection, optionally with its own statement timeout (0 disables it).
+
+        With ``autocommit=False`` statements run in a transaction that the
+        caller commits; anything left uncommitted is rolled back on checkin.
+        """
+        conn = self._checkout()
+        try:
+            if statement_timeout_ms is not None:
+                with conn.cursor() as cursor:
+                    cursor.execute("SET statement_timeout = %s", (statement_timeout_ms,))
+            if not autocommit:
+                conn.autocommit = False
+            yield conn
+        finally:
+            self._checkin(conn, reset_timeout=statement_timeout_ms is not None)
+
+    def _checkout(self) -> PooledConnection:
+        """Wait for a free slot and return a healthy connection."""
+        with self._lock:
+            self._waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.checkout_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        if not acquired:
+            with self._lock:
+                self._stats["checkout_timeouts"] += 1
+            raise PoolTimeout(f"No TimescaleDB connection available within {self.checkout_timeout}s")
+
+        try:
+            # Idle connections that went stale are replaced, opening a new one once none are left
+            while True:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    conn = self._open_connection()
+                elif not self._is_healthy(conn):
+                    self._discard(conn)
+                    continue
+                with self._lock:
+                    self._stats["checkouts"] += 1
+                return conn
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _is_healthy(self, conn: PooledConnection) -> bool:
+        """Whether a connection is open, pinging it if it has been idle for a while."""
+        if conn.closed:
+            return False
+        if time.monotonic() - conn.last_used < self.idle_check_seconds:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except psycopg2.Error as e:
+            logger.warning("Discarding stale TimescaleDB connection", error=str(e))
+            return False
+
+    def _checkin(self, conn: PooledConnection, reset_timeout: bool):
+        """Return a connection to the pool, discarding it if it is no longer usable."""
+        try:
+            if not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+            if not conn.closed and not conn.autocommit:
+                conn.autocommit = True
+            if not conn.closed and reset_timeout:
+                with conn.cursor() as cursor:
+                    cursor.execute("RESET statement_timeout")
+        except psycopg2.Error as e:
+            logger.warning("Failed to reset TimescaleDB connection", error=str(e))
+            conn.close()
+
+        try:
+            if conn.closed or self.closed:
+                self._discard(conn)
+            else:
+                conn.last_used = time.monotonic()
+                with self._lock:
+                    self._idle.append(conn)
+        finally:
+            self._slots.release()
+
+    def _discard(self, conn: PooledConnection):
+        """Close a connection and drop it from the pool."""
+        with self._lock:
+            self._open -= 1
+            self._stats["discarded"] += 1
+        conn.close()
+
+    def execute_prepared(self, cursor, query: str, params: Dict[str, Any], prefix: str = "stmt"):
+        """Execute a query with ``%(name)s`` parameters as a server-side prepared statement.
+
+        The statement is prepared on the cursor's connection the first time
+        the query text is seen there. The least recently used statement is
+        deallocated once a connection holds ``max_prepared`` of them.
+        """
+        conn = cursor.connection
+        names: List[str] = []
+
+        def positional(match):
+            if match.group(1) not in names:
+                names.append(match.group(1))
+            return f"${names.index(match.group(1)) + 1}"
+
+        statement = _NAMED_PARAMETER.sub(positional, query)
+        name = f"{prefix}_{hashlib.sha1(statement.encode('utf-8')).hexdigest()[:16]}"
+
+        if name in conn.prepared:
+            conn.prepared.move_to_end(name)
+        else:
+            if len(conn.prepared) >= self.max_prepared:
+                evicted, _ = conn.prepared.popitem(last=False)
+                cursor.execute(f"DEALLOCATE {evicted}")
+            cursor.execute(f"PREPARE {name} AS {statement}")
+            conn.prepared[name] = names
+
+        if names:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(names))})", [params[n] for n in names])
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Pool size, utilization and checkout counters."""
+        with self._lock:
+            idle = len(self._idle)
+            in_use = self._open - idle
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": self._open,
+                "in_use": in_use,
+                "idle": idle,
+                "waiting": self._waiting,
+                "utilization": round(in_use / self.max_size, 3) if self.max_size else 0.0,
+                "statement_timeout_ms": self.statement_timeout_ms,
+                **self._stats,
+            }
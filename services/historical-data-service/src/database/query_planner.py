@@ -0,0 +1,407 @@
+"""
+Query planning for temperature history and statistics.
+
+Aggregated history queries are answered from the coarsest continuous
+aggregate (rollup tier) whose bucket width evenly divides the requested
+interval, instead of running ``time_bucket`` over raw readings. Rollups
+only cover whole buckets, and only buckets older than the tier's refresh
+``start_offset`` before its watermark are final: the refresh policy still
+rewrites newer ones as late readings arrive. The parts of the requested
+range that a rollup cannot answer are read from ``temperature_readings``:
+
+- the partial bucket at the start of the range,
+- everything after the settled part of the rollup (the last materialized
+  bucket minus ``start_offset``) or the last whole bucket before the end of
+  the range, whichever comes first.
+
+Readings ingested later than ``start_offset`` are never revisited by the
+policy; ``TimescaleManager`` refreshes the affected buckets when it stores
+such readings.
+
+Both parts are reduced to partial aggregates at the tier's bucket width
+(sums, counts, minimums and maximums) and then combined into buckets of
+the requested interval, so rollup and raw rows merge exactly.
+
+The tiers are declared ``materialized_only`` so that reading them never
+includes TimescaleDB's own real-time union, which would double count the
+raw tail.
+
+History is ordered newest first by ``(time, device_id, probe_id)`` and
+paginated by keyset: a page cursor holds the key of the last row of the
+previous page, and the next page starts strictly after it. Readings can
+share that key, so raw rows are further ordered by ``id`` and aggregated
+rows, which are also grouped by grill and unit, by ``(grill_id, unit)``;
+this makes the key unique and no rows are skipped at page boundaries. On
+raw readings the key bounds the time index scan, so deep pages cost the
+same as the first one.
+"""
+
+import base64
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class RollupTier(NamedTuple):
+    """A continuous aggregate of temperature_readings at a fixed bucket width."""
+
+    view: str
+    width: timedelta
+    # start_offset of the tier's refresh policy: how far back refreshes reach
+    start_offset: timedelta
+
+
+# Coarsest first; created, with their refresh policies, by database-init/timescale-init.sql
+ROLLUP_TIERS = (
+    RollupTier("temperature_daily", timedelta(days=1), timedelta(days=2)),
+    RollupTier("temperature_hourly", timedelta(hours=1), timedelta(hours=3)),
+    RollupTier("temperature_1m", timedelta(minutes=1), timedelta(hours=2)),
+)
+
+# Present only in tiers with the columns the planner reads (not in the
+# original temperature_hourly/temperature_daily definitions)
+ROLLUP_MARKER_COLUMN = "battery_count"
+
+AGGREGATIONS = ("avg", "min", "max")
+
+RAW_COLUMNS = "time, device_id, probe_id, grill_id, temperature, unit, battery_level, signal_strength, metadata, id"
+
+# Filter columns shared by the raw table and every rollup tier
+FILTER_COLUMNS = ("device_id", "probe_id", "grill_id")
+
+# Keyset order of history rows; readings without a probe sort as an empty probe_id.
+# The trailing columns break ties, so that the key of every row is unique.
+HISTORY_ORDER = "ORDER BY time DESC, device_id DESC, COALESCE(probe_id, '') DESC, id DESC"
+AGGREGATED_HISTORY_ORDER = (
+    "ORDER BY time DESC, device_id DESC, COALESCE(probe_id, '') DESC, COALESCE(grill_id, '') DESC, COALESCE(unit, '') DESC"
+)
+
+# Rows strictly after the page cursor in HISTORY_ORDER and AGGREGATED_HISTORY_ORDER
+_KEYSET_CONDITION = (
+    "time <= %(after_time)s AND (time < %(after_time)s OR "
+    "(device_id, COALESCE(probe_id, ''), id) < (%(after_device_id)s, %(after_probe_id)s, %(after_id)s))"
+)
+_AGGREGATED_KEYSET_CONDITION = (
+    "time <= %(after_time)s AND (time < %(after_time)s OR "
+    "(device_id, COALESCE(probe_id, ''), COALESCE(grill_id, ''), COALESCE(unit, '')) < "
+    "(%(after_device_id)s, %(after_probe_id)s, %(after_grill_id)s, %(after_unit)s))"
+)
+
+# Cursor keys: (time, device_id, probe_id) followed by the tiebreaker columns
+_RAW_KEY_FIELDS = ("after_time", "after_device_id", "after_probe_id", "after_id")
+_AGGREGATED_KEY_FIELDS = ("after_time", "after_device_id", "after_probe_id", "after_grill_id", "after_unit")
+
+_INTERVAL_UNITS = {
+    "s": 1,
+    "sec": 1,
+    "secs": 1,
+    "second": 1,
+    "seconds": 1,
+    "m": 60,
+    "min": 60,
+    "mins": 60,
+    "minute": 60,
+    "minutes": 60,
+    "h": 3600,
+    "hr": 3600,
+    "hrs": 3600,
+    "hour": 3600,
+    "hours": 3600,
+    "d": 86400,
+    "day": 86400,
+    "days": 86400,
+    "w": 604800,
+    "week": 604800,
+    "weeks": 604800,
+}
+
+_INTERVAL_PATTERN = re.compile(r"^\s*(\d+)\s*([a-z]+)\s*$")
+
+
+def parse_interval(interval: Optional[str]) -> Optional[timedelta]:
+    """Parse an interval such as ``15m``, ``1h`` or ``1 hour`` into a timedelta.
+
+    Returns None for intervals with no fixed length (months, years) or that
+    cannot be parsed; those are passed through to PostgreSQL unchanged.
+    """
+    if not interval:
+        return None
+
+    match = _INTERVAL_PATTERN.match(interval.lower())
+    if not match or match.group(2) not in _INTERVAL_UNITS:
+        return None
+
+    seconds = int(match.group(1)) * _INTERVAL_UNITS[match.group(2)]
+    return timedelta(seconds=seconds) if seconds else None
+
+
+def choose_rollup(
+    interval: Optional[str],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    available: Iterable[str],
+) -> Optional[RollupTier]:
+    """Pick the coarsest available tier that can answer the interval and range.
+
+    A tier qualifies when its bucket width evenly divides the requested
+    interval and the range is at least one bucket long; otherwise no whole
+    bucket would come from the rollup.
+    """
+    bucket_width = parse_interval(interval)
+    if not bucket_width:
+        return None
+
+    available = set(available)
+    for tier in ROLLUP_TIERS:
+        if tier.view not in available:
+            continue
+        if tier.width > bucket_width or bucket_width % tier.width:
+            continue
+        if start_time and end_time and _as_utc(end_time) - _as_utc(start_time) < tier.width:
+            continue
+        return tier
+
+    return None
+
+
+def build_history_query(
+    filters: Dict[str, Optional[str]],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+    aggregation: Optional[str],
+    interval: Optional[str],
+    limit: Optional[int],
+    tier: Optional[RollupTier] = None,
+    after: Optional[Tuple[Any, ...]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the history query and its parameters.
+
+    Args:
+        filters: Values for ``device_id``, ``probe_id`` and ``grill_id``; None values are not filtered on
+        start_time: Inclusive start of the range
+        end_time: Inclusive end of the range
+        aggregation: ``none``, ``avg``, ``min`` or ``max``
+        interval: Bucket interval for aggregations (default ``1 hour``)
+        limit: Maximum number of rows
+        tier: Rollup tier to read whole buckets from, as chosen by ``choose_rollup``
+        after: Key of the last row of the previous page, as decoded by ``decode_history_cursor``
+
+    Returns:
+        Tuple of query and named parameters
+
+    Raises:
+        ValueError: If ``after`` is the key of a raw row for an aggregated query, or vice versa
+    """
+    aggregation = (aggregation or "none").lower()
+    params: Dict[str, Any] = {"interval": interval or "1 hour"}
+
+    conditions = []
+    for column in FILTER_COLUMNS:
+        if filters.get(column):
+            conditions.append(f"{column} = %({column})s")
+            params[column] = filters[column]
+    if start_time:
+        params["start_time"] = start_time
+    if end_time:
+        params["end_time"] = end_time
+
+    raw_conditions = list(conditions)
+    if start_time:
+        raw_conditions.append("time >= %(start_time)s")
+    if end_time:
+        raw_conditions.append("time <= %(end_time)s")
+
+    if after:
+        key_fields = _AGGREGATED_KEY_FIELDS if aggregation in AGGREGATIONS else _RAW_KEY_FIELDS
+        if len(after) != len(key_fields):
+            raise ValueError("History cursor does not match the aggregation")
+        params.update(zip(key_fields, after))
+
+    if aggregation not in AGGREGATIONS:
+        if after:
+            raw_conditions.append(_KEYSET_CONDITION)
+        query = f"SELECT {RAW_COLUMNS} FROM temperature_readings{_where(raw_conditions)} {HISTORY_ORDER}"
+    else:
+        if after:
+            # Only readings in buckets up to the cursor's bucket can be on later pages
+            raw_conditions.append("time < %(after_time)s::timestamptz + %(interval)s::interval")
+
+        if tier is None:
+            query = (
+                "SELECT time_bucket(%(interval)s::interval, time) AS time, device_id, probe_id, grill_id, "
+                f"{aggregation.upper()}(temperature) AS temperature, unit, "
+                f"{aggregation.upper()}(battery_level) AS battery_level, "
+                f"{aggregation.upper()}(signal_strength) AS signal_strength "
+                f"FROM temperature_readings{_where(raw_conditions)} "
+                "GROUP BY 1, device_id, probe_id, grill_id, unit"
+            )
+        else:
+            query = _build_rollup_query(tier, aggregation, conditions, raw_conditions, params)
+
+        if after:
+            query = f"SELECT * FROM ({query}) AS history WHERE {_AGGREGATED_KEYSET_CONDITION}"
+        query += f" {AGGREGATED_HISTORY_ORDER}"
+
+    if limit:
+        query += " LIMIT %(limit)s"
+        params["limit"] = limit
+
+    return query, params
+
+
+def build_statistics_query(
+    filters: Dict[str, Optional[str]],
+    start_time: Optional[datetime],
+    end_time: Optional[datetime],
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the statistics query over raw readings and its parameters."""
+    params: Dict[str, Any] = {}
+    conditions = []
+    for column in FILTER_COLUMNS:
+        if filters.get(column):
+            conditions.append(f"{column} = %({column})s")
+            params[column] = filters[column]
+    if start_time:
+        conditions.append("time >= %(start_time)s")
+        params["start_time"] = start_time
+    if end_time:
+        conditions.append("time <= %(end_time)s")
+        params["end_time"] = end_time
+
+    query = (
+        "SELECT COUNT(*) AS reading_count, "
+        "AVG(temperature) AS avg_temperature, "
+        "MIN(temperature) AS min_temperature, "
+        "MAX(temperature) AS max_temperature, "
+        "PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY temperature) AS median_temperature, "
+        "STDDEV(temperature) AS stddev_temperature, "
+        "MIN(time) AS first_reading_time, "
+        "MAX(time) AS last_reading_time "
+        f"FROM temperature_readings{_where(conditions)}"
+    )
+    return query, params
+
+
+def encode_history_cursor(row: Dict[str, Any]) -> str:
+    """Opaque cursor for the page that follows ``row``, the last row of a page.
+
+    Raw rows carry their ``id`` as tiebreaker; aggregated rows, which have
+    none, their ``grill_id`` and ``unit``.
+    """
+    timestamp = row["time"]
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    key = [timestamp, row["device_id"], row.get("probe_id") or ""]
+    if "id" in row:
+        key.append(row["id"])
+    else:
+        key += [row.get("grill_id") or "", row.get("unit") or ""]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_history_cursor(token: str, aggregation: Optional[str] = None) -> Tuple[Any, ...]:
+    """Decode a cursor from ``encode_history_cursor`` into its key.
+
+    The key is ``(time, device_id, probe_id, id)`` for raw history and
+    ``(time, device_id, probe_id, grill_id, unit)`` for aggregated history.
+
+    Raises:
+        ValueError: If the cursor is malformed or was not issued for the ``aggregation``
+    """
+    aggregated = (aggregation or "none").lower() in AGGREGATIONS
+    try:
+        key = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if not isinstance(key, list):
+            raise ValueError("cursor key is not a list")
+        timestamp, *columns = key
+        if aggregated:
+            if len(columns) != 4 or not all(isinstance(value, str) for value in columns):
+                raise ValueError("cursor key is not an aggregated row key")
+        elif len(columns) != 3 or not all(isinstance(value, str) for value in columns[:2]) or type(columns[2]) is not int:
+            raise ValueError("cursor key is not a raw row key")
+        return (datetime.fromisoformat(timestamp), *columns)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid history cursor: {e}") from e
+
+
+def _build_rollup_query(
+    tier: RollupTier,
+    aggregation: str,
+    conditions: List[str],
+    raw_conditions: List[str],
+    params: Dict[str, Any],
+) -> str:
+    """Combine whole rollup buckets with raw readings for the rest of the range."""
+    params["tier_width"] = tier.width
+    params["tier_start_offset"] = tier.start_offset
+    # Typed, so the query can also be prepared server-side
+    width = "%(tier_width)s::interval"
+
+    # [rollup_start, rollup_end) is served by the rollup: whole buckets inside
+    # the range that the refresh policy no longer rewrites
+    rollup_start = (
+        f"time_bucket({width}, %(start_time)s::timestamptz - INTERVAL '1 microsecond') + {width}"
+        if "start_time" in params
+        else "'-infinity'::timestamptz"
+    )
+    # Buckets within start_offset of the last materialized one may still be rewritten
+    watermark = f"(SELECT COALESCE(MAX(bucket) + {width} - %(tier_start_offset)s::interval, '-infinity') FROM {tier.view})"
+    rollup_end = f"LEAST(time_bucket({width}, %(end_time)s::timestamptz), {watermark})" if "end_time" in params else watermark
+
+    rollup_conditions = conditions + [
+        "bucket >= (SELECT rollup_start FROM bounds)",
+        "bucket < (SELECT rollup_end FROM bounds)",
+    ]
+    if "after_time" in params:
+        rollup_conditions.append("bucket < %(after_time)s::timestamptz + %(interval)s::interval")
+    raw_conditions = raw_conditions + [
+        "(time < (SELECT rollup_start FROM bounds) OR time >= (SELECT rollup_end FROM bounds))",
+    ]
+
+    if aggregation == "avg":
+        outputs = [
+            "SUM(temp_sum) / NULLIF(SUM(reading_count), 0) AS temperature",
+            "unit",
+            "SUM(battery_sum) / NULLIF(SUM(battery_count), 0) AS battery_level",
+            "SUM(signal_sum) / NULLIF(SUM(signal_count), 0) AS signal_strength",
+        ]
+    else:
+        outputs = [
+            f"{aggregation.upper()}({aggregation}_temp) AS temperature",
+            "unit",
+            f"{aggregation.upper()}({aggregation}_battery) AS battery_level",
+            f"{aggregation.upper()}({aggregation}_signal) AS signal_strength",
+        ]
+
+    return (
+        f"WITH bounds AS (SELECT {rollup_start} AS rollup_start, {rollup_end} AS rollup_end), "
+        "parts AS ("
+        "SELECT bucket, device_id, probe_id, grill_id, unit, "
+        "avg_temp * reading_count AS temp_sum, reading_count, min_temp, max_temp, "
+        "avg_battery * battery_count AS battery_sum, battery_count, min_battery, max_battery, "
+        "avg_signal * signal_count AS signal_sum, signal_count, min_signal, max_signal "
+        f"FROM {tier.view}{_where(rollup_conditions)} "
+        "UNION ALL "
+        f"SELECT time_bucket({width}, time) AS bucket, device_id, probe_id, grill_id, unit, "
+        "SUM(temperature), COUNT(*), MIN(temperature), MAX(temperature), "
+        "SUM(battery_level), COUNT(battery_level), MIN(battery_level), MAX(battery_level), "
+        "SUM(signal_strength), COUNT(signal_strength), MIN(signal_strength), MAX(signal_strength) "
+        f"FROM temperature_readings{_where(raw_conditions)} "
+        "GROUP BY 1, device_id, probe_id, grill_id, unit"
+        ") "
+        "SELECT time_bucket(%(interval)s::interval, bucket) AS time, device_id, probe_id, grill_id, "
+        f"{', '.join(outputs)} "
+        "FROM parts "
+        "GROUP BY 1, device_id, probe_id, grill_id, unit"
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC, as the API defaults them with ``utcnow``."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _where(conditions: List[str]) -> str:
+    """WHERE clause joining the conditions, or nothing when there are none."""
+    return f" WHERE {' AND '.join(conditions)}" if conditions else ""
@@ -1,54 +1,141 @@
+import csv
+import io
 import json
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import psycopg2
 import structlog
-from psycopg2 import sql
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, execute_values
 from retry import retry
 
+from .connection_pool import PooledConnection, TimescaleConnectionPool
+from .query_planner import (
+    AGGREGATIONS,
+    ROLLUP_MARKER_COLUMN,
+    ROLLUP_TIERS,
+    RollupTier,
+    build_history_query,
+    build_statistics_query,
+    choose_rollup,
+    decode_history_cursor,
+)
+
 logger = structlog.get_logger()
 
+# Column order used by the bulk ingest paths (COPY and execute_values)
+READING_COLUMNS = (
+    "time",
+    "device_id",
+    "probe_id",
+    "grill_id",
+    "temperature",
+    "unit",
+    "battery_level",
+    "signal_strength",
+    "metadata",
+)
+
+# Rows per statement when falling back from COPY to paged inserts
+INSERT_PAGE_SIZE = 1000
+
+# Rows fetched per round trip when streaming history from a server-side cursor
+STREAM_PAGE_SIZE = 2000
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes as UTC, as the API defaults them with ``utcnow``."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
 
 class TimescaleManager:
     """Manages interactions with TimescaleDB for temperature data."""
 
-    def __init__(self, host: str, port: int, database: str, username: str, password: str):
-        """Initialize the TimescaleDB manager with connection parameters."""
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        database: str,
+        username: str,
+        password: str,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        statement_timeout_ms: int = 30000,
+        checkout_timeout: float = 5.0,
+    ):
+        """Initialize the TimescaleDB manager with connection and pool parameters."""
         self.host = host
         self.port = port
         self.database = database
         self.username = username
         self.password = password
-        self.connection = None
+        self.min_connections = min_connections
+        self.max_connections = max_connections
+        self.statement_timeout_ms = statement_timeout_ms
+        self.checkout_timeout = checkout_timeout
+        self.pool: Optional[TimescaleConnectionPool] = None
+        self.rollup_tiers: Optional[List[str]] = None
         self._connect()
 
     def _connect(self):
-        """Establish database connection."""
+        """Open the connection pool."""
         try:
-            self.connection = psycopg2.connect(
+            if self.pool and not self.pool.closed:
+                self.pool.close()
+            self.pool = TimescaleConnectionPool(
+                self.min_connections,
+                self.max_connections,
+                checkout_timeout=self.checkout_timeout,
+                statement_timeout_ms=self.statement_timeout_ms,
                 host=self.host,
                 port=self.port,
                 database=self.database,
                 user=self.username,
                 password=self.password,
             )
-            # Set isolation level for creating extensions
-            self.connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
-            logger.info("Connected to TimescaleDB successfully")
+            # Rediscover rollup tiers, which may have been migrated meanwhile
+            self.rollup_tiers = None
+            logger.info(
+                "Connected to TimescaleDB successfully",
+                min_connections=self.min_connections,
+                max_connections=self.max_connections,
+            )
         except Exception as e:
             logger.error("Failed to connect to TimescaleDB", error=str(e))
             raise
 
+    @contextmanager
+    def connection(self, statement_timeout_ms: Optional[int] = None, autocommit: bool = True) -> Iterator[PooledConnection]:
+        """Check out a pooled connection.
+
+        Args:
+            statement_timeout_ms: Statement timeout for this checkout instead of
+                the pool default; 0 disables it
+            autocommit: False to run statements in a transaction, which is
+                rolled back on checkin unless committed
+        """
+        if not self.pool or self.pool.closed:
+            self._connect()
+
+        with self.pool.connection(statement_timeout_ms, autocommit=autocommit) as conn:
+            yield conn
+
+    def close(self):
+        """Close all pooled connections."""
+        if self.pool and not self.pool.closed:
+            self.pool.close()
+
+    def get_pool_status(self) -> Dict[str, Any]:
+        """Connection pool size, utilization and checkout counters."""
+        if not self.pool or self.pool.closed:
+            return {"max_size": self.max_connections, "open": 0, "in_use": 0, "utilization": 0.0}
+        return self.pool.get_status()
+
     def health_check(self) -> bool:
         """Check TimescaleDB connection health."""
         try:
-            if not self.connection or self.connection.closed:
-                self._connect()
-
-            with self.connection.cursor() as cursor:
+            with self.connection() as conn, conn.cursor() as cursor:
                 cursor.execute("SELECT 1")
                 result = cursor.fetchone()
                 return result[0] == 1
@@ -56,14 +143,33 @@ class TimescaleManager:
             logger.error("TimescaleDB health check failed", error=str(e))
             raise
 
+    def _available_rollups(self) -> List[str]:
+        """Names of the rollup tiers present in the database with the columns the planner reads."""
+        if self.rollup_tiers is not None:
+            return self.rollup_tiers
+
+        try:
+            with self.connection() as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT table_name FROM information_schema.columns
+                    WHERE table_schema = current_schema() AND table_name = ANY(%s) AND column_name = %s
+                """,
+                    ([tier.view for tier in ROLLUP_TIERS], ROLLUP_MARKER_COLUMN),
+                )
+                self.rollup_tiers = [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.warning("Failed to discover rollup tiers, querying raw readings", error=str(e))
+            return []
+
+        logger.info("Rollup tiers discovered", tiers=self.rollup_tiers)
+        return self.rollup_tiers
+
     @retry(tries=3, delay=2, backoff=2)
     def init_db(self):
         """Initialize TimescaleDB schema and hypertables."""
         try:
-            if not self.connection or self.connection.closed:
-                self._connect()
-
-            with self.connection.cursor() as cursor:
+            with self.connection(statement_timeout_ms=0) as conn, conn.cursor() as cursor:
                 # Create extension if it doesn't exist
                 cursor.execute("CREATE EXTENSION IF NOT EXISTS timescaledb CASCADE")
 
@@ -85,10 +191,15 @@ class TimescaleManager:
                 """
                 )
 
-                # Create indexes for better query performance
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_temperature_device_id ON temperature_readings(device_id)")
+                # Create indexes for better query performance: filter columns first, then time
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_temperature_device_probe_time "
+                    "ON temperature_readings(device_id, probe_id, time DESC)"
+                )
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_temperature_grill_time ON temperature_readings(grill_id, time DESC)"
+                )
                 cursor.execute("CREATE INDEX IF NOT EXISTS idx_temperature_probe_id ON temperature_readings(probe_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_temperature_grill_id ON temperature_readings(grill_id)")
 
                 # Convert to hypertable if not already
                 try:
@@ -143,10 +254,7 @@ class TimescaleManager:
     def store_temperature_reading(self, reading: Dict[str, Any]) -> bool:
         """Store a single temperature reading in TimescaleDB."""
         try:
-            if not self.connection or self.connection.closed:
-                self._connect()
-
-            with self.connection.cursor() as cursor:
+            with self.connection() as conn, conn.cursor() as cursor:
                 # Convert metadata to JSON if needed
                 metadata = None
                 if reading.get("metadata"):
@@ -183,71 +291,203 @@ class TimescaleManager:
                     ),
                 )
 
-                self.connection.commit()
                 logger.debug("Temperature reading stored", device_id=reading["device_id"])
-                return True
+
+            self._refresh_rollups_for_late_readings(timestamp, timestamp)
+            return True
 
         except Exception as e:
             logger.error("Error storing temperature reading", error=str(e))
-            if self.connection:
-                self.connection.rollback()
             return False
 
     def store_batch_temperature_readings(self, readings: List[Dict[str, Any]]) -> int:
         """Store multiple temperature readings at once."""
+        return self.bulk_store_temperature_readings(readings)["stored_count"]
+
+    def bulk_store_temperature_readings(self, readings: List[Dict[str, Any]], refresh_rollups: bool = True) -> Dict[str, Any]:
+        """Bulk ingest temperature readings through COPY FROM STDIN.
+
+        Readings are normalized into CSV rows in an in-memory buffer and
+        streamed to PostgreSQL in a single COPY. Rows that cannot be
+        normalized are reported individually instead of failing the batch.
+        If the COPY itself is rejected, the batch is retried in pages with
+        ``execute_values``; a rejected page is bisected so that only the rows
+        PostgreSQL rejects are reported and the rest are stored.
+
+        Unless ``refresh_rollups`` is False, rollup buckets that readings
+        older than a tier's refresh window fall into are re-materialized, as
+        the refresh policies would never revisit them.
+
+        Returns:
+            Dictionary with ``stored_count`` and a ``failed`` list of
+            ``{"index": ..., "error": ...}`` entries, one per rejected row.
+        """
+        rows, failed = self._prepare_reading_rows(readings)
+        result: Dict[str, Any] = {"stored_count": 0, "failed": failed}
+
+        if not rows:
+            return result
+
         try:
-            if not self.connection or self.connection.closed:
-                self._connect()
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(row for _, row in rows)
+            buffer.seek(0)
+
+            with self.connection() as conn, conn.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY temperature_readings ({', '.join(READING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
 
-            with self.connection.cursor() as cursor:
-                count = 0
-                for reading in readings:
-                    # Convert metadata to JSON if needed
-                    metadata = None
-                    if reading.get("metadata"):
-                        if isinstance(reading["metadata"], dict):
-                            metadata = json.dumps(reading["metadata"])
-                        else:
-                            metadata = reading["metadata"]
-
-                    # Use timestamp from reading or current time
-                    timestamp = reading.get("timestamp")
-                    if not timestamp:
-                        timestamp = datetime.utcnow()
-                    elif isinstance(timestamp, str):
-                        timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
-
-                    # Insert the temperature reading
+            result["stored_count"] = len(rows)
+            logger.info("Batch temperature readings stored", count=len(rows), failed=len(failed))
+            if refresh_rollups:
+                self._refresh_rollups_for_rows(rows)
+            return result
+
+        except Exception as e:
+            logger.warning("COPY ingest failed, falling back to paged inserts", error=str(e))
+
+        try:
+            result["stored_count"] = self._insert_reading_pages(rows, failed)
+        except Exception as e:
+            logger.error("Error storing batch temperature readings", error=str(e))
+            failed.extend({"index": index, "error": str(e)} for index, _ in rows)
+
+        failed.sort(key=lambda item: item["index"])
+        logger.info(
+            "Batch temperature readings stored",
+            count=result["stored_count"],
+            failed=len(failed),
+        )
+        if refresh_rollups and result["stored_count"]:
+            self._refresh_rollups_for_rows(rows)
+        return result
+
+    def _refresh_rollups_for_rows(self, rows: List[Tuple[int, Tuple[Any, ...]]]) -> None:
+        """Refresh the rollups over the time range of prepared reading rows."""
+        timestamps = [_as_utc(datetime.fromisoformat(row[0])) for _, row in rows]
+        self._refresh_rollups_for_late_readings(min(timestamps), max(timestamps))
+
+    def _refresh_rollups_for_late_readings(self, oldest: datetime, newest: datetime) -> None:
+        """Re-materialize rollup buckets of readings older than a tier's refresh window.
+
+        Refresh policies only revisit the last ``start_offset`` of a tier, and
+        the query planner reads buckets older than that from the tier alone,
+        so late or backfilled readings must be refreshed into it explicitly.
+        Failures are logged; the readings themselves are already stored.
+        """
+        oldest, newest = _as_utc(oldest), _as_utc(newest)
+        now = datetime.now(timezone.utc)
+        available = set(self._available_rollups())
+
+        for tier in ROLLUP_TIERS:
+            policy_start = now - tier.start_offset
+            if tier.view not in available or oldest >= policy_start:
+                continue
+
+            started = time.perf_counter()
+            try:
+                # Whole buckets from the oldest reading's up to the policy window
+                with self.connection(statement_timeout_ms=0) as conn, conn.cursor() as cursor:
                     cursor.execute(
-                        """
-                        INSERT INTO temperature_readings (
-                            time, device_id, probe_id, grill_id, temperature,
-                            unit, battery_level, signal_strength, metadata
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    """,
+                        "CALL refresh_continuous_aggregate(%s, time_bucket(%s::interval, %s::timestamptz), "
+                        "time_bucket(%s::interval, %s::timestamptz) + %s::interval)",
+                        (tier.view, tier.width, oldest, tier.width, min(newest, policy_start), tier.width),
+                    )
+            except Exception as e:
+                logger.error("Failed to refresh rollup for late readings", view=tier.view, error=str(e))
+                continue
+
+            logger.info(
+                "Rollup refreshed for late readings",
+                view=tier.view,
+                oldest=oldest.isoformat(),
+                newest=newest.isoformat(),
+                duration_ms=round((time.perf_counter() - started) * 1000, 3),
+            )
+
+    def _insert_reading_pages(
+        self,
+        rows: List[Tuple[int, Tuple[Any, ...]]],
+        failed: List[Dict[str, Any]],
+        page_size: int = INSERT_PAGE_SIZE,
+    ) -> int:
+        """Insert prepared rows page by page, recording the rows PostgreSQL rejects.
+
+        A rejected page is split in half and each half retried until the
+        failing rows are isolated, so one bad row costs about two inserts per
+        halving instead of failing its whole page. Connections are in
+        autocommit mode, so each insert commits on its own.
+        """
+        query = f"INSERT INTO temperature_readings ({', '.join(READING_COLUMNS)}) VALUES %s"
+        stored = 0
+        with self.connection() as conn, conn.cursor() as cursor:
+            # Stack of pages still to insert, next page last
+            pending = [rows[offset : offset + page_size] for offset in reversed(range(0, len(rows), page_size))]
+            while pending:
+                page = pending.pop()
+                try:
+                    execute_values(cursor, query, [row for _, row in page], page_size=page_size)
+                    stored += len(page)
+                except Exception as e:
+                    if len(page) == 1:
+                        failed.append({"index": page[0][0], "error": str(e)})
+                    else:
+                        middle = len(page) // 2
+                        pending.extend((page[middle:], page[:middle]))
+
+        return stored
+
+    @staticmethod
+    def _prepare_reading_rows(
+        readings: List[Dict[str, Any]],
+    ) -> Tuple[List[Tuple[int, Tuple[Any, ...]]], List[Dict[str, Any]]]:
+        """Normalize readings into column tuples ordered as ``READING_COLUMNS``.
+
+        The fallback timestamp and JSON encoder are resolved once for the
+        whole batch rather than per reading.
+        """
+        default_timestamp = datetime.utcnow()
+        dumps = json.JSONEncoder(default=str).encode
+        rows: List[Tuple[int, Tuple[Any, ...]]] = []
+        failed: List[Dict[str, Any]] = []
+
+        for index, reading in enumerate(readings):
+            try:
+                metadata = reading.get("metadata")
+                if not metadata:
+                    metadata = None
+                elif isinstance(metadata, dict):
+                    metadata = dumps(metadata)
+
+                timestamp = reading.get("timestamp")
+                if not timestamp:
+                    timestamp = default_timestamp
+                elif isinstance(timestamp, str):
+                    timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+
+                rows.append(
+                    (
+                        index,
                         (
-                            timestamp,
+                            timestamp.isoformat(),
                             reading["device_id"],
                             reading.get("probe_id"),
                             reading.get("grill_id"),
-                            reading["temperature"],
+                            float(reading["temperature"]),
                             reading.get("unit", "F"),
                             reading.get("battery_level"),
                             reading.get("signal_strength"),
                             metadata,
                         ),
                     )
-                    count += 1
+                )
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                failed.append({"index": index, "error": f"{type(e).__name__}: {e}"})
 
-                self.connection.commit()
-                logger.info("Batch temperature readings stored", count=count)
-                return count
-
-        except Exception as e:
-            logger.error("Error storing batch temperature readings", error=str(e))
-            if self.connection:
-                self.connection.rollback()
-            return 0
+        return rows, failed
 
     def get_temperature_history(
         self,
@@ -259,91 +499,28 @@ class TimescaleManager:
         aggregation: Optional[str] = None,
         interval: Optional[str] = None,
         limit: Optional[int] = None,
+        use_rollups: bool = True,
+        page_cursor: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        """Get historical temperature data based on query parameters."""
-        try:
-            if not self.connection or self.connection.closed:
-                self._connect()
-
-            with self.connection.cursor(cursor_factory=DictCursor) as cursor:
-                # Build the base query
-                query = "SELECT "
-
-                # Add fields based on aggregation
-                if not aggregation or aggregation.lower() == "none":
-                    query += "time, device_id, probe_id, grill_id, temperature, unit, battery_level, signal_strength, metadata"
-                elif aggregation.lower() == "avg":
-                    query += f"time_bucket('{interval or '1 hour'}', time) as time, "
-                    query += "device_id, probe_id, grill_id, AVG(temperature) as temperature, "
-                    query += "unit, AVG(battery_level) as battery_level, AVG(signal_strength) as signal_strength"
-                elif aggregation.lower() == "min":
-                    query += f"time_bucket('{interval or '1 hour'}', time) as time, "
-                    query += "device_id, probe_id, grill_id, MIN(temperature) as temperature, "
-                    query += "unit, MIN(battery_level) as battery_level, MIN(signal_strength) as signal_strength"
-                elif aggregation.lower() == "max":
-                    query += f"time_bucket('{interval or '1 hour'}', time) as time, "
-                    query += "device_id, probe_id, grill_id, MAX(temperature) as temperature, "
-                    query += "unit, MAX(battery_level) as battery_level, MAX(signal_strength) as signal_strength"
-                else:
-                    # Default to no aggregation
-                    query += "time, device_id, probe_id, grill_id, temperature, unit, battery_level, signal_strength, metadata"
-
-                query += " FROM temperature_readings WHERE 1=1"
-
-                # Add filters
-                params = []
-                if device_id:
-                    query += " AND device_id = %s"
-                    params.append(device_id)
-
-                if probe_id:
-                    query += " AND probe_id = %s"
-                    params.append(probe_id)
-
-                if grill_id:
-                    query += " AND grill_id = %s"
-                    params.append(grill_id)
-
-                if start_time:
-                    query += " AND time >= %s"
-                    params.append(start_time)
-
-                if end_time:
-                    query += " AND time <= %s"
-                    params.append(end_time)
-
-                # Add group by for aggregations
-                if aggregation and aggregation.lower() != "none":
-                    query += f" GROUP BY time_bucket('{interval or '1 hour'}', time), device_id, probe_id, grill_id, unit"
-
-                # Add order by
-                query += " ORDER BY time DESC"
-
-                # Add limit
-                if limit:
-                    query += f" LIMIT {limit}"
-
-                # Execute the query
-                cursor.execute(query, params)
+        """Get historical temperature data based on query parameters.
 
-                # Process results
-                result = []
-                for row in cursor:
-                    data_point = dict(row)
+        Aggregated queries are routed to the coarsest rollup tier that can
+        answer the interval (see ``query_planner``) unless ``use_rollups``
+        is False.
 
-                    # Convert timestamp to ISO format
-                    if "time" in data_point and data_point["time"]:
-                        data_point["time"] = data_point["time"].isoformat()
-
-                    # Convert metadata from JSON if needed
-                    if "metadata" in data_point and data_point["metadata"]:
-                        if isinstance(data_point["metadata"], str):
-                            try:
-                                data_point["metadata"] = json.loads(data_point["metadata"])
-                            except:
-                                pass
+        Rows are ordered newest first by ``(time, device_id, probe_id)``,
+        then by ``id`` for raw rows or ``(grill_id, unit)`` for aggregated ones.
+        To page through them, pass ``encode_history_cursor`` of the last
+        row of a full page as ``page_cursor`` for the next one.
+        """
+        try:
+            tier, query, params = self._plan_history_query(
+                device_id, probe_id, grill_id, start_time, end_time, aggregation, interval, limit, use_rollups, page_cursor
+            )
 
-                    result.append(data_point)
+            with self.connection() as conn, conn.cursor(cursor_factory=DictCursor) as cursor:
+                self.pool.execute_prepared(cursor, query, params, prefix="history")
+                result = [self._history_row(row) for row in cursor]
 
                 logger.debug(
                     "Temperature history retrieved",
@@ -351,6 +528,7 @@ class TimescaleManager:
                     device_id=device_id,
                     probe_id=probe_id,
                     grill_id=grill_id,
+                    source=tier.view if tier else "temperature_readings",
                 )
 
                 return result
@@ -359,6 +537,103 @@ class TimescaleManager:
             logger.error("Error retrieving temperature history", error=str(e))
             return []
 
+    def stream_temperature_history(
+        self,
+        device_id: Optional[str] = None,
+        probe_id: Optional[str] = None,
+        grill_id: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        aggregation: Optional[str] = None,
+        interval: Optional[str] = None,
+        limit: Optional[int] = None,
+        use_rollups: bool = True,
+        page_cursor: Optional[str] = None,
+        page_size: int = STREAM_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the rows of ``get_temperature_history`` one page at a time.
+
+        The query runs through a named server-side cursor and rows are
+        fetched ``page_size`` at a time, so memory stays bounded however
+        large the range is. The pooled connection is held until the
+        generator is exhausted or closed. Unlike ``get_temperature_history``,
+        errors are raised: a stream that has already started cannot be
+        turned into an empty result.
+        """
+        tier, query, params = self._plan_history_query(
+            device_id, probe_id, grill_id, start_time, end_time, aggregation, interval, limit, use_rollups, page_cursor
+        )
+
+        count = 0
+        # Server-side cursors only live inside a transaction
+        with self.connection(autocommit=False) as conn:
+            with conn.cursor(name="history_stream", cursor_factory=DictCursor) as cursor:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(page_size)
+                    if not rows:
+                        break
+                    count += len(rows)
+                    for row in rows:
+                        yield self._history_row(row)
+
+        logger.debug(
+            "Temperature history streamed",
+            count=count,
+            device_id=device_id,
+            probe_id=probe_id,
+            grill_id=grill_id,
+            source=tier.view if tier else "temperature_readings",
+        )
+
+    def _plan_history_query(
+        self,
+        device_id: Optional[str],
+        probe_id: Optional[str],
+        grill_id: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        aggregation: Optional[str],
+        interval: Optional[str],
+        limit: Optional[int],
+        use_rollups: bool,
+        page_cursor: Optional[str] = None,
+    ) -> Tuple[Optional[RollupTier], str, Dict[str, Any]]:
+        """Choose the rollup tier for a history query and build the query."""
+        tier = None
+        if use_rollups and aggregation and aggregation.lower() in AGGREGATIONS:
+            tier = choose_rollup(interval, start_time, end_time, self._available_rollups())
+
+        query, params = build_history_query(
+            {"device_id": device_id, "probe_id": probe_id, "grill_id": grill_id},
+            start_time,
+            end_time,
+            aggregation,
+            interval,
+            limit,
+            tier,
+            decode_history_cursor(page_cursor, aggregation) if page_cursor else None,
+        )
+        return tier, query, params
+
+    @staticmethod
+    def _history_row(row) -> Dict[str, Any]:
+        """Convert a history row to a dictionary with an ISO timestamp and decoded metadata."""
+        data_point = dict(row)
+
+        # Convert timestamp to ISO format
+        if data_point.get("time"):
+            data_point["time"] = data_point["time"].isoformat()
+
+        # Convert metadata from JSON if needed
+        if isinstance(data_point.get("metadata"), str):
+            try:
+                data_point["metadata"] = json.loads(data_point["metadata"])
+            except ValueError:
+                pass
+
+        return data_point
+
     def get_temperature_statistics(
         self,
         device_id: Optional[str] = None,
@@ -369,49 +644,14 @@ class TimescaleManager:
     ) -> Dict[str, Any]:
         """Get temperature statistics for selected data."""
         try:
-            if not self.connection or self.connection.closed:
-                self._connect()
-
-            with self.connection.cursor(cursor_factory=DictCursor) as cursor:
-                # Build the statistics query
-                query = """
-                    SELECT
-                        COUNT(*) as reading_count,
-                        AVG(temperature) as avg_temperature,
-                        MIN(temperature) as min_temperature,
-                        MAX(temperature) as max_temperature,
-                        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY temperature) as median_temperature,
-                        STDDEV(temperature) as stddev_temperature,
-                        MIN(time) as first_reading_time,
-                        MAX(time) as last_reading_time
-                    FROM temperature_readings
-                    WHERE 1=1
-                """
-
-                # Add filters
-                params = []
-                if device_id:
-                    query += " AND device_id = %s"
-                    params.append(device_id)
-
-                if probe_id:
-                    query += " AND probe_id = %s"
-                    params.append(probe_id)
-
-                if grill_id:
-                    query += " AND grill_id = %s"
-                    params.append(grill_id)
-
-                if start_time:
-                    query += " AND time >= %s"
-                    params.append(start_time)
-
-                if end_time:
-                    query += " AND time <= %s"
-                    params.append(end_time)
+            query, params = build_statistics_query(
+                {"device_id": device_id, "probe_id": probe_id, "grill_id": grill_id},
+                start_time,
+                end_time,
+            )
 
-                # Execute the query
-                cursor.execute(query, params)
+            with self.connection() as conn, conn.cursor(cursor_factory=DictCursor) as cursor:
+                self.pool.execute_prepared(cursor, query, params, prefix="statistics")
 
                 # Get the result
                 row = cursor.fetchone()
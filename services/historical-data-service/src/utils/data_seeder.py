@@ -5,7 +5,7 @@ This module provides utilities to seed the database with sample temperature data
 
 import random
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import structlog
 
@@ -25,6 +25,7 @@ class TemperatureDataSeeder:
         start_time: datetime,
         end_time: datetime,
         interval_minutes: int = 5,
+        grill_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Generate sample temperature data for testing.
@@ -35,6 +36,7 @@ class TemperatureDataSeeder:
             start_time: Start time for data generation
             end_time: End time for data generation
             interval_minutes: Interval between readings in minutes
+            grill_id: Optional ID of the grill the device is attached to
 
         Returns:
             List of temperature readings
@@ -75,6 +77,7 @@ class TemperatureDataSeeder:
                 reading = {
                     "device_id": device_id,
                     "probe_id": probe_id,
+                    "grill_id": grill_id,
                     "temperature": round(temperature, 1),
                     "unit": "F",
                     "timestamp": current_time.isoformat(),
@@ -22,10 +22,16 @@ def mock_timescale_manager():
     # Mock store_batch_temperature_readings
     manager.store_batch_temperature_readings.return_value = 2
 
+    # Mock bulk_store_temperature_readings
+    manager.bulk_store_temperature_readings.return_value = {"stored_count": 2, "failed": []}
+
     # Mock get_temperature_history
     manager.get_temperature_history.return_value = []
 
     # Mock get_temperature_statistics
     manager.get_temperature_statistics.return_value = {}
 
+    # Mock get_pool_status
+    manager.get_pool_status.return_value = {"max_size": 10, "open": 1, "in_use": 0, "utilization": 0.0}
+
     return manager
@@ -72,14 +72,14 @@ def test_store_temperature_reading_invalid_data(client):
 def test_store_batch_temperature_readings(client, monkeypatch):
     """Test storing batch temperature readings."""
 
-    # Mock the TimescaleManager.store_batch_temperature_readings method
-    def mock_store_batch_temperature_readings(self, readings):
-        return len(readings)
+    # Mock the TimescaleManager.bulk_store_temperature_readings method
+    def mock_bulk_store_temperature_readings(self, readings):
+        return {"stored_count": len(readings), "failed": []}
 
     monkeypatch.setattr(
         TimescaleManager,
-        "store_batch_temperature_readings",
-        mock_store_batch_temperature_readings,
+        "bulk_store_temperature_readings",
+        mock_bulk_store_temperature_readings,
     )
 
     # Test data
@@ -108,6 +108,43 @@ def test_store_batch_temperature_readings(client, monkeypatch):
     assert result["total_count"] == 2
 
 
+def test_store_batch_temperature_readings_partial_failure(client, monkeypatch):
+    """Test that rejected rows are reported by their position in the request."""
+
+    # Reject the second reading that reaches the database layer
+    def mock_bulk_store_temperature_readings(self, readings):
+        return {
+            "stored_count": len(readings) - 1,
+            "failed": [{"index": 1, "error": "value out of range"}],
+        }
+
+    monkeypatch.setattr(
+        TimescaleManager,
+        "bulk_store_temperature_readings",
+        mock_bulk_store_temperature_readings,
+    )
+
+    data = {
+        "readings": [
+            {"device_id": "test_device_001", "temperature": 225.5},
+            {"device_id": "test_device_001"},
+            {"device_id": "test_device_002", "temperature": 300.0},
+            {"device_id": "test_device_003", "temperature": 180.0},
+        ]
+    }
+
+    response = client.post("/api/temperature/batch", data=json.dumps(data), content_type="application/json")
+
+    assert response.status_code == 200
+
+    result = json.loads(response.data)
+    assert result["status"] == "success"
+    assert result["stored_count"] == 2
+    assert result["failed_count"] == 2
+    assert result["total_count"] == 4
+    assert [item["index"] for item in result["failed"]] == [1, 2]
+
+
 def test_get_temperature_history(client, monkeypatch):
     """Test getting temperature history."""
     # Sample history data
@@ -145,6 +182,98 @@ def test_get_temperature_history(client, monkeypatch):
     assert "query" in result
 
 
+def test_get_temperature_history_pagination(client, monkeypatch):
+    """Test that full pages return a cursor that is passed back for the next page."""
+    sample_history = [
+        {
+            "time": (datetime.utcnow() - timedelta(minutes=minutes)).isoformat(),
+            "device_id": "test_device_001",
+            "probe_id": "test_probe_001",
+            "temperature": 225.5,
+            "id": 100 - minutes,
+        }
+        for minutes in range(2)
+    ]
+    calls = []
+
+    # Mock the TimescaleManager.get_temperature_history method
+    def mock_get_temperature_history(self, **kwargs):
+        calls.append(kwargs)
+        return sample_history if not kwargs["page_cursor"] else sample_history[:1]
+
+    monkeypatch.setattr(TimescaleManager, "get_temperature_history", mock_get_temperature_history)
+
+    response = client.get("/api/temperature/history?device_id=test_device_001&limit=2")
+
+    assert response.status_code == 200
+    next_cursor = json.loads(response.data)["next_cursor"]
+    assert next_cursor
+
+    response = client.get(f"/api/temperature/history?device_id=test_device_001&limit=2&cursor={next_cursor}")
+
+    assert response.status_code == 200
+    assert calls[1]["page_cursor"] == next_cursor
+    assert json.loads(response.data)["next_cursor"] is None
+
+
+def test_get_temperature_history_invalid_cursor(client):
+    """Test that malformed cursors are rejected."""
+    response = client.get("/api/temperature/history?device_id=test_device_001&cursor=not-a-cursor")
+
+    assert response.status_code == 400
+    assert json.loads(response.data)["message"] == "Invalid cursor"
+
+
+def test_stream_temperature_history(client, monkeypatch):
+    """Test streaming temperature history as NDJSON and CSV."""
+    sample_history = [
+        {
+            "time": datetime.utcnow().isoformat(),
+            "device_id": "test_device_001",
+            "probe_id": "test_probe_001",
+            "temperature": 225.5,
+            "metadata": {"position": "center"},
+        },
+        {
+            "time": (datetime.utcnow() - timedelta(minutes=5)).isoformat(),
+            "device_id": "test_device_001",
+            "probe_id": "test_probe_001",
+            "temperature": 220.0,
+            "metadata": None,
+        },
+    ]
+
+    # Mock the TimescaleManager.stream_temperature_history method
+    def mock_stream_temperature_history(self, **kwargs):
+        return (dict(row) for row in sample_history)
+
+    monkeypatch.setattr(TimescaleManager, "stream_temperature_history", mock_stream_temperature_history)
+
+    response = client.get("/api/temperature/history?device_id=test_device_001&format=ndjson")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = response.get_data(as_text=True).splitlines()
+    assert [json.loads(line)["temperature"] for line in lines] == [225.5, 220.0]
+
+    response = client.get("/api/temperature/history?device_id=test_device_001&format=csv")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == "time,device_id,probe_id,grill_id,temperature,unit,battery_level,signal_strength,metadata"
+    assert len(lines) == 3
+    assert '"{""position"": ""center""}"' in lines[1]
+
+
+def test_stream_temperature_history_invalid_format(client):
+    """Test that unknown export formats are rejected."""
+    response = client.get("/api/temperature/history?device_id=test_device_001&format=xml")
+
+    assert response.status_code == 400
+    assert json.loads(response.data)["status"] == "error"
+
+
 def test_get_temperature_statistics(client, monkeypatch):
     """Test getting temperature statistics."""
     # Sample statistics data
@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from unittest.mock import MagicMock, call
+
+import psycopg2
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from src.database.connection_pool import PoolTimeout, TimescaleConnectionPool
+
+
+def make_connection():
+    """Create a mock connection as opened by the pool."""
+    conn = MagicMock()
+    conn.closed = 0
+    conn.last_used = time.monotonic()
+    conn.info.transaction_status = TRANSACTION_STATUS_IDLE
+    conn.prepared = OrderedDict()
+    return conn
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Create a pool of mock connections."""
+    pool = TimescaleConnectionPool(0, 2, checkout_timeout=0.1, statement_timeout_ms=1000)
+
+    def open_connection():
+        with pool._lock:
+            pool._open += 1
+        return make_connection()
+
+    monkeypatch.setattr(pool, "_open_connection", open_connection)
+    return pool
+
+
+def test_connections_are_reused(pool):
+    """Test that returned connections are handed out again."""
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+    status = pool.get_status()
+    assert status["open"] == 1
+    assert status["idle"] == 1
+    assert status["checkouts"] == 2
+
+
+def test_checkout_times_out_when_exhausted(pool):
+    """Test that checkout fails after the timeout when every connection is in use."""
+    with pool.connection(), pool.connection():
+        assert pool.get_status()["utilization"] == 1.0
+        with pytest.raises(PoolTimeout):
+            with pool.connection():
+                pass
+
+    assert pool.get_status()["checkout_timeouts"] == 1
+    assert pool.get_status()["in_use"] == 0
+
+
+def test_stale_connection_is_replaced(pool):
+    """Test that an idle connection failing its ping is discarded on checkout."""
+    with pool.connection() as stale:
+        pass
+    stale.last_used -= pool.idle_check_seconds + 1
+    stale.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError("gone")
+
+    with pool.connection() as conn:
+        assert conn is not stale
+
+    stale.close.assert_called_once()
+    assert pool.get_status()["discarded"] == 1
+    assert pool.get_status()["open"] == 1
+
+
+def test_statement_timeout_override_is_reset(pool):
+    """Test that a per-checkout statement timeout is reset on checkin."""
+    with pool.connection(statement_timeout_ms=0) as conn:
+        pass
+
+    execute = conn.cursor.return_value.__enter__.return_value.execute
+    assert execute.call_args_list == [call("SET statement_timeout = %s", (0,)), call("RESET statement_timeout")]
+
+
+def test_execute_prepared_converts_named_parameters(pool):
+    """Test that named parameters become positional and statements are prepared once per connection."""
+    cursor = MagicMock()
+    cursor.connection = make_connection()
+    query = "SELECT * FROM t WHERE a = %(a)s AND b >= %(b)s AND c <= %(b)s LIMIT %(limit)s"
+
+    pool.execute_prepared(cursor, query, {"limit": 10, "a": "x", "b": 5}, prefix="history")
+    pool.execute_prepared(cursor, query, {"limit": 20, "a": "y", "b": 6}, prefix="history")
+
+    name = next(iter(cursor.connection.prepared))
+    assert name.startswith("history_")
+    assert cursor.execute.call_args_list == [
+        call(f"PREPARE {name} AS SELECT * FROM t WHERE a = $1 AND b >= $2 AND c <= $2 LIMIT $3"),
+        call(f"EXECUTE {name} (%s, %s, %s)", ["x", 5, 10]),
+        call(f"EXECUTE {name} (%s, %s, %s)", ["y", 6, 20]),
+    ]
+
+
+def test_execute_prepared_evicts_least_recently_used(pool):
+    """Test that the least recently used statement is deallocated at the limit."""
+    pool.max_prepared = 2
+    cursor = MagicMock()
+    cursor.connection = make_connection()
+
+    for query in ("SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3"):
+        pool.execute_prepared(cursor, query, {})
+
+    prepared = list(cursor.connection.prepared)
+    assert len(prepared) == 2
+    deallocated = [c.args[0] for c in cursor.execute.call_args_list if c.args[0].startswith("DEALLOCATE")]
+    assert len(deallocated) == 1
+    assert deallocated[0].split()[1] not in prepared
+
+
+def test_transaction_checkout_restores_autocommit(pool):
+    """Test that a checkout without autocommit is rolled back and returned in autocommit mode."""
+    with pool.connection(autocommit=False) as conn:
+        assert conn.autocommit is False
+        conn.info.transaction_status = psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+
+    conn.rollback.assert_called_once()
+    assert conn.autocommit is True
@@ -0,0 +1,203 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from src.database.query_planner import (
+    ROLLUP_TIERS,
+    build_history_query,
+    build_statistics_query,
+    choose_rollup,
+    decode_history_cursor,
+    encode_history_cursor,
+    parse_interval,
+)
+
+ALL_TIERS = [tier.view for tier in ROLLUP_TIERS]
+END_TIME = datetime(2025, 7, 31, 12, 30, tzinfo=timezone.utc)
+START_TIME = END_TIME - timedelta(days=30)
+
+
+@pytest.mark.parametrize(
+    "interval,expected",
+    [
+        ("1m", timedelta(minutes=1)),
+        ("15m", timedelta(minutes=15)),
+        ("1h", timedelta(hours=1)),
+        ("1 hour", timedelta(hours=1)),
+        ("6 hours", timedelta(hours=6)),
+        ("1d", timedelta(days=1)),
+        ("90s", timedelta(seconds=90)),
+        ("1 mon", None),
+        ("0h", None),
+        ("hourly", None),
+        (None, None),
+    ],
+)
+def test_parse_interval(interval, expected):
+    """Test that fixed-length intervals are parsed and others are rejected."""
+    assert parse_interval(interval) == expected
+
+
+@pytest.mark.parametrize(
+    "interval,expected",
+    [
+        ("1d", "temperature_daily"),
+        ("1w", "temperature_daily"),
+        ("6h", "temperature_hourly"),
+        ("1h", "temperature_hourly"),
+        ("15m", "temperature_1m"),
+        ("90s", None),
+        ("30s", None),
+        ("1 mon", None),
+    ],
+)
+def test_choose_rollup_picks_coarsest_dividing_tier(interval, expected):
+    """Test that the coarsest tier whose bucket divides the interval is chosen."""
+    tier = choose_rollup(interval, START_TIME, END_TIME, ALL_TIERS)
+    assert (tier.view if tier else None) == expected
+
+
+def test_choose_rollup_skips_unavailable_tiers():
+    """Test that tiers missing from the database are skipped."""
+    tier = choose_rollup("1d", START_TIME, END_TIME, ["temperature_1m"])
+    assert tier.view == "temperature_1m"
+    assert choose_rollup("1d", START_TIME, END_TIME, []) is None
+
+
+def test_choose_rollup_requires_a_whole_bucket_in_range():
+    """Test that ranges shorter than a tier bucket fall back to a finer tier."""
+    tier = choose_rollup("1d", END_TIME - timedelta(hours=3), END_TIME, ALL_TIERS)
+    assert tier.view == "temperature_hourly"
+    assert choose_rollup("1h", END_TIME - timedelta(seconds=30), END_TIME, ALL_TIERS) is None
+
+
+def test_build_history_query_raw_readings():
+    """Test that non-aggregated queries select raw readings with bound parameters."""
+    query, params = build_history_query(
+        {"device_id": "test_device_001", "probe_id": None, "grill_id": None},
+        START_TIME,
+        END_TIME,
+        "none",
+        "1h",
+        100,
+    )
+
+    assert query.startswith("SELECT time, device_id, probe_id")
+    assert "FROM temperature_readings WHERE device_id = %(device_id)s" in query
+    assert "probe_id = %(probe_id)s" not in query
+    assert query.endswith("ORDER BY time DESC, device_id DESC, COALESCE(probe_id, '') DESC, id DESC LIMIT %(limit)s")
+    assert params["device_id"] == "test_device_001"
+    assert params["limit"] == 100
+
+
+def test_build_history_query_binds_interval():
+    """Test that the interval is bound as a parameter rather than interpolated."""
+    query, params = build_history_query({"grill_id": "grill_1"}, START_TIME, END_TIME, "max", "1h'; DROP TABLE x; --", None)
+
+    assert "DROP TABLE" not in query
+    assert "time_bucket(%(interval)s::interval, time)" in query
+    assert "MAX(temperature) AS temperature" in query
+    assert params["interval"] == "1h'; DROP TABLE x; --"
+
+
+def test_build_history_query_rollup_stitches_raw_tail():
+    """Test that rollup queries read whole buckets from the tier and the rest from raw readings."""
+    tier = choose_rollup("6h", START_TIME, END_TIME, ALL_TIERS)
+    query, params = build_history_query({"device_id": "test_device_001"}, START_TIME, END_TIME, "avg", "6h", None, tier)
+
+    assert "FROM temperature_hourly WHERE device_id = %(device_id)s" in query
+    assert "MAX(bucket) + %(tier_width)s::interval - %(tier_start_offset)s::interval" in query
+    assert "FROM temperature_readings WHERE device_id = %(device_id)s" in query
+    assert "time < (SELECT rollup_start FROM bounds) OR time >= (SELECT rollup_end FROM bounds)" in query
+    assert "SUM(temp_sum) / NULLIF(SUM(reading_count), 0) AS temperature" in query
+    assert params["tier_width"] == timedelta(hours=1)
+    assert params["tier_start_offset"] == timedelta(hours=3)
+
+
+def test_build_history_query_rollup_without_range():
+    """Test that rollup queries without a start time read the tier from its first bucket."""
+    tier = choose_rollup("1d", None, None, ALL_TIERS)
+    query, params = build_history_query({"device_id": "test_device_001"}, None, None, "min", "1d", None, tier)
+
+    assert "'-infinity'::timestamptz AS rollup_start" in query
+    assert "MIN(min_temp) AS temperature" in query
+    assert "start_time" not in params
+    assert "end_time" not in params
+
+
+def test_build_statistics_query():
+    """Test that statistics queries filter raw readings with named parameters."""
+    query, params = build_statistics_query({"device_id": "test_device_001", "probe_id": "probe_1"}, START_TIME, None)
+
+    assert "FROM temperature_readings WHERE device_id = %(device_id)s AND probe_id = %(probe_id)s" in query
+    assert query.endswith("time >= %(start_time)s")
+    assert params == {"device_id": "test_device_001", "probe_id": "probe_1", "start_time": START_TIME}
+
+
+def test_choose_rollup_accepts_mixed_naive_and_aware_range():
+    """Test that a naive end time (the API default) is compared as UTC."""
+    tier = choose_rollup("1h", START_TIME, END_TIME.replace(tzinfo=None), ALL_TIERS)
+    assert tier.view == "temperature_hourly"
+
+
+def test_history_cursor_round_trip():
+    """Test that cursors encode the keyset of a row and decode back to it."""
+    token = encode_history_cursor({"time": END_TIME.isoformat(), "device_id": "test_device_001", "probe_id": None, "id": 42})
+
+    assert "test_device_001" not in token
+    assert decode_history_cursor(token) == (END_TIME, "test_device_001", "", 42)
+
+
+def test_aggregated_history_cursor_round_trip():
+    """Test that aggregated cursors break ties on grill and unit."""
+    row = {"time": END_TIME, "device_id": "test_device_001", "probe_id": "probe_1", "grill_id": None, "unit": "F"}
+    token = encode_history_cursor(row)
+
+    assert decode_history_cursor(token, "avg") == (END_TIME, "test_device_001", "probe_1", "", "F")
+
+
+@pytest.mark.parametrize(
+    "token, aggregation",
+    [
+        ("", None),
+        ("not-a-cursor", None),
+        (encode_history_cursor({"time": "yesterday", "device_id": "d", "id": 1}), None),
+        (encode_history_cursor({"time": END_TIME, "device_id": "d", "id": 1}), "avg"),
+        (encode_history_cursor({"time": END_TIME, "device_id": "d", "unit": "F"}), "none"),
+    ],
+)
+def test_decode_history_cursor_rejects_malformed_tokens(token, aggregation):
+    """Test that malformed cursors, and cursors of the other history shape, raise ValueError."""
+    with pytest.raises(ValueError):
+        decode_history_cursor(token, aggregation)
+
+
+def test_build_history_query_raw_keyset_bounds_time():
+    """Test that raw pages continue strictly after the cursor key."""
+    after = (END_TIME, "test_device_001", "probe_1", 42)
+    query, params = build_history_query({"device_id": "test_device_001"}, START_TIME, END_TIME, "none", None, 50, after=after)
+
+    assert "time <= %(after_time)s AND (time < %(after_time)s OR " in query
+    assert "(device_id, COALESCE(probe_id, ''), id) < (%(after_device_id)s, %(after_probe_id)s, %(after_id)s)" in query
+    assert "AS history" not in query
+    assert (params["after_time"], params["after_device_id"], params["after_probe_id"], params["after_id"]) == after
+
+
+def test_build_history_query_aggregated_keyset_filters_buckets():
+    """Test that aggregated pages bound the input by the cursor bucket and filter the buckets."""
+    after = (END_TIME, "test_device_001", "probe_1", "grill_1", "F")
+    tier = choose_rollup("1h", START_TIME, END_TIME, ALL_TIERS)
+    query, _ = build_history_query({"device_id": "test_device_001"}, START_TIME, END_TIME, "avg", "1h", 50, tier, after)
+
+    assert "bucket < %(after_time)s::timestamptz + %(interval)s::interval" in query
+    assert "time < %(after_time)s::timestamptz + %(interval)s::interval" in query
+    assert ") AS history WHERE time <= %(after_time)s" in query
+    assert "COALESCE(grill_id, ''), COALESCE(unit, '')) < (" in query
+    assert query.endswith("COALESCE(grill_id, '') DESC, COALESCE(unit, '') DESC LIMIT %(limit)s")
+
+
+def test_build_history_query_rejects_cursor_of_other_shape():
+    """Test that a raw row cursor cannot page aggregated history."""
+    with pytest.raises(ValueError):
+        build_history_query(
+            {"device_id": "test_device_001"}, START_TIME, END_TIME, "avg", "1h", 50, after=(END_TIME, "d", "", 1)
+        )
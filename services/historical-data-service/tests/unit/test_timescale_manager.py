@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, call
+
+from src.database.timescale_manager import READING_COLUMNS, TimescaleManager
+
+
+def test_prepare_reading_rows_column_order():
+    """Test that prepared rows follow the COPY column order."""
+    timestamp = datetime(2025, 7, 4, 12, 30, 45, tzinfo=timezone.utc)
+    readings = [
+        {
+            "device_id": "test_device_001",
+            "probe_id": "probe_1",
+            "grill_id": "grill_1",
+            "temperature": 225,
+            "unit": "F",
+            "timestamp": timestamp,
+            "battery_level": 85.0,
+            "signal_strength": 90.0,
+            "metadata": {"position": "center"},
+        }
+    ]
+
+    rows, failed = TimescaleManager._prepare_reading_rows(readings)
+
+    assert failed == []
+    assert len(rows) == 1
+    index, row = rows[0]
+    assert index == 0
+    assert len(row) == len(READING_COLUMNS)
+    assert row[0] == "2025-07-04T12:30:45+00:00"
+    assert row[1] == "test_device_001"
+    assert row[4] == 225.0
+    assert row[8] == '{"position": "center"}'
+
+
+def test_prepare_reading_rows_defaults():
+    """Test that missing timestamps share one batch-wide default."""
+    readings = [
+        {"device_id": "test_device_001", "temperature": 200.0},
+        {"device_id": "test_device_002", "temperature": 210.0, "timestamp": "2025-07-04T12:30:45Z"},
+    ]
+
+    rows, failed = TimescaleManager._prepare_reading_rows(readings)
+
+    assert failed == []
+    assert rows[0][1][5] == "F"
+    assert rows[0][1][8] is None
+    assert rows[1][1][0] == "2025-07-04T12:30:45+00:00"
+
+
+def test_prepare_reading_rows_reports_failures_per_row():
+    """Test that malformed readings are reported without dropping the batch."""
+    readings = [
+        {"device_id": "test_device_001", "temperature": 200.0},
+        {"temperature": 210.0},
+        {"device_id": "test_device_003", "temperature": "hot"},
+        {"device_id": "test_device_004", "temperature": 220.0, "timestamp": "not-a-date"},
+        {"device_id": "test_device_005", "temperature": 230.0},
+    ]
+
+    rows, failed = TimescaleManager._prepare_reading_rows(readings)
+
+    assert [index for index, _ in rows] == [0, 4]
+    assert [item["index"] for item in failed] == [1, 2, 3]
+    assert failed[0]["error"].startswith("KeyError")
+
+
+def test_history_row_converts_time_and_metadata():
+    """Test that history rows get ISO timestamps and decoded metadata."""
+    row = TimescaleManager._history_row(
+        {
+            "time": datetime(2025, 7, 4, 12, 30, 45, tzinfo=timezone.utc),
+            "device_id": "test_device_001",
+            "temperature": 225.5,
+            "metadata": '{"position": "center"}',
+        }
+    )
+
+    assert row["time"] == "2025-07-04T12:30:45+00:00"
+    assert row["metadata"] == {"position": "center"}
+    assert TimescaleManager._history_row({"time": None, "metadata": "not json"})["metadata"] == "not json"
+
+
+def test_stream_temperature_history_fetches_pages_from_named_cursor():
+    """Test that streamed history is read page by page from a server-side cursor in a transaction."""
+    manager = TimescaleManager.__new__(TimescaleManager)
+    manager.rollup_tiers = []
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    timestamp = datetime(2025, 7, 4, 12, 30, 45, tzinfo=timezone.utc)
+    cursor.fetchmany.side_effect = [
+        [{"time": timestamp, "temperature": 225.0}, {"time": timestamp, "temperature": 226.0}],
+        [{"time": timestamp, "temperature": 227.0}],
+        [],
+    ]
+    manager.connection = MagicMock()
+    manager.connection.return_value.__enter__.return_value = conn
+
+    rows = manager.stream_temperature_history(device_id="test_device_001", page_size=2)
+    manager.connection.assert_not_called()
+
+    assert [row["temperature"] for row in rows] == [225.0, 226.0, 227.0]
+    manager.connection.assert_called_once_with(autocommit=False)
+    assert conn.cursor.call_args.kwargs["name"] == "history_stream"
+    query, params = cursor.execute.call_args.args
+    assert "FROM temperature_readings WHERE device_id = %(device_id)s" in query
+    assert params["device_id"] == "test_device_001"
+    assert cursor.fetchmany.call_args_list == [call(2)] * 3
+
+
+def test_bulk_store_refreshes_rollups_for_late_readings():
+    """Test that readings older than a tier's refresh window are refreshed into that tier only."""
+    manager = TimescaleManager.__new__(TimescaleManager)
+    manager.rollup_tiers = ["temperature_1m", "temperature_hourly", "temperature_daily"]
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    manager.connection = MagicMock()
+    manager.connection.return_value.__enter__.return_value = conn
+
+    late = datetime.now(timezone.utc) - timedelta(hours=5)
+    result = manager.bulk_store_temperature_readings([{"device_id": "test_device_001", "temperature": 225, "timestamp": late}])
+
+    assert result["stored_count"] == 1
+    refreshed = [c.args[1][0] for c in cursor.execute.call_args_list if "refresh_continuous_aggregate" in c.args[0]]
+    assert sorted(refreshed) == ["temperature_1m", "temperature_hourly"]
+
+
+def test_bulk_store_skips_rollup_refresh_for_recent_readings():
+    """Test that readings inside every refresh window leave the rollups to the policies."""
+    manager = TimescaleManager.__new__(TimescaleManager)
+    manager.rollup_tiers = ["temperature_1m", "temperature_hourly", "temperature_daily"]
+    conn = MagicMock()
+    cursor = conn.cursor.return_value.__enter__.return_value
+    manager.connection = MagicMock()
+    manager.connection.return_value.__enter__.return_value = conn
+
+    manager.bulk_store_temperature_readings([{"device_id": "test_device_001", "temperature": 225}])
+
+    cursor.copy_expert.assert_called_once()
+    cursor.execute.assert_not_called()
+
+
+def test_insert_reading_pages_reports_only_rejected_rows(monkeypatch):
+    """Test that a rejected page is bisected so its good rows are still stored."""
+    manager = TimescaleManager.__new__(TimescaleManager)
+    manager.connection = MagicMock()
+    inserted = []
+
+    def fake_execute_values(cursor, query, values, page_size):
+        if any(row[1] == "bad" for row in values):
+            raise ValueError("invalid input syntax")
+        inserted.extend(row[1] for row in values)
+
+    monkeypatch.setattr("src.database.timescale_manager.execute_values", fake_execute_values)
+    rows = [(index, ("2025-07-04T12:00:00", "bad" if index in (3, 8) else f"device_{index}")) for index in range(10)]
+    failed = []
+
+    stored = manager._insert_reading_pages(rows, failed, page_size=4)
+
+    assert stored == 8
+    assert sorted(inserted) == sorted(f"device_{index}" for index in range(10) if index not in (3, 8))
+    assert failed == [{"index": 3, "error": "invalid input syntax"}, {"index": 8, "error": "invalid input syntax"}]
@@ -71,6 +71,88 @@ async def get_current_temperature(
     return result
 
 
+@router.get("/history")
+@trace_function(name="api_stream_group_temperature_history")
+async def stream_group_temperature_history(
+    device_id: List[str] = Query(...),
+    probe_id: Optional[List[str]] = Query(None),
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    aggregation: Optional[str] = None,
+    interval: Optional[str] = None,
+    limit: int = 1000,
+    offset: int = 0,
+) -> StreamingResponse:
+    """Stream historical temperature data of several devices as NDJSON.
+
+    Used by dashboards showing a whole grill group: all devices are read with
+    one InfluxDB query and each line holds one series (device_id, probe_id and
+    its readings) as soon as its chunk arrives.
+
+    Args:
+        device_id: Device IDs (repeat the parameter for each device)
+        probe_id: Optional probe IDs (repeat the parameter for each probe)
+        start_time: Optional start time (ISO format)
+        end_time: Optional end time (ISO format)
+        aggregation: Optional aggregation function (none, mean, max, min, sum)
+        interval: Optional time interval for aggregation (e.g., 1m, 5m, 1h)
+        limit: Maximum number of points to return per series
+        offset: Number of points to skip per series
+    """
+    start_dt = None
+    end_dt = None
+
+    if start_time:
+        try:
+            start_dt = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid start_time format: {start_time}. Use ISO format (YYYY-MM-DDTHH:MM:SS)."
+            )
+
+    if end_time:
+        try:
+            end_dt = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail=f"Invalid end_time format: {end_time}. Use ISO format (YYYY-MM-DDTHH:MM:SS)."
+            )
+
+    temperature_service = await get_temperature_service()
+    series = temperature_service.stream_temperature_history(
+        device_ids=device_id,
+        probe_ids=probe_id,
+        start_time=start_dt,
+        end_time=end_dt,
+        aggregation=aggregation,
+        interval=interval,
+        limit=limit,
+        offset=offset,
+    )
+
+    # Read the first series before responding so bad parameters and query
+    # failures still map to an error status
+    try:
+        first = await series.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Failed to stream temperature history for devices %s: %s", device_id, str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def line_generator():
+        """Generate one NDJSON line per series."""
+        if first is None:
+            return
+        yield json.dumps(first) + "\n"
+        async for item in series:
+            yield json.dumps(item) + "\n"
+
+    return StreamingResponse(line_generator(), media_type="application/x-ndjson")
+
+
 @router.get("/history/{device_id}")
 @trace_function(name="api_get_temperature_history")
 async def get_temperature_history(
@@ -211,6 +293,35 @@ async def store_batch_temperature_data(
     return result
 
 
+@router.put("/collection/{device_id}/interval")
+@trace_function(name="api_set_device_collection_interval")
+async def set_device_collection_interval(
+    device_id: str,
+    active: bool = Query(True, description="Poll at the active-session interval"),
+    interval: Optional[int] = Query(None, ge=1, description="Custom poll interval in seconds"),
+) -> Dict[str, Any]:
+    """Change how often a device is polled, e.g. while a cook session is active.
+
+    Args:
+        device_id: Device ID
+        active: Poll faster while active (False restores the default interval)
+        interval: Optional custom interval used instead of the active-session one
+    """
+    if not active:
+        interval = None
+    elif interval is None:
+        interval = settings.service.active_collection_interval
+
+    temperature_service = await get_temperature_service()
+    temperature_service.set_device_collection_interval(device_id, interval)
+
+    return {
+        "status": "success",
+        "device_id": device_id,
+        "interval": interval or settings.service.collection_interval,
+    }
+
+
 @router.get("/alerts/{device_id}")
 @trace_function(name="api_get_temperature_alerts")
 async def get_temperature_alerts(
@@ -7,11 +7,12 @@ retry logic, and circuit breaker integration for improved resilience.
 
 import asyncio
 import logging
+import re
 import time
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from functools import partial
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 
 import aiohttp
 from influxdb import InfluxDBClient
@@ -31,6 +32,36 @@ settings = get_settings()
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
+# Sentinel returned by next() when a streamed result is exhausted
+_STREAM_END = object()
+
+# Aggregations accepted by the history queries; they are interpolated into the SELECT
+HISTORY_AGGREGATIONS = ("none", "mean", "max", "min", "sum")
+
+# InfluxQL duration literals accepted for GROUP BY time(...)
+_INTERVAL_PATTERN = re.compile(r"^[1-9][0-9]*(ns|u|µ|ms|s|m|h|d|w)$")
+
+
+def _history_select_fields(aggregation: str, interval: str) -> str:
+    """Validate a history aggregation and interval and build the SELECT fields.
+
+    Raises:
+        ValueError: If the aggregation is not one of HISTORY_AGGREGATIONS or
+            the interval is not an InfluxQL duration
+    """
+    if aggregation not in HISTORY_AGGREGATIONS:
+        raise ValueError(f"Invalid aggregation: {aggregation}. Use one of: {', '.join(HISTORY_AGGREGATIONS)}")
+    if aggregation == "none":
+        return "temperature, battery_level, signal_strength"
+    if not _INTERVAL_PATTERN.match(interval):
+        raise ValueError(f"Invalid interval: {interval}. Use a duration such as 1m, 5m or 1h")
+
+    select_fields = f"{aggregation}(temperature) as temperature"
+    if aggregation in ["mean", "max", "min"]:
+        select_fields += f", {aggregation}(battery_level) as battery_level"
+        select_fields += f", {aggregation}(signal_strength) as signal_strength"
+    return select_fields
+
 
 class InfluxDBConnectionPool:
     """Connection pool for InfluxDB clients."""
@@ -217,6 +248,59 @@ class InfluxDBConnectionPool:
             # Return client to pool
             await self.release_client(client)
 
+    async def stream(self, func_name: str, *args, **kwargs) -> AsyncIterator[Any]:
+        """Execute a function that returns an iterator and yield its items as they arrive.
+
+        The client stays checked out of the pool until the iterator is
+        exhausted or the caller stops iterating. Only the initial call is
+        retried; errors while reading the stream are raised to the caller.
+
+        Args:
+            func_name: Name of the InfluxDBClient method to call
+            *args: Positional arguments to pass to the method
+            **kwargs: Keyword arguments to pass to the method
+
+        Yields:
+            Items of the returned iterator
+        """
+        if self._circuit_breaker.is_open:
+            logger.error("InfluxDB circuit breaker open: %s", self._circuit_breaker.last_failure)
+            raise CircuitBreakerError("influxdb", self._circuit_breaker.last_failure)
+
+        client = await self.get_client()
+        loop = asyncio.get_event_loop()
+        iterator = None
+
+        try:
+            func = getattr(client, func_name)
+            # Not made the current span, as the caller's code runs between yields
+            with tracer.start_span(f"influxdb.{func_name}.stream"):
+                iterator = await loop.run_in_executor(self._executor, partial(self._execute_with_retry, func, *args, **kwargs))
+
+                # Read each item in the thread pool, as reading the response blocks
+                while True:
+                    item = await loop.run_in_executor(self._executor, next, iterator, _STREAM_END)
+                    if item is _STREAM_END:
+                        break
+                    yield item
+
+            # Record success in circuit breaker
+            if self._circuit_breaker.state.value != "closed":
+                self._circuit_breaker.reset()
+        except GeneratorExit:
+            # The caller stopped iterating early
+            raise
+        except Exception as e:
+            # Record failure in circuit breaker
+            self._circuit_breaker._on_failure(e)
+            logger.error("InfluxDB streaming operation failed: %s", str(e))
+            raise
+        finally:
+            if iterator is not None and hasattr(iterator, "close"):
+                iterator.close()
+            # Return client to pool
+            await self.release_client(client)
+
     def _execute_with_retry(self, func: Any, *args, **kwargs) -> Any:
         """Execute a function with retry logic."""
         last_error = None
@@ -446,7 +530,7 @@ class EnhancedInfluxDBClient:
             result = await self.connection_pool.execute(
                 "query",
                 query,
-                params=bind_params,
+                bind_params=bind_params,
                 epoch=epoch,
                 chunked=chunked,
             )
@@ -455,6 +539,38 @@ class EnhancedInfluxDBClient:
             logger.error("Query failed: %s - %s", query, str(e))
             raise
 
+    async def query_stream(
+        self,
+        query: str,
+        bind_params: Optional[Dict[str, Any]] = None,
+        epoch: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """Execute a query and yield its result in chunks as InfluxDB sends them.
+
+        Args:
+            query: InfluxQL query string
+            bind_params: Optional parameters to bind to query
+            epoch: Optional time precision for results
+            chunk_size: Points per chunk (defaults to the query_chunk_size setting)
+
+        Yields:
+            One ResultSet per chunk
+        """
+        try:
+            async for chunk in self.connection_pool.stream(
+                "query",
+                query,
+                bind_params=bind_params,
+                epoch=epoch,
+                chunked=True,
+                chunk_size=chunk_size or self.settings.query_chunk_size,
+            ):
+                yield chunk
+        except Exception as e:
+            logger.error("Streaming query failed: %s - %s", query, str(e))
+            raise
+
     @trace_async_function(name="influxdb_health_check")
     async def health_check(self) -> bool:
         """Check if InfluxDB is healthy.
@@ -507,15 +623,12 @@ class EnhancedInfluxDBClient:
 
         Returns:
             List of temperature readings
+
+        Raises:
+            ValueError: If the aggregation or interval is not supported
         """
         # Determine fields to select based on aggregation
-        if aggregation == "none":
-            select_fields = "temperature, battery_level, signal_strength"
-        else:
-            select_fields = f"{aggregation}(temperature) as temperature"
-            if aggregation in ["mean", "max", "min"]:
-                select_fields += f", {aggregation}(battery_level) as battery_level"
-                select_fields += f", {aggregation}(signal_strength) as signal_strength"
+        select_fields = _history_select_fields(aggregation, interval)
 
         # Build query
         query = f"SELECT {select_fields} FROM temperature WHERE device_id = $device_id"
@@ -568,6 +681,108 @@ class EnhancedInfluxDBClient:
 
         return data
 
+    async def stream_temperature_history(
+        self,
+        device_ids: Sequence[str],
+        probe_ids: Optional[Sequence[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        aggregation: str = "none",
+        interval: str = "1m",
+        limit: int = 1000,
+        offset: int = 0,
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Get historical temperature data of several devices and probes with one query.
+
+        Runs a single InfluxQL statement grouped by device_id and probe_id and
+        yields the result per series as chunks arrive, so the full result is
+        never held in memory. A long series is split over several consecutive
+        chunks with the same device_id and probe_id.
+
+        Args:
+            device_ids: Device IDs
+            probe_ids: Optional probe IDs; all probes of the devices if not given
+            start_time: Start time for query
+            end_time: End time for query
+            aggregation: Aggregation function (none, mean, max, min, sum)
+            interval: Time interval for aggregation (e.g., 1m, 5m, 1h)
+            limit: Maximum number of points to return per series
+            offset: Number of points to skip per series
+            chunk_size: Points per streamed chunk
+
+        Yields:
+            Dictionaries with device_id, probe_id and a list of readings
+
+        Raises:
+            ValueError: If the aggregation or interval is not supported
+        """
+        # Determine fields to select based on aggregation
+        select_fields = _history_select_fields(aggregation, interval)
+        if not device_ids:
+            return
+
+        # Build query; tag values are bound rather than interpolated
+        params: Dict[str, Any] = {}
+        device_filters = []
+        for i, device_id in enumerate(device_ids):
+            device_filters.append(f"device_id = $device_id_{i}")
+            params[f"device_id_{i}"] = device_id
+        query = f"SELECT {select_fields} FROM temperature WHERE ({' OR '.join(device_filters)})"
+
+        # Add probe filter if specified
+        if probe_ids:
+            probe_filters = []
+            for i, probe_id in enumerate(probe_ids):
+                probe_filters.append(f"probe_id = $probe_id_{i}")
+                params[f"probe_id_{i}"] = probe_id
+            query += f" AND ({' OR '.join(probe_filters)})"
+
+        # Add time range filters
+        if start_time:
+            query += " AND time >= $start_time"
+            params["start_time"] = start_time.isoformat()
+
+        if end_time:
+            query += " AND time <= $end_time"
+            params["end_time"] = end_time.isoformat()
+
+        # One series per device and probe
+        if aggregation != "none":
+            query += f" GROUP BY time({interval}), device_id, probe_id"
+        else:
+            query += " GROUP BY device_id, probe_id"
+
+        # Order, limit and offset apply to each series
+        query += " ORDER BY time DESC"
+        query += f" LIMIT {limit} OFFSET {offset}"
+
+        with tracer.start_span("influxdb_stream_temperature_history") as span:
+            span.set_attribute("influxdb.device_count", len(device_ids))
+
+            async for chunk in self.query_stream(query, bind_params=params, chunk_size=chunk_size):
+                for (_, tags), points in chunk.items():
+                    tags = tags or {}
+                    readings = []
+                    for point in points:
+                        item = {
+                            "timestamp": point.get("time"),
+                            "temperature": point.get("temperature"),
+                        }
+
+                        # Add optional fields
+                        for field in ["battery_level", "signal_strength"]:
+                            if field in point and point[field] is not None:
+                                item[field] = point[field]
+
+                        readings.append(item)
+
+                    yield {
+                        "device_id": tags.get("device_id"),
+                        "probe_id": tags.get("probe_id") or None,
+                        "readings": readings,
+                    }
+
     @trace_async_function(name="influxdb_get_temperature_statistics")
     async def get_temperature_statistics(
         self,
@@ -369,21 +369,13 @@ class RedisClient:
 
         try:
             if self.client:
-                # Convert all values to strings
-                fields = {}
-                for key, value in data.items():
-                    if isinstance(value, (dict, list)):
-                        fields[key] = json.dumps(value)
-                    else:
-                        fields[key] = str(value)
-
                 # Add entry to stream
                 if max_len is None:
                     max_len = self.settings.max_stream_length
 
                 entry_id = await self.client.xadd(
                     stream_key,
-                    fields,
+                    self._encode_stream_fields(data),
                     maxlen=max_len,
                     approximate=True,
                 )
@@ -396,6 +388,131 @@ class RedisClient:
             logger.error("Failed to add to stream '%s': %s", stream_key, str(e))
             raise
 
+    @trace_async_function(name="redis_add_many_to_stream")
+    async def add_many_to_stream(
+        self,
+        stream_key: str,
+        entries: List[Dict[str, Any]],
+        max_len: Optional[int] = None,
+    ) -> List[str]:
+        """Add multiple entries to a Redis stream in a single round-trip.
+
+        Args:
+            stream_key: Stream to add to
+            entries: Entries to add (field-value pairs)
+            max_len: Maximum length of stream
+
+        Returns:
+            IDs of added entries
+        """
+        result = await self.stream_and_publish_many(stream_key, None, entries, max_len=max_len)
+        return result["entry_ids"]
+
+    @trace_async_function(name="redis_publish_many")
+    async def publish_many(
+        self,
+        channel: str,
+        messages: List[Union[str, Dict, List]],
+    ) -> int:
+        """Publish multiple messages to a Redis channel in a single round-trip.
+
+        Args:
+            channel: Channel to publish to
+            messages: Messages to publish (JSON encoded if not strings)
+
+        Returns:
+            Total number of client deliveries across all messages
+        """
+        try:
+            result = await self.stream_and_publish_many(None, channel, messages)
+            return result["receivers"]
+        except Exception:
+            return 0
+
+    @trace_async_function(name="redis_stream_and_publish_many")
+    async def stream_and_publish_many(
+        self,
+        stream_key: Optional[str],
+        channel: Optional[str],
+        messages: List[Any],
+        max_len: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Add messages to a stream and publish them to a channel in one pipeline.
+
+        All XADD and PUBLISH commands are queued on a non-transactional
+        pipeline and sent to the server together, so the whole batch costs a
+        single network round-trip.
+
+        Args:
+            stream_key: Stream to add to (skipped if None)
+            channel: Channel to publish to (skipped if None)
+            messages: Messages to add and publish
+            max_len: Maximum length of stream
+
+        Returns:
+            Dictionary with added ``entry_ids`` and total pub/sub ``receivers``
+        """
+        result: Dict[str, Any] = {"entry_ids": [], "receivers": 0}
+        if not messages or (stream_key is None and channel is None):
+            return result
+
+        await self.connect()
+
+        try:
+            if not self.client:
+                raise RuntimeError("Redis client is not connected")
+
+            if max_len is None:
+                max_len = self.settings.max_stream_length
+
+            pipe = self.client.pipeline(transaction=False)
+            for message in messages:
+                if stream_key is not None:
+                    fields = self._encode_stream_fields(message) if isinstance(message, dict) else {"data": message}
+                    pipe.xadd(stream_key, fields, maxlen=max_len, approximate=True)
+
+                if channel is not None:
+                    if not isinstance(message, str):
+                        message = json.dumps(message, default=str)
+                    pipe.publish(channel, message)
+
+            replies = await pipe.execute()
+
+            # Replies alternate between commands in the order they were queued
+            step = (stream_key is not None) + (channel is not None)
+            if stream_key is not None:
+                result["entry_ids"] = replies[0::step]
+            if channel is not None:
+                result["receivers"] = sum(replies[step - 1 :: step])
+
+            logger.debug(
+                "Pipelined %d messages to stream '%s' and channel '%s'",
+                len(messages),
+                stream_key,
+                channel,
+            )
+            return result
+        except Exception as e:
+            logger.error(
+                "Failed to pipeline %d messages to stream '%s' and channel '%s': %s",
+                len(messages),
+                stream_key,
+                channel,
+                str(e),
+            )
+            raise
+
+    @staticmethod
+    def _encode_stream_fields(data: Dict[str, Any]) -> Dict[str, str]:
+        """Convert stream entry values to strings, JSON encoding containers."""
+        fields = {}
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                fields[key] = json.dumps(value)
+            else:
+                fields[key] = str(value)
+        return fields
+
     @trace_async_function(name="redis_read_stream")
     async def read_stream(
         self,
@@ -25,6 +25,7 @@ class InfluxDBSettings(BaseSettings):
     timeout: int = Field(default=10, env="INFLUXDB_TIMEOUT")
     connection_pool_size: int = Field(default=10, env="INFLUXDB_POOL_SIZE")
     retries: int = Field(default=3, env="INFLUXDB_RETRIES")
+    query_chunk_size: int = Field(default=10000, env="INFLUXDB_QUERY_CHUNK_SIZE")
 
     # Retention policies configuration
     retention_policies: Dict[str, Dict[str, Any]] = Field(
@@ -127,6 +128,18 @@ class ServiceSettings(BaseSettings):
     collection_interval: int = Field(default=60, env="COLLECTION_INTERVAL")  # seconds
     batch_size: int = Field(default=100, env="BATCH_SIZE")
 
+    # Collection scheduler settings
+    collection_max_concurrency: int = Field(default=10, env="COLLECTION_MAX_CONCURRENCY")
+    collection_jitter: float = Field(default=0.1, env="COLLECTION_JITTER")  # fraction of a slot
+    active_collection_interval: int = Field(default=10, env="ACTIVE_COLLECTION_INTERVAL")  # seconds
+    device_discovery_interval: int = Field(default=300, env="DEVICE_DISCOVERY_INTERVAL")  # seconds
+    collection_publish_batch_size: int = Field(default=1000, env="COLLECTION_PUBLISH_BATCH_SIZE")  # readings
+
+    # InfluxDB write-behind buffer settings
+    influx_flush_interval: float = Field(default=1.0, env="INFLUX_FLUSH_INTERVAL")  # seconds
+    influx_flush_size: int = Field(default=5000, env="INFLUX_FLUSH_SIZE")  # points
+    influx_buffer_max_size: int = Field(default=50000, env="INFLUX_BUFFER_MAX_SIZE")  # points
+
     # Circuit breaker settings
     circuit_breaker_failure_threshold: int = Field(default=5, env="CIRCUIT_BREAKER_FAILURE_THRESHOLD")
     circuit_breaker_recovery_timeout: int = Field(default=30, env="CIRCUIT_BREAKER_RECOVERY_TIMEOUT")
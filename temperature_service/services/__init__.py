@@ -1,8 +1,10 @@
 """Service implementations for temperature data service."""
 
+from .collection_scheduler import CollectionScheduler
 from .temperature_service import TemperatureService, close_temperature_service, get_temperature_service
 
 __all__ = [
+    "CollectionScheduler",
     "TemperatureService",
     "get_temperature_service",
     "close_temperature_service",
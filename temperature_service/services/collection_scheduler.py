@@ -0,0 +1,302 @@
+"""
+Device Collection Scheduler.
+
+This module provides a scheduler that spreads device polls evenly across the
+collection interval instead of polling every device at once. Each device is
+assigned a jittered time slot, in-flight polls are capped by a semaphore, and
+individual devices can be polled on their own interval.
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the exponentially weighted lag average
+LAG_EWMA_ALPHA = 0.2
+
+
+class CollectionScheduler:
+    """Schedules per-device polls in time slots across the collection interval."""
+
+    def __init__(
+        self,
+        poll: Callable[[str], Awaitable[Any]],
+        interval: float,
+        max_concurrency: int = 10,
+        jitter: float = 0.1,
+        on_batch: Optional[Callable[[List[Any]], Awaitable[None]]] = None,
+    ):
+        """Initialize collection scheduler.
+
+        Args:
+            poll: Coroutine function that polls a single device
+            interval: Default seconds between polls of the same device
+            max_concurrency: Maximum number of polls in flight
+            jitter: Fraction of a slot width used to jitter each slot
+            on_batch: Optional coroutine called with the results of devices
+                that were due at the same time
+        """
+        self._poll = poll
+        self.interval = float(interval)
+        self.max_concurrency = max(1, max_concurrency)
+        self.jitter = max(0.0, min(1.0, jitter))
+        self._on_batch = on_batch
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._schedule: List[Tuple[float, str]] = []
+        self._due: Dict[str, float] = {}
+        self._polling: Set[str] = set()
+        self._device_intervals: Dict[str, float] = {}
+        self._device_stats: Dict[str, Dict[str, Any]] = {}
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._in_flight = 0
+        self._max_in_flight = 0
+
+    @property
+    def devices(self) -> Set[str]:
+        """Devices currently scheduled."""
+        return set(self._device_stats)
+
+    def get_device_interval(self, device_id: str) -> float:
+        """Get the poll interval used for a device."""
+        return self._device_intervals.get(device_id, self.interval)
+
+    def set_device_interval(self, device_id: str, interval: Optional[float]) -> None:
+        """Override the poll interval of a device.
+
+        Unknown devices are ignored; overrides are dropped when a device is
+        removed from the schedule.
+
+        Args:
+            device_id: Device ID
+            interval: Seconds between polls, or None to use the default
+        """
+        if device_id not in self._device_stats:
+            logger.debug("Ignoring poll interval for unscheduled device %s", device_id)
+            return
+
+        if interval is None:
+            self._device_intervals.pop(device_id, None)
+        else:
+            self._device_intervals[device_id] = max(0.1, float(interval))
+
+        # Pull a pending poll forward if the new interval is shorter
+        loop = asyncio.get_event_loop()
+        due = self._due.get(device_id)
+        if due is not None:
+            earliest = loop.time() + self.get_device_interval(device_id)
+            if earliest < due:
+                self._push(device_id, earliest)
+                self._wakeup.set()
+
+    def set_devices(self, device_ids: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Replace the set of scheduled devices.
+
+        New devices are placed in evenly spaced, jittered slots across the
+        interval; devices that are already scheduled keep their slots.
+
+        Args:
+            device_ids: Devices to poll
+
+        Returns:
+            Tuple of (added, removed) device IDs
+        """
+        wanted = set(device_ids)
+        current = self.devices
+        added = wanted - current
+        removed = current - wanted
+
+        for device_id in removed:
+            self._due.pop(device_id, None)
+            self._device_intervals.pop(device_id, None)
+            self._device_stats.pop(device_id, None)
+
+        if added:
+            now = asyncio.get_event_loop().time()
+            ordered = sorted(wanted)
+            slot_index = {device_id: index for index, device_id in enumerate(ordered)}
+            slot_width = 1.0 / len(ordered)
+            for device_id in sorted(added):
+                slot = slot_index[device_id] + random.uniform(-self.jitter, self.jitter) / 2
+                phase = (slot % len(ordered)) * slot_width * self.get_device_interval(device_id)
+                self._push(device_id, now + phase)
+                self._device_stats[device_id] = {
+                    "polls": 0,
+                    "errors": 0,
+                    "last_lag_ms": None,
+                    "avg_lag_ms": None,
+                    "max_lag_ms": None,
+                    "last_skew_ms": None,
+                    "max_skew_ms": None,
+                    "last_duration_ms": None,
+                    "missed_slots": 0,
+                    "_last_started": None,
+                }
+
+        if added or removed:
+            self._wakeup.set()
+
+        return added, removed
+
+    async def start(self) -> None:
+        """Start the scheduling loop."""
+        if self._running:
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            "Collection scheduler started (interval: %.1fs, max concurrency: %d)",
+            self.interval,
+            self.max_concurrency,
+        )
+
+    async def stop(self) -> None:
+        """Stop the scheduling loop and cancel in-flight polls."""
+        if not self._running:
+            return
+
+        self._running = False
+        tasks = list(self._batch_tasks)
+        if self._task:
+            tasks.append(self._task)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._task = None
+        self._batch_tasks.clear()
+        logger.info("Collection scheduler stopped")
+
+    def _push(self, device_id: str, due: float) -> None:
+        """Schedule the next poll of a device."""
+        self._due[device_id] = due
+        heapq.heappush(self._schedule, (due, device_id))
+
+    def _pop_due(self, now: float) -> List[Tuple[str, float]]:
+        """Remove and return every device whose slot has arrived."""
+        due_devices = []
+        while self._schedule and self._schedule[0][0] <= now:
+            due, device_id = heapq.heappop(self._schedule)
+            # Skip stale heap entries left behind by rescheduling or removal
+            if self._due.get(device_id) != due:
+                continue
+            del self._due[device_id]
+            due_devices.append((device_id, due))
+        return due_devices
+
+    async def _run(self) -> None:
+        """Dispatch polls as device slots come due."""
+        loop = asyncio.get_event_loop()
+        try:
+            while self._running:
+                self._wakeup.clear()
+                due_devices = self._pop_due(loop.time())
+
+                if due_devices:
+                    task = asyncio.create_task(self._run_batch(due_devices))
+                    self._batch_tasks.add(task)
+                    task.add_done_callback(self._batch_tasks.discard)
+
+                timeout = self._schedule[0][0] - loop.time() if self._schedule else self.interval
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, timeout))
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            pass
+
+    async def _run_batch(self, due_devices: List[Tuple[str, float]]) -> None:
+        """Poll a group of devices that came due together."""
+        results = await asyncio.gather(
+            *(self._poll_device(device_id, due) for device_id, due in due_devices),
+            return_exceptions=True,
+        )
+
+        if self._on_batch:
+            try:
+                await self._on_batch([result for result in results if not isinstance(result, BaseException)])
+            except Exception as e:
+                logger.error("Error handling collection batch: %s", str(e))
+
+    async def _poll_device(self, device_id: str, due: float) -> Any:
+        """Poll one device within the concurrency limit and reschedule it."""
+        loop = asyncio.get_event_loop()
+        self._polling.add(device_id)
+        try:
+            async with self._semaphore:
+                started = loop.time()
+                self._in_flight += 1
+                self._max_in_flight = max(self._max_in_flight, self._in_flight)
+                try:
+                    return await self._poll(device_id)
+                except Exception:
+                    stats = self._device_stats.get(device_id)
+                    if stats is not None:
+                        stats["errors"] += 1
+                    raise
+                finally:
+                    self._in_flight -= 1
+                    self._record_poll(device_id, due, started, loop.time())
+        finally:
+            self._polling.discard(device_id)
+            if self._running and device_id in self._device_stats:
+                self._reschedule(device_id, due, loop.time())
+
+    def _reschedule(self, device_id: str, due: float, now: float) -> None:
+        """Schedule the next slot of a device, skipping slots already missed."""
+        interval = self.get_device_interval(device_id)
+        next_due = due + interval
+        if next_due <= now:
+            missed = int((now - next_due) // interval) + 1
+            next_due += missed * interval
+            self._device_stats[device_id]["missed_slots"] += missed
+        self._push(device_id, next_due)
+        self._wakeup.set()
+
+    def _record_poll(self, device_id: str, due: float, started: float, finished: float) -> None:
+        """Record lag (start vs. slot) and skew (actual vs. configured period)."""
+        stats = self._device_stats.get(device_id)
+        if stats is None:
+            return
+
+        lag_ms = max(0.0, started - due) * 1000
+        stats["polls"] += 1
+        stats["last_lag_ms"] = round(lag_ms, 3)
+        stats["max_lag_ms"] = round(max(stats["max_lag_ms"] or 0.0, lag_ms), 3)
+        previous_avg = stats["avg_lag_ms"]
+        stats["avg_lag_ms"] = round(
+            lag_ms if previous_avg is None else previous_avg + LAG_EWMA_ALPHA * (lag_ms - previous_avg), 3
+        )
+        stats["last_duration_ms"] = round((finished - started) * 1000, 3)
+
+        if stats["_last_started"] is not None:
+            skew_ms = ((started - stats["_last_started"]) - self.get_device_interval(device_id)) * 1000
+            stats["last_skew_ms"] = round(skew_ms, 3)
+            stats["max_skew_ms"] = round(max(stats["max_skew_ms"] or 0.0, abs(skew_ms)), 3)
+        stats["_last_started"] = started
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler and per-device lag/skew statistics."""
+        devices = {}
+        for device_id, stats in self._device_stats.items():
+            devices[device_id] = {key: value for key, value in stats.items() if not key.startswith("_")}
+            devices[device_id]["interval"] = self.get_device_interval(device_id)
+
+        return {
+            "running": self._running,
+            "interval": self.interval,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "max_in_flight": self._max_in_flight,
+            "scheduled_devices": len(self._device_stats),
+            "devices": devices,
+        }
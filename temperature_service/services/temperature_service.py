@@ -7,11 +7,12 @@ like data sources, storage, and real-time streaming.
 """
 
 import asyncio
+import functools
 import json
 import logging
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from opentelemetry import trace
 
@@ -36,12 +37,206 @@ from temperature_service.models import (
 )
 from temperature_service.utils import trace_async_function
 
+from .collection_scheduler import CollectionScheduler
+
 # Get application settings
 settings = get_settings()
 logger = logging.getLogger(__name__)
 tracer = trace.get_tracer(__name__)
 
 
+class InfluxWriteBuffer:
+    """Write-behind buffer that coalesces InfluxDB points from all devices.
+
+    Points are accumulated in memory and written with a single
+    ``write_points`` call per flush window. A flush is triggered when the
+    buffer reaches ``flush_size`` points or ``flush_interval`` seconds have
+    elapsed, whichever comes first. Producers calling :meth:`add` block
+    while the buffer holds ``max_size`` points (backpressure).
+    """
+
+    def __init__(
+        self,
+        write_points: Callable[[List[Dict[str, Any]]], Awaitable[bool]],
+        flush_interval: float = 1.0,
+        flush_size: int = 5000,
+        max_size: int = 50000,
+    ):
+        """Initialize write buffer.
+
+        Args:
+            write_points: Coroutine function used to write a list of points
+            flush_interval: Maximum seconds a point waits before being flushed
+            flush_size: Number of buffered points that triggers an early flush
+            max_size: Number of buffered points at which producers block
+        """
+        self._write_points = write_points
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_size = max(max_size, flush_size)
+
+        self._points: List[Dict[str, Any]] = []
+        self._condition = asyncio.Condition()
+        self._flush_lock = asyncio.Lock()
+        self._flush_requested = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self._stats: Dict[str, Any] = {
+            "flushes": 0,
+            "points_written": 0,
+            "points_dropped": 0,
+            "failed_flushes": 0,
+            "backpressure_waits": 0,
+            "last_flush_size": 0,
+            "last_flush_latency_ms": None,
+            "max_flush_latency_ms": None,
+            "max_depth": 0,
+        }
+
+    @property
+    def depth(self) -> int:
+        """Number of points currently buffered."""
+        return len(self._points)
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._running:
+            return
+
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            "InfluxDB write buffer started (interval: %.2fs, flush size: %d, max size: %d)",
+            self.flush_interval,
+            self.flush_size,
+            self.max_size,
+        )
+
+    async def close(self) -> None:
+        """Stop the flush task and write out any buffered points."""
+        if not self._running:
+            return
+
+        self._running = False
+        self._flush_requested.set()
+
+        # Let an in-flight flush finish rather than cancelling the write
+        if self._flush_task:
+            await self._flush_task
+            self._flush_task = None
+
+        # Wake any producers still waiting for room
+        async with self._condition:
+            self._condition.notify_all()
+
+        await self.flush()
+        logger.info("InfluxDB write buffer closed")
+
+    async def add(self, points: List[Dict[str, Any]]) -> None:
+        """Add points to the buffer, waiting while it is full.
+
+        Args:
+            points: InfluxDB points to buffer
+        """
+        if not points:
+            return
+
+        if not self._running:
+            # No flush task to drain the buffer, write through directly
+            await self._write(points)
+            return
+
+        async with self._condition:
+            while self._running and len(self._points) >= self.max_size:
+                self._stats["backpressure_waits"] += 1
+                self._flush_requested.set()
+                await self._condition.wait()
+
+            if self._running:
+                self._points.extend(points)
+                self._stats["max_depth"] = max(self._stats["max_depth"], len(self._points))
+
+                if len(self._points) >= self.flush_size:
+                    self._flush_requested.set()
+                return
+
+        # Buffer was closed while waiting for room
+        await self._write(points)
+
+    async def flush(self) -> bool:
+        """Write all buffered points to InfluxDB.
+
+        Returns:
+            True if the flush succeeded or there was nothing to write
+        """
+        async with self._flush_lock:
+            async with self._condition:
+                points, self._points = self._points, []
+                self._condition.notify_all()
+
+            if not points:
+                return True
+
+            success = await self._write(points)
+
+            if not success:
+                # Keep failed points for the next window, as far as capacity allows
+                async with self._condition:
+                    room = max(0, self.max_size - len(self._points))
+                    retained = points[-room:] if room else []
+                    self._points[:0] = retained
+                    self._stats["points_dropped"] += len(points) - len(retained)
+
+            return success
+
+    async def _write(self, points: List[Dict[str, Any]]) -> bool:
+        """Write points and record flush metrics."""
+        start_time = time.perf_counter()
+        try:
+            success = await self._write_points(points)
+        except Exception as e:
+            logger.error("Error flushing %d points to InfluxDB: %s", len(points), str(e))
+            success = False
+
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        self._stats["flushes"] += 1
+        self._stats["last_flush_size"] = len(points)
+        self._stats["last_flush_latency_ms"] = round(latency_ms, 3)
+        self._stats["max_flush_latency_ms"] = round(max(self._stats["max_flush_latency_ms"] or 0.0, latency_ms), 3)
+
+        if success:
+            self._stats["points_written"] += len(points)
+        else:
+            self._stats["failed_flushes"] += 1
+            logger.error("Failed to write %d temperature points to InfluxDB", len(points))
+
+        return success
+
+    async def _flush_loop(self) -> None:
+        """Flush the buffer every interval or when a flush is requested."""
+        try:
+            while self._running:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+                self._flush_requested.clear()
+                await self.flush()
+        except asyncio.CancelledError:
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer depth and flush metrics."""
+        return {
+            "running": self._running,
+            "depth": len(self._points),
+            "max_size": self.max_size,
+            **self._stats,
+        }
+
+
 class TemperatureService:
     """Core temperature data service."""
 
@@ -66,13 +261,23 @@ class TemperatureService:
         # Service state
         self._collection_running = False
         self._polling_task: Optional[asyncio.Task] = None
+        self._scheduler: Optional[CollectionScheduler] = None
         self._known_devices: Set[str] = set()
+        self._pinned_devices = False
+        self._discovery_failed = False
         self._last_collection_time: Dict[str, datetime] = {}
         self._collection_stats: Dict[str, Dict[str, Any]] = {}
 
+        # Readings waiting to be published to Redis at the end of the cycle
+        self._publish_buffer: List[TemperatureReading] = []
+        self._publish_lock = asyncio.Lock()
+
         # Anomaly detection state
         self._device_stats: Dict[str, Dict[str, Any]] = {}
 
+        # Write-behind buffer for InfluxDB points
+        self._write_buffer: Optional[InfluxWriteBuffer] = None
+
         logger.info("Temperature service initialized")
 
     async def initialize(self) -> None:
@@ -87,6 +292,18 @@ class TemperatureService:
         if self._thermoworks_client is None:
             self._thermoworks_client = await get_thermoworks_client()
 
+        if self._write_buffer is None:
+            self._write_buffer = InfluxWriteBuffer(
+                functools.partial(
+                    self._influxdb_client.write_points,
+                    batch_size=settings.service.influx_flush_size,
+                ),
+                flush_interval=settings.service.influx_flush_interval,
+                flush_size=settings.service.influx_flush_size,
+                max_size=settings.service.influx_buffer_max_size,
+            )
+            await self._write_buffer.start()
+
         logger.info("Temperature service connections initialized")
 
     async def close(self) -> None:
@@ -94,6 +311,11 @@ class TemperatureService:
         # Stop collection
         await self.stop_collection()
 
+        # Flush pending InfluxDB points
+        if self._write_buffer:
+            await self._write_buffer.close()
+            self._write_buffer = None
+
         # No need to close individual clients as they will be
         # closed by their respective singletons
         logger.info("Temperature service closed")
@@ -114,6 +336,8 @@ class TemperatureService:
                 "known_devices": len(self._known_devices),
                 "stats": self._collection_stats,
             },
+            "scheduler": self._scheduler.get_stats() if self._scheduler else None,
+            "write_buffer": self._write_buffer.get_stats() if self._write_buffer else None,
         }
 
         # Check InfluxDB
@@ -184,13 +408,22 @@ class TemperatureService:
         # Set initial state
         self._collection_running = True
         self._known_devices = set(devices) if devices else set()
+        self._pinned_devices = bool(devices)
         self._collection_stats = {
             "start_time": datetime.utcnow().isoformat(),
             "collections": 0,
             "readings": 0,
             "errors": 0,
             "last_collection": None,
-            "devices": {},
+            "devices": {device_id: self._new_device_stats() for device_id in self._known_devices},
+            "discovery": {
+                "runs": 0,
+                "errors": 0,
+                "last_run": None,
+                "last_duration_ms": None,
+                "last_added": [],
+                "last_removed": [],
+            },
         }
 
         # Start collection task
@@ -219,29 +452,45 @@ class TemperatureService:
     async def _collection_loop(self, interval: int) -> None:
         """Main collection loop.
 
+        Device polls are dispatched by a :class:`CollectionScheduler`, which
+        spreads them across the interval and caps concurrent requests, and the
+        readings are published to Redis once per interval by a separate task.
+        This loop only rediscovers devices, on its own cadence, so polling
+        carries on while discovery is in progress.
+
         Args:
             interval: Collection interval in seconds
         """
-        try:
-            while self._collection_running:
-                try:
-                    # Collect temperature data
-                    start_time = time.time()
-                    await self._collect_temperature_data()
+        self._scheduler = CollectionScheduler(
+            self._collect_device_data,
+            interval=interval,
+            max_concurrency=settings.service.collection_max_concurrency,
+            jitter=settings.service.collection_jitter,
+            on_batch=self._on_collection_batch,
+        )
 
-                    # Update stats
-                    self._collection_stats["collections"] += 1
-                    self._collection_stats["last_collection"] = datetime.utcnow().isoformat()
+        publish_task = asyncio.create_task(self._publish_loop(interval))
 
-                    # Calculate sleep time
-                    elapsed = time.time() - start_time
-                    sleep_time = max(0.1, interval - elapsed)
-
-                    logger.debug(
-                        "Temperature collection completed in %.2f seconds, " "sleeping for %.2f seconds", elapsed, sleep_time
-                    )
+        try:
+            self._scheduler.set_devices(self._known_devices)
+            await self._scheduler.start()
 
-                    await asyncio.sleep(sleep_time)
+            discovery_retries = 0
+            while self._collection_running:
+                try:
+                    delay = settings.service.device_discovery_interval
+                    if not self._pinned_devices:
+                        await self._discover_devices()
+
+                        # Retry sooner after a failure or while there is nothing to poll,
+                        # backing off from the collection interval to the discovery interval
+                        if self._discovery_failed or not self._known_devices:
+                            delay = min(delay, interval * 2**discovery_retries)
+                            discovery_retries = min(discovery_retries + 1, 10)
+                        else:
+                            discovery_retries = 0
+
+                    await asyncio.sleep(delay)
                 except asyncio.CancelledError:
                     logger.info("Temperature collection task cancelled")
                     break
@@ -250,46 +499,161 @@ class TemperatureService:
                     self._collection_stats["errors"] += 1
                     await asyncio.sleep(max(1, interval // 2))
         finally:
+            await self._scheduler.stop()
+            publish_task.cancel()
+            await asyncio.gather(publish_task, return_exceptions=True)
+            await self._flush_publish_buffer()
             self._collection_running = False
             logger.info("Temperature collection loop stopped")
 
-    @trace_async_function(name="temperature_service_collect_temperature_data")
-    async def _collect_temperature_data(self) -> None:
-        """Collect temperature data from all devices."""
+    async def _publish_loop(self, interval: int) -> None:
+        """Publish buffered readings to Redis once per collection cycle.
+
+        Args:
+            interval: Collection interval in seconds
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._flush_publish_buffer()
+            except Exception as e:
+                logger.error("Error publishing collection cycle: %s", str(e))
+                self._collection_stats["errors"] += 1
+
+            self._collection_stats["collections"] += 1
+            self._collection_stats["last_collection"] = datetime.utcnow().isoformat()
+
+    async def _flush_publish_buffer(self) -> None:
+        """Publish every buffered reading to Redis in one round-trip."""
+        async with self._publish_lock:
+            readings, self._publish_buffer = self._publish_buffer, []
+            await self._publish_to_redis(readings)
+
+    @trace_async_function(name="temperature_service_discover_devices")
+    async def _discover_devices(self) -> Tuple[Set[str], Set[str]]:
+        """Rediscover devices and apply the difference to the scheduler.
+
+        Returns:
+            Tuple of (added, removed) device IDs
+        """
+        self._discovery_failed = True
         if not self._thermoworks_client:
             logger.error("ThermoWorks client not initialized")
-            return
+            return set(), set()
+
+        discovery_stats = self._collection_stats["discovery"]
+        start_time = time.perf_counter()
 
-        # Discover devices if needed
-        if not self._known_devices:
+        try:
             devices = await self._thermoworks_client.get_devices()
-            self._known_devices = {device["device_id"] for device in devices}
-
-            for device_id in self._known_devices:
-                if device_id not in self._collection_stats["devices"]:
-                    self._collection_stats["devices"][device_id] = {
-                        "collections": 0,
-                        "readings": 0,
-                        "errors": 0,
-                        "last_collection": None,
-                    }
+        except Exception as e:
+            # Keep polling the devices we already know about
+            discovery_stats["errors"] += 1
+            logger.error("Device discovery failed: %s", str(e))
+            return set(), set()
+
+        discovered = {device["device_id"] for device in devices if device.get("device_id")}
+        if not discovered and self._known_devices:
+            # An empty listing is more likely an API hiccup than an empty fleet
+            discovery_stats["errors"] += 1
+            logger.warning("Device discovery returned no devices, keeping %d known devices", len(self._known_devices))
+            return set(), set()
+
+        self._discovery_failed = False
+
+        added = discovered - self._known_devices
+        removed = self._known_devices - discovered
+        self._known_devices = discovered
+
+        for device_id in added:
+            self._collection_stats["devices"].setdefault(device_id, self._new_device_stats())
+
+        for device_id in removed:
+            self._evict_device(device_id)
+
+        if self._scheduler:
+            self._scheduler.set_devices(discovered)
+
+        discovery_stats["runs"] += 1
+        discovery_stats["last_run"] = datetime.utcnow().isoformat()
+        discovery_stats["last_duration_ms"] = round((time.perf_counter() - start_time) * 1000, 3)
+        discovery_stats["last_added"] = sorted(added)
+        discovery_stats["last_removed"] = sorted(removed)
+
+        if added or removed:
+            logger.info(
+                "Device discovery: %d added, %d removed, %d known",
+                len(added),
+                len(removed),
+                len(discovered),
+            )
+
+        return added, removed
 
-        # Collect data for each device
-        collection_tasks = []
-        for device_id in self._known_devices:
-            task = self._collect_device_data(device_id)
-            collection_tasks.append(task)
+    def _evict_device(self, device_id: str) -> None:
+        """Drop all per-device state kept for a device that is no longer listed.
 
-        # Wait for all collection tasks to complete
-        if collection_tasks:
-            await asyncio.gather(*collection_tasks, return_exceptions=True)
+        Args:
+            device_id: Device ID
+        """
+        self._collection_stats["devices"].pop(device_id, None)
+        self._last_collection_time.pop(device_id, None)
+
+        prefix = f"{device_id}:"
+        for device_key in [key for key in self._device_stats if key.startswith(prefix)]:
+            del self._device_stats[device_key]
+
+    @staticmethod
+    def _new_device_stats() -> Dict[str, Any]:
+        """Create empty per-device collection stats."""
+        return {
+            "collections": 0,
+            "readings": 0,
+            "errors": 0,
+            "last_collection": None,
+        }
+
+    async def _on_collection_batch(self, results: List[List[TemperatureReading]]) -> None:
+        """Buffer the readings of devices that were polled in the same slot.
+
+        Slots usually hold a single device, so readings are published once per
+        cycle by :meth:`_publish_loop`, or early once the buffer is full.
+
+        Args:
+            results: Readings returned by each polled device
+        """
+        for readings in results:
+            self._publish_buffer.extend(readings)
+
+        if len(self._publish_buffer) >= settings.service.collection_publish_batch_size:
+            await self._flush_publish_buffer()
+
+    def set_device_collection_interval(self, device_id: str, interval: Optional[float]) -> None:
+        """Poll a device on its own interval, e.g. faster during an active session.
+
+        Args:
+            device_id: Device ID
+            interval: Seconds between polls, or None to use the default interval
+        """
+        if not self._scheduler:
+            logger.warning("Collection is not running, ignoring interval for device %s", device_id)
+            return
+
+        self._scheduler.set_device_interval(device_id, interval)
+        logger.info("Collection interval for device %s set to %s", device_id, interval or "default")
 
     @trace_async_function(name="temperature_service_collect_device_data")
-    async def _collect_device_data(self, device_id: str) -> None:
+    async def _collect_device_data(self, device_id: str) -> List[TemperatureReading]:
         """Collect temperature data for a specific device.
 
+        Readings are stored but not published; they are buffered and published
+        together once per collection cycle.
+
         Args:
             device_id: Device ID
+
+        Returns:
+            Collected temperature readings
         """
         try:
             # Get device data
@@ -317,58 +681,47 @@ class TemperatureService:
 
             # Store readings
             if readings:
-                await self._store_temperature_readings(readings)
+                await self._store_temperature_readings(readings, publish=False)
 
-                # Update device stats
-                device_stats = self._collection_stats["devices"].get(
-                    device_id,
-                    {
-                        "collections": 0,
-                        "readings": 0,
-                        "errors": 0,
-                        "last_collection": None,
-                    },
-                )
-
-                device_stats["collections"] += 1
-                device_stats["readings"] += len(readings)
-                device_stats["last_collection"] = datetime.utcnow().isoformat()
+                # Update device stats (skipped if the device was evicted mid-poll)
+                device_stats = self._collection_stats["devices"].get(device_id)
+                if device_stats is not None:
+                    device_stats["collections"] += 1
+                    device_stats["readings"] += len(readings)
+                    device_stats["last_collection"] = datetime.utcnow().isoformat()
 
-                self._collection_stats["devices"][device_id] = device_stats
                 self._collection_stats["readings"] += len(readings)
 
                 # Record last collection time
-                self._last_collection_time[device_id] = datetime.utcnow()
+                if device_id in self._known_devices:
+                    self._last_collection_time[device_id] = datetime.utcnow()
 
                 logger.debug("Collected %d temperature readings for device %s", len(readings), device_id)
             else:
                 logger.warning("No temperature readings collected for device %s", device_id)
+
+            return readings
         except Exception as e:
             logger.error("Error collecting temperature data for device %s: %s", device_id, str(e))
 
             # Update error stats
-            device_stats = self._collection_stats["devices"].get(
-                device_id,
-                {
-                    "collections": 0,
-                    "readings": 0,
-                    "errors": 0,
-                    "last_collection": None,
-                },
-            )
+            device_stats = self._collection_stats["devices"].get(device_id)
+            if device_stats is not None:
+                device_stats["errors"] += 1
 
-            device_stats["errors"] += 1
-            self._collection_stats["devices"][device_id] = device_stats
+            return []
 
     @trace_async_function(name="temperature_service_store_temperature_readings")
     async def _store_temperature_readings(
         self,
         readings: List[TemperatureReading],
+        publish: bool = True,
     ) -> None:
         """Store temperature readings.
 
         Args:
             readings: Temperature readings to store
+            publish: Whether to publish the readings to Redis
         """
         if not readings:
             return
@@ -377,7 +730,8 @@ class TemperatureService:
         await self._store_in_influxdb(readings)
 
         # Publish to Redis
-        await self._publish_to_redis(readings)
+        if publish:
+            await self._publish_to_redis(readings)
 
         # Check for anomalies
         if settings.service.enable_anomaly_detection:
@@ -395,42 +749,13 @@ class TemperatureService:
             return
 
         try:
-            # Convert readings to InfluxDB points
-            points = []
-            for reading in readings:
-                point = {
-                    "measurement": "temperature",
-                    "tags": {
-                        "device_id": reading.device_id,
-                        "unit": reading.unit,
-                    },
-                    "fields": {
-                        "temperature": float(reading.temperature),
-                    },
-                    "time": reading.timestamp.isoformat(),
-                }
-
-                # Add probe_id if present
-                if reading.probe_id:
-                    point["tags"]["probe_id"] = reading.probe_id
-
-                # Add optional fields
-                if reading.battery_level is not None:
-                    point["fields"]["battery_level"] = float(reading.battery_level)
+            points = [self._reading_to_point(reading) for reading in readings]
 
-                if reading.signal_strength is not None:
-                    point["fields"]["signal_strength"] = float(reading.signal_strength)
+            # Hand off to the write-behind buffer when available
+            if self._write_buffer:
+                await self._write_buffer.add(points)
+                return
 
-                # Add metadata
-                for key, value in reading.metadata.items():
-                    if isinstance(value, (int, float)):
-                        point["fields"][f"meta_{key}"] = float(value)
-                    else:
-                        point["tags"][f"meta_{key}"] = str(value)
-
-                points.append(point)
-
-            # Write to InfluxDB
             success = await self._influxdb_client.write_points(points)
 
             if not success:
@@ -438,6 +763,48 @@ class TemperatureService:
         except Exception as e:
             logger.error("Error storing temperature readings in InfluxDB: %s", str(e))
 
+    @staticmethod
+    def _reading_to_point(reading: TemperatureReading) -> Dict[str, Any]:
+        """Convert a temperature reading to an InfluxDB point.
+
+        Args:
+            reading: Temperature reading to convert
+
+        Returns:
+            InfluxDB point
+        """
+        point = {
+            "measurement": "temperature",
+            "tags": {
+                "device_id": reading.device_id,
+                "unit": reading.unit,
+            },
+            "fields": {
+                "temperature": float(reading.temperature),
+            },
+            "time": reading.timestamp.isoformat(),
+        }
+
+        # Add probe_id if present
+        if reading.probe_id:
+            point["tags"]["probe_id"] = reading.probe_id
+
+        # Add optional fields
+        if reading.battery_level is not None:
+            point["fields"]["battery_level"] = float(reading.battery_level)
+
+        if reading.signal_strength is not None:
+            point["fields"]["signal_strength"] = float(reading.signal_strength)
+
+        # Add metadata
+        for key, value in reading.metadata.items():
+            if isinstance(value, (int, float)):
+                point["fields"][f"meta_{key}"] = float(value)
+            else:
+                point["tags"][f"meta_{key}"] = str(value)
+
+        return point
+
     @trace_async_function(name="temperature_service_publish_to_redis")
     async def _publish_to_redis(self, readings: List[TemperatureReading]) -> None:
         """Publish temperature readings to Redis.
@@ -445,28 +812,19 @@ class TemperatureService:
         Args:
             readings: Temperature readings to publish
         """
-        if not self._redis_client or not settings.service.enable_redis_pubsub:
+        if not readings or not self._redis_client or not settings.service.enable_redis_pubsub:
             return
 
         try:
-            # Add readings to stream
-            for reading in readings:
-                # Convert to dict for JSON serialization
-                reading_dict = reading.dict()
-
-                # Add to stream
-                stream_key = settings.redis.stream_key
-                await self._redis_client.add_to_stream(
-                    stream_key,
-                    reading_dict,
-                    max_len=settings.redis.max_stream_length,
-                )
-
-                # Publish to channel
-                channel = settings.redis.pub_sub_channels["temperature"]
-                await self._redis_client.publish(channel, reading_dict)
+            # Add to stream and publish to channel in a single pipeline
+            await self._redis_client.stream_and_publish_many(
+                settings.redis.stream_key,
+                settings.redis.pub_sub_channels["temperature"],
+                [reading.dict() for reading in readings],
+                max_len=settings.redis.max_stream_length,
+            )
 
-                logger.debug("Published temperature reading for device %s to Redis", reading.device_id)
+            logger.debug("Published %d temperature readings to Redis", len(readings))
         except Exception as e:
             logger.error("Error publishing temperature readings to Redis: %s", str(e))
 
@@ -738,6 +1096,52 @@ class TemperatureService:
                 "message": str(e),
             }
 
+    async def stream_temperature_history(
+        self,
+        device_ids: Sequence[str],
+        probe_ids: Optional[Sequence[str]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        aggregation: Optional[str] = None,
+        interval: Optional[str] = None,
+        limit: int = 1000,
+        offset: int = 0,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream historical temperature data of several devices from one query.
+
+        Args:
+            device_ids: Device IDs
+            probe_ids: Optional probe IDs; all probes of the devices if not given
+            start_time: Start time for query (defaults to 24 hours ago)
+            end_time: End time for query (defaults to now)
+            aggregation: Optional aggregation function (none, mean, max, min, sum)
+            interval: Optional time interval for aggregation (e.g., 1m, 5m, 1h)
+            limit: Maximum number of points to return per series
+            offset: Number of points to skip per series
+
+        Yields:
+            Dictionaries with device_id, probe_id and a list of readings; a
+            long series is split over several consecutive items
+
+        Raises:
+            RuntimeError: If the InfluxDB client is not initialized
+            ValueError: If the aggregation or interval is not supported
+        """
+        if not self._influxdb_client:
+            raise RuntimeError("InfluxDB client not initialized")
+
+        async for series in self._influxdb_client.stream_temperature_history(
+            device_ids=device_ids,
+            probe_ids=probe_ids,
+            start_time=start_time or datetime.utcnow() - timedelta(hours=24),
+            end_time=end_time or datetime.utcnow(),
+            aggregation=aggregation or "none",
+            interval=interval or "1m",
+            limit=limit,
+            offset=offset,
+        ):
+            yield series
+
     @trace_async_function(name="temperature_service_get_temperature_statistics")
     async def get_temperature_statistics(
         self,
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the enhanced InfluxDB client.
+
+These tests verify the multi-device history stream against a mocked
+connection pool, including query building and per-series result handling.
+"""
+
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from influxdb.resultset import ResultSet
+
+from temperature_service.clients.influxdb_client import EnhancedInfluxDBClient
+
+
+def _chunk(*series):
+    """Build a ResultSet chunk as InfluxDB returns it for grouped series."""
+    return ResultSet(
+        {
+            "series": [
+                {
+                    "name": "temperature",
+                    "tags": tags,
+                    "columns": ["time", "temperature", "battery_level", "signal_strength"],
+                    "values": values,
+                }
+                for tags, values in series
+            ]
+        }
+    )
+
+
+class FakeConnectionPool:
+    """Connection pool stand-in that streams canned chunks and records the call."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = []
+
+    async def stream(self, func_name, *args, **kwargs):
+        self.calls.append((func_name, args, kwargs))
+        for chunk in self.chunks:
+            yield chunk
+
+
+class TestStreamTemperatureHistory(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for EnhancedInfluxDBClient.stream_temperature_history"""
+
+    def _client(self, chunks):
+        self.pool = FakeConnectionPool(chunks)
+        return EnhancedInfluxDBClient(connection_pool=self.pool, settings=MagicMock(query_chunk_size=500))
+
+    async def _collect(self, client, **kwargs):
+        return [series async for series in client.stream_temperature_history(**kwargs)]
+
+    async def test_one_query_for_all_devices_and_probes(self) -> None:
+        """Test that all devices and probes are bound into one grouped query"""
+        client = self._client([])
+
+        await self._collect(
+            client,
+            device_ids=["grill_a", "grill_b"],
+            probe_ids=["probe_1"],
+            start_time=datetime(2025, 7, 4, 12, 0),
+            aggregation="mean",
+            interval="5m",
+            limit=100,
+        )
+
+        self.assertEqual(len(self.pool.calls), 1)
+        func_name, (query,), kwargs = self.pool.calls[0]
+        self.assertEqual(func_name, "query")
+        self.assertIn("mean(temperature) as temperature", query)
+        self.assertIn("WHERE (device_id = $device_id_0 OR device_id = $device_id_1)", query)
+        self.assertIn("AND (probe_id = $probe_id_0)", query)
+        self.assertIn("GROUP BY time(5m), device_id, probe_id", query)
+        self.assertIn("LIMIT 100 OFFSET 0", query)
+        self.assertNotIn("grill_a", query)
+        self.assertEqual(
+            kwargs["bind_params"],
+            {
+                "device_id_0": "grill_a",
+                "device_id_1": "grill_b",
+                "probe_id_0": "probe_1",
+                "start_time": "2025-07-04T12:00:00",
+            },
+        )
+        self.assertTrue(kwargs["chunked"])
+        self.assertEqual(kwargs["chunk_size"], 500)
+
+    async def test_yields_each_series_of_each_chunk(self) -> None:
+        """Test that series are yielded per chunk, including a series split over chunks"""
+        client = self._client(
+            [
+                _chunk(
+                    ({"device_id": "grill_a", "probe_id": "probe_1"}, [["2025-07-04T12:02:00Z", 226.0, 80.0, None]]),
+                    ({"device_id": "grill_b", "probe_id": ""}, [["2025-07-04T12:02:00Z", 190.5, None, -60.0]]),
+                ),
+                _chunk(({"device_id": "grill_b", "probe_id": ""}, [["2025-07-04T12:01:00Z", 189.0, None, None]])),
+            ]
+        )
+
+        series = await self._collect(client, device_ids=["grill_a", "grill_b"])
+
+        self.assertEqual(
+            series,
+            [
+                {
+                    "device_id": "grill_a",
+                    "probe_id": "probe_1",
+                    "readings": [{"timestamp": "2025-07-04T12:02:00Z", "temperature": 226.0, "battery_level": 80.0}],
+                },
+                {
+                    "device_id": "grill_b",
+                    "probe_id": None,
+                    "readings": [{"timestamp": "2025-07-04T12:02:00Z", "temperature": 190.5, "signal_strength": -60.0}],
+                },
+                {
+                    "device_id": "grill_b",
+                    "probe_id": None,
+                    "readings": [{"timestamp": "2025-07-04T12:01:00Z", "temperature": 189.0}],
+                },
+            ],
+        )
+        query = self.pool.calls[0][1][0]
+        self.assertIn("GROUP BY device_id, probe_id", query)
+
+    async def test_rejects_unknown_aggregation(self) -> None:
+        """Test that an aggregation outside the allow-list never reaches InfluxDB"""
+        client = self._client([])
+
+        with self.assertRaises(ValueError):
+            await self._collect(client, device_ids=["grill_a"], aggregation="mean(temperature)) FROM secrets --")
+        with self.assertRaises(ValueError):
+            await self._collect(client, device_ids=["grill_a"], aggregation="mean", interval="1m) FROM secrets")
+        self.assertEqual(self.pool.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()